@@ -5,14 +5,26 @@ Lambda Deployment Package Creator
 This script creates a deployment-ready zip file for the Company Screening Lambda function.
 It handles dependency installation, code packaging, and optimization for AWS Lambda.
 
+Optimizer mode (--optimize) additionally:
+- Drops botocore service models except bedrock-runtime and sts (when botocore is packaged)
+- Precompiles .pyc files (unchecked-hash, so the read-only /var/task copy is used
+  as-is) when building with the Lambda's Python version
+- Reports per-dependency size and import cost, and the handler's INIT import cost
+
+With --layer, third-party dependencies go to a separate Lambda layer zip
+(python/ prefix) and the function zip holds only this project's code.
+
 Usage:
     python create_lambda_zip.py [--output-name custom_name.zip]
+    python create_lambda_zip.py --optimize --python-version 3.11 [--layer]
 """
 
 import os
 import sys
 import shutil
 import zipfile
+import compileall
+import py_compile
 import subprocess
 import tempfile
 import argparse
@@ -22,17 +34,39 @@ from datetime import datetime
 class LambdaZipCreator:
     """Creates optimized Lambda deployment packages"""
     
-    def __init__(self, output_name=None):
+    # botocore service models the package uses (Bedrock runtime, STS for credentials)
+    BOTOCORE_SERVICES = ('bedrock-runtime', 'sts')
+    
+    def __init__(self, output_name=None, optimize=False, python_version=None, layer=False):
         self.project_root = Path(__file__).parent.parent  # Go up one level from allzips to project root
         self.output_name = output_name or f"company-screening-lambda-{datetime.now().strftime('%Y%m%d-%H%M%S')}.zip"
         self.temp_dir = None
+        self.optimize = optimize
+        # Lambda runtime Python version, e.g. "3.11" (default: the interpreter running this script)
+        self.python_version = python_version or f"{sys.version_info.major}.{sys.version_info.minor}"
+        self.layer = layer
+        self.layer_dir = None
+        self.layer_zip_path = None
         
         # Files to include in the Lambda package
         self.python_files = [
             'lambda_handler.py',
             'optimized_company_search.py',
             'sec_filing_enhancer.py',
-            'search_based_sec_extractor.py'
+            'search_based_sec_extractor.py',
+            'rate_limiter.py',
+            'response_cache.py',
+            'query_plan.py',
+            'batch_screening.py',
+            'checkpoint_store.py',
+            'literal_matcher.py',
+            'company_names.py',
+            'edgar_index.py',
+            'sec_client.py',
+            'context_selector.py',
+            'incremental_json.py',
+            'result_dedup.py',
+            'result_store.py'
         ]
         
         # Files to exclude from the package
@@ -141,33 +175,139 @@ class LambdaZipCreator:
                     item.unlink()
                     print(f"  🗑️ Removed file: {item.name}")
     
-    def create_zip_file(self):
+    def split_layer(self):
+        """Move third-party dependencies into a layer directory (python/ prefix)"""
+        print("🧱 Splitting dependencies into a Lambda layer...")
+        
+        self.layer_dir = tempfile.mkdtemp(prefix='lambda_layer_')
+        layer_python = Path(self.layer_dir) / 'python'
+        layer_python.mkdir()
+        
+        for item in Path(self.temp_dir).iterdir():
+            if item.name not in self.python_files:
+                shutil.move(str(item), str(layer_python / item.name))
+        print(f"  ✅ Moved {len(list(layer_python.iterdir()))} dependency entries to the layer")
+    
+    def prune_botocore_data(self):
+        """Remove botocore service models other than BOTOCORE_SERVICES"""
+        package_dirs = [Path(self.temp_dir)] + ([Path(self.layer_dir) / 'python'] if self.layer_dir else [])
+        data_dir = next((d / 'botocore' / 'data' for d in package_dirs if (d / 'botocore' / 'data').is_dir()), None)
+        if data_dir is None:
+            print("🧹 botocore not packaged (provided by the Lambda runtime) - no service models to prune")
+            return
+        
+        print(f"🧹 Pruning botocore service models (keeping {', '.join(self.BOTOCORE_SERVICES)})...")
+        removed = 0
+        removed_bytes = 0
+        # Top-level files (endpoints.json, partitions.json, _retry.json, ...) are always needed
+        for service_dir in data_dir.iterdir():
+            if service_dir.is_dir() and service_dir.name not in self.BOTOCORE_SERVICES:
+                removed_bytes += self._tree_size(service_dir)
+                shutil.rmtree(service_dir)
+                removed += 1
+        print(f"  🗑️ Removed {removed} service models ({removed_bytes / (1024 * 1024):.1f} MB)")
+    
+    def precompile_bytecode(self):
+        """Write unchecked-hash .pyc files so Lambda never recompiles the read-only sources"""
+        running_version = f"{sys.version_info.major}.{sys.version_info.minor}"
+        if running_version != self.python_version:
+            print(f"⚠️ Skipping .pyc precompilation: building with Python {running_version}, "
+                  f"Lambda runs {self.python_version} (rerun this script with that version)")
+            return
+        
+        print(f"⚙️ Precompiling .pyc files for Python {self.python_version}...")
+        # Paths recorded in the bytecode match where Lambda extracts the function and layers
+        trees = [(self.temp_dir, '/var/task')]
+        if self.layer_dir:
+            trees.append((str(Path(self.layer_dir) / 'python'), '/opt/python'))
+        
+        for directory, lambda_path in trees:
+            compileall.compile_dir(
+                directory, ddir=lambda_path, quiet=1, workers=0,
+                invalidation_mode=py_compile.PycInvalidationMode.UNCHECKED_HASH
+            )
+        print("  ✅ Bytecode compiled")
+    
+    @staticmethod
+    def _tree_size(path):
+        if path.is_file():
+            return path.stat().st_size
+        return sum(f.stat().st_size for f in path.rglob('*') if f.is_file())
+    
+    def report_package(self):
+        """Print per-dependency size and import cost, and the handler's INIT import cost"""
+        sys.path.insert(0, str(self.project_root / 'src'))
+        from cold_start_profile import profile_imports
+        
+        package_dirs = [Path(self.temp_dir)] + ([Path(self.layer_dir) / 'python'] if self.layer_dir else [])
+        # Analysis runs must not add __pycache__ entries to the package
+        extra_env = {
+            'PYTHONDONTWRITEBYTECODE': '1',
+            'PYTHONPATH': os.pathsep.join(str(d) for d in package_dirs)
+        }
+        
+        entries = {}
+        for package_dir in package_dirs:
+            for item in package_dir.iterdir():
+                name = item.name[:-3] if item.name.endswith('.py') else item.name
+                entries[name] = entries.get(name, 0) + self._tree_size(item)
+        total = sum(entries.values()) or 1
+        
+        print("\n📊 Package contents by size (uncompressed):")
+        print(f"{'MB':>9} {'%':>6} {'import ms':>10}  entry")
+        for name, size in sorted(entries.items(), key=lambda item: -item[1]):
+            import_cost = ''
+            is_package = any((d / name / '__init__.py').exists() or (d / f"{name}.py").exists() for d in package_dirs)
+            if is_package and f"{name}.py" not in self.python_files and name.isidentifier():
+                # Each dependency is imported on first use; this is what that first use costs
+                try:
+                    timings = profile_imports(name, package_dirs[0], extra_env)
+                    import_cost = f"{timings[-1].cumulative_us / 1000:.1f}" if timings else 'preloaded'
+                except RuntimeError:
+                    import_cost = 'failed'
+            print(f"{size / (1024 * 1024):9.2f} {100 * size / total:6.1f} {import_cost:>10}  {name}")
+        
+        try:
+            timings = profile_imports('lambda_handler', str(self.temp_dir), extra_env)
+            handler_us = timings[-1].cumulative_us
+            print(f"\n⏱️ Handler import (Lambda INIT): {handler_us / 1000:.1f} ms")
+        except RuntimeError as e:
+            print(f"⚠️ Could not import lambda_handler from the package: {e}")
+        print("   (modules missing from the package resolve from the local environment, "
+              "as the Lambda runtime's boto3/botocore would)\n")
+    
+    def create_zip_file(self, source_dir=None, zip_name=None):
         """Create the final zip file"""
-        print(f"📦 Creating zip file: {self.output_name}")
+        zip_name = zip_name or self.output_name
+        print(f"📦 Creating zip file: {zip_name}")
         
-        zip_path = self.project_root / self.output_name
+        zip_path = self.project_root / zip_name
         
+        unzipped_size = 0
         with zipfile.ZipFile(zip_path, 'w', zipfile.ZIP_DEFLATED) as zipf:
-            temp_path = Path(self.temp_dir)
+            temp_path = Path(source_dir or self.temp_dir)
             
             for file_path in temp_path.rglob('*'):
                 if file_path.is_file():
                     # Calculate relative path for zip
                     relative_path = file_path.relative_to(temp_path)
                     zipf.write(file_path, relative_path)
+                    unzipped_size += file_path.stat().st_size
         
         # Get zip file size
         zip_size = zip_path.stat().st_size
         zip_size_mb = zip_size / (1024 * 1024)
         
         print(f"✅ Zip file created: {zip_path}")
-        print(f"📊 Package size: {zip_size_mb:.2f} MB")
+        print(f"📊 Package size: {zip_size_mb:.2f} MB ({unzipped_size / (1024 * 1024):.2f} MB unzipped)")
         
         # Check Lambda size limits
         if zip_size_mb > 50:
             print("⚠️ Warning: Package size exceeds 50MB Lambda limit!")
         elif zip_size_mb > 10:
             print("⚠️ Warning: Large package size may affect cold start performance")
+        if unzipped_size > 250 * 1024 * 1024:
+            print("⚠️ Warning: Unzipped size exceeds the 250MB Lambda limit (function and layers combined)!")
         
         return zip_path
     
@@ -176,6 +316,8 @@ class LambdaZipCreator:
         if self.temp_dir and os.path.exists(self.temp_dir):
             shutil.rmtree(self.temp_dir)
             print(f"🧹 Cleaned up temporary directory")
+        if self.layer_dir and os.path.exists(self.layer_dir):
+            shutil.rmtree(self.layer_dir)
     
     def create_package(self):
         """Main method to create the Lambda package"""
@@ -196,11 +338,24 @@ class LambdaZipCreator:
             # Clean package
             self.clean_package()
             
-            # Create zip file
+            if self.layer:
+                self.split_layer()
+            
+            if self.optimize:
+                self.prune_botocore_data()
+                self.precompile_bytecode()
+                self.report_package()
+            
+            # Create zip file(s)
             zip_path = self.create_zip_file()
+            if self.layer:
+                layer_name = str(Path(self.output_name).with_name(f"{Path(self.output_name).stem}-layer.zip"))
+                self.layer_zip_path = self.create_zip_file(self.layer_dir, layer_name)
             
             print("\n🎉 Lambda package created successfully!")
             print(f"📦 Package: {zip_path}")
+            if self.layer_zip_path:
+                print(f"🧱 Layer: {self.layer_zip_path} (publish it and attach it to the function)")
             print(f"🔧 Ready for deployment to AWS Lambda")
             
             return zip_path
@@ -219,11 +374,18 @@ def main():
                        help='Custom output zip file name')
     parser.add_argument('--verbose', '-v', action='store_true',
                        help='Verbose output')
+    parser.add_argument('--optimize', action='store_true',
+                       help='Prune botocore models, precompile .pyc and report size/import cost')
+    parser.add_argument('--python-version',
+                       help='Lambda runtime Python version, e.g. 3.11 (default: this interpreter)')
+    parser.add_argument('--layer', action='store_true',
+                       help='Put dependencies in a separate Lambda layer zip')
     
     args = parser.parse_args()
     
     # Create the package
-    creator = LambdaZipCreator(output_name=args.output_name)
+    creator = LambdaZipCreator(output_name=args.output_name, optimize=args.optimize,
+                               python_version=args.python_version, layer=args.layer)
     zip_path = creator.create_package()
     
     if zip_path:
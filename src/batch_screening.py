@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Batch Company Screening
+
+This module screens many companies in one process:
+- Reads company names from CSV, JSONL or plain text files
+- Runs companies concurrently under a global company limit (SERPER searches
+  additionally share the searcher's global search limit and rate limiter)
+- Applies a per-company timeout so one slow entity cannot stall the batch;
+  each search gets a deadline shortly before it, so a slow company returns a
+  partial result instead of being cut off with nothing
+- With a batch deadline, each company also degrades gracefully (partial
+  results) instead of running past it
+- Streams one CompanyInfo JSON line per company as soon as it finishes
+- With a checkpoint store, skips companies finished by an earlier run
+
+Usage:
+    python optimized_company_search.py --batch companies.csv --batch-output results.jsonl
+"""
+
+import csv
+import json
+import sys
+import time
+import asyncio
+import logging
+from dataclasses import asdict
+from typing import Any, AsyncIterator, Dict, List, Optional, TextIO, Tuple
+
+logger = logging.getLogger(__name__)
+
+NAME_COLUMNS = ('company_name', 'company', 'name')
+
+def load_company_names(path: str) -> List[str]:
+    """
+    Load company names from a batch input file
+
+    - .jsonl: one JSON object per line with company_name/company/name, or a JSON string
+    - .csv: a company_name/company/name column, otherwise the first column
+    - anything else: one company name per line
+    """
+    names = []
+    with open(path, 'r', encoding='utf-8-sig', newline='') as f:
+        if path.lower().endswith(('.jsonl', '.ndjson')):
+            for line_number, line in enumerate(f, 1):
+                line = line.strip()
+                if not line:
+                    continue
+                record = json.loads(line)
+                if isinstance(record, str):
+                    names.append(record)
+                    continue
+                name = next((record.get(column) for column in NAME_COLUMNS if record.get(column)), None)
+                if name:
+                    names.append(name)
+                else:
+                    logger.warning(f"Skipping line {line_number}: no company name field")
+        elif path.lower().endswith('.csv'):
+            reader = csv.reader(f)
+            header = next(reader, None)
+            if header is None:
+                return []
+            lowered = [column.strip().lower() for column in header]
+            column = next((lowered.index(c) for c in NAME_COLUMNS if c in lowered), None)
+            if column is None:
+                # No recognised header - treat the first row as data
+                column = 0
+                if header and header[0].strip():
+                    names.append(header[0])
+            for row in reader:
+                if len(row) > column and row[column].strip():
+                    names.append(row[column])
+        else:
+            names.extend(line for line in f)
+
+    return [name.strip() for name in names if name and name.strip()]
+
+class BatchScreener:
+    """Screen many companies concurrently with one shared searcher"""
+
+    def __init__(self, searcher, max_concurrent_companies: int = 4, company_timeout: float = 300.0,
+                 deadline: Optional[float] = None, deadline_margin: float = 10.0):
+        self.searcher = searcher
+        self.max_concurrent_companies = max(1, max_concurrent_companies)
+        self.company_timeout = company_timeout
+        # Absolute time.monotonic() by which every company should have returned
+        self.deadline = deadline
+        # Seconds before the company timeout at which its search starts wrapping up
+        # (at most a quarter of the timeout)
+        self.deadline_margin = min(deadline_margin, company_timeout / 4)
+
+    async def _screen_one(self, company_name: str, semaphore: asyncio.Semaphore):
+        async with semaphore:
+            started = time.monotonic()
+            deadline = started + self.company_timeout - self.deadline_margin
+            if self.deadline is not None:
+                deadline = min(self.deadline, deadline)
+            search = self.searcher.search_company(company_name, deadline=deadline)
+            try:
+                company_info = await asyncio.wait_for(search, timeout=self.company_timeout)
+            except asyncio.TimeoutError:
+                logger.error(f"Timed out after {self.company_timeout:g}s: {company_name}")
+                company_info = self.searcher.failed_company_info(
+                    company_name, f"Timed out after {self.company_timeout:g}s"
+                )
+            except Exception as e:
+                logger.error(f"Screening failed for {company_name}: {e}")
+                company_info = self.searcher.failed_company_info(company_name, str(e))
+
+            logger.info(f"Finished {company_name} in {time.monotonic() - started:.1f}s")
+            return company_name, company_info
+
+    async def screen(self, company_names: List[str]) -> AsyncIterator[Tuple[str, Any]]:
+        """Yield (company_name, CompanyInfo) pairs in completion order"""
+        semaphore = asyncio.Semaphore(self.max_concurrent_companies)
+        tasks = [asyncio.create_task(self._screen_one(name, semaphore)) for name in company_names]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def run(self, company_names: List[str], output: TextIO) -> Dict[str, Any]:
+        """Screen companies, writing one CompanyInfo JSON line per company as it finishes"""
+        started = time.monotonic()
+        completed = 0
+        failed = 0
+
+        checkpoint_store = self.searcher.checkpoint_store
+        if checkpoint_store:
+            completed_keys = checkpoint_store.completed_companies()
+            remaining = [name for name in company_names if not checkpoint_store.is_completed(name, completed_keys)]
+            if len(remaining) < len(company_names):
+                logger.info(f"Checkpoint: skipping {len(company_names) - len(remaining)} already completed companies")
+            company_names = remaining
+        
+        logger.info(f"Batch screening {len(company_names)} companies "
+                    f"({self.max_concurrent_companies} concurrent, {self.company_timeout:g}s timeout each)")
+
+        async for company_name, company_info in self.screen(company_names):
+            output.write(json.dumps(asdict(company_info), ensure_ascii=False, default=str) + '\n')
+            output.flush()
+            completed += 1
+            if any(str(source).startswith('Error:') for source in company_info.sources):
+                failed += 1
+
+        summary = {
+            'companies': len(company_names),
+            'completed': completed,
+            'failed': failed,
+            'elapsed_seconds': round(time.monotonic() - started, 1)
+        }
+        if self.searcher.result_store:
+            summary['result_store'] = self.searcher.result_store.stats()
+        logger.info(f"Batch complete: {summary}")
+        return summary
+
+async def run_batch_file(searcher, input_path: str, output_path: Optional[str] = None,
+                         max_concurrent_companies: int = 4, company_timeout: float = 300.0) -> Dict[str, Any]:
+    """Screen every company in input_path, streaming JSONL to output_path (default: stdout)"""
+    company_names = load_company_names(input_path)
+    screener = BatchScreener(searcher, max_concurrent_companies, company_timeout)
+
+    if not output_path:
+        return await screener.run(company_names, sys.stdout)
+
+    with open(output_path, 'a', encoding='utf-8') as output:
+        return await screener.run(company_names, output)
@@ -0,0 +1,105 @@
+#!/usr/bin/env python3
+"""
+Checkpoint Store for Long Batch Runs
+
+This module records screening progress durably in a local SQLite file so a
+run that dies (Lambda timeout, Bedrock throttling, laptop sleep) can resume:
+- Completed companies with their final CompanyInfo
+- Per company, the completed query IDs and their raw search results
+
+A restarted run skips finished companies and replays saved search results
+into the SEC extraction and LLM steps instead of searching again.
+"""
+
+import json
+import time
+import sqlite3
+import threading
+import logging
+from typing import Any, Dict, List, Optional, Set
+
+logger = logging.getLogger(__name__)
+
+class CheckpointStore:
+    """Durable record of completed companies and completed queries"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS completed_companies ('
+            'company_key TEXT PRIMARY KEY, company_name TEXT NOT NULL, '
+            'result TEXT NOT NULL, completed_at REAL NOT NULL)'
+        )
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS query_results ('
+            'company_key TEXT NOT NULL, query_id TEXT NOT NULL, query TEXT NOT NULL, '
+            'results TEXT NOT NULL, completed_at REAL NOT NULL, '
+            'PRIMARY KEY (company_key, query_id))'
+        )
+
+    @staticmethod
+    def _company_key(company_name: str) -> str:
+        return ' '.join(company_name.split())
+
+    def get_completed(self, company_name: str) -> Optional[Dict[str, Any]]:
+        """Final result for a completed company, or None"""
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT result FROM completed_companies WHERE company_key = ?',
+                (self._company_key(company_name),)
+            ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def completed_companies(self) -> Set[str]:
+        """Keys of every completed company"""
+        with self._lock:
+            rows = self._conn.execute('SELECT company_key FROM completed_companies').fetchall()
+        return {row[0] for row in rows}
+
+    def is_completed(self, company_name: str, completed: Optional[Set[str]] = None) -> bool:
+        completed = self.completed_companies() if completed is None else completed
+        return self._company_key(company_name) in completed
+
+    def mark_completed(self, company_name: str, result: Dict[str, Any]):
+        """Record a company's final result"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO completed_companies (company_key, company_name, result, completed_at) '
+                'VALUES (?, ?, ?, ?)',
+                (self._company_key(company_name), company_name,
+                 json.dumps(result, ensure_ascii=False, default=str), time.time())
+            )
+
+    def get_query_results(self, company_name: str) -> Dict[str, Dict[str, Any]]:
+        """Saved searches for a company: query_id -> {'query': ..., 'results': [...]}"""
+        with self._lock:
+            rows = self._conn.execute(
+                'SELECT query_id, query, results FROM query_results WHERE company_key = ?',
+                (self._company_key(company_name),)
+            ).fetchall()
+        return {query_id: {'query': query, 'results': json.loads(results)} for query_id, query, results in rows}
+
+    def save_query_result(self, company_name: str, query_id: str, query: str, results: List[Dict]):
+        """Record the raw results of one completed query"""
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO query_results (company_key, query_id, query, results, completed_at) '
+                'VALUES (?, ?, ?, ?, ?)',
+                (self._company_key(company_name), query_id, query,
+                 json.dumps(results, ensure_ascii=False), time.time())
+            )
+
+    def clear_company(self, company_name: str):
+        """Forget all progress for a company"""
+        key = self._company_key(company_name)
+        with self._lock:
+            self._conn.execute('DELETE FROM completed_companies WHERE company_key = ?', (key,))
+            self._conn.execute('DELETE FROM query_results WHERE company_key = ?', (key,))
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
@@ -0,0 +1,169 @@
+#!/usr/bin/env python3
+"""
+Cold Start Profiler
+
+This module measures what a Lambda cold start pays before the first search:
+- Per-module import cost of the handler, from a fresh interpreter run with
+  `-X importtime` (the same data as `optimized_company_search.py --import-profile`)
+- A cold-start benchmark: each run starts a new interpreter and times importing
+  the handler (Lambda INIT), creating the searcher (first invocation setup) and
+  the imports the first search adds
+
+Runs default to the Lambda code paths (AWS_LAMBDA_FUNCTION_NAME is set when
+missing) and use placeholder SERPER/AWS settings, so no network access or
+credentials are needed. --src points at another checkout's src/ directory to
+compare against an older revision.
+
+Usage:
+    python cold_start_profile.py --runs 20
+    python cold_start_profile.py --imports
+    python cold_start_profile.py --src /tmp/baseline/src
+"""
+
+import os
+import re
+import sys
+import json
+import argparse
+import statistics
+import subprocess
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+SRC_DIR = os.path.dirname(os.path.abspath(__file__))
+
+IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)\s*$')
+
+# Runs in a fresh interpreter; prints phase timings in milliseconds as JSON
+BENCHMARK_SCRIPT = """
+import json, time
+started = time.perf_counter()
+import {module}
+imported = time.perf_counter()
+timings = {{'import_ms': (imported - started) * 1000}}
+if {init_searcher}:
+    from optimized_company_search import OptimizedCompanySearcher
+    OptimizedCompanySearcher()
+    created = time.perf_counter()
+    timings['searcher_ms'] = (created - imported) * 1000
+    # The first search imports the async HTTP client (already loaded by eager-import trees)
+    try:
+        import aiohttp
+    except ImportError:
+        pass
+    timings['first_search_ms'] = (time.perf_counter() - created) * 1000
+print(json.dumps(timings))
+"""
+
+@dataclass
+class ImportTiming:
+    """One line of `python -X importtime` output"""
+    module: str
+    self_us: int
+    cumulative_us: int
+    depth: int
+
+def _cold_start_env() -> Dict[str, str]:
+    """Environment for child interpreters: Lambda code paths, placeholder credentials"""
+    env = dict(os.environ)
+    env.setdefault('AWS_LAMBDA_FUNCTION_NAME', 'cold-start-profile')
+    env.setdefault('SERPER_API_KEY', 'cold-start-profile')
+    env.setdefault('AWS_DEFAULT_REGION', 'us-east-1')
+    return env
+
+def parse_importtime(output: str) -> List[ImportTiming]:
+    """Parse `-X importtime` stderr (children are listed before their parent)"""
+    timings = []
+    for line in output.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if match:
+            self_us, cumulative_us, indent, module = match.groups()
+            timings.append(ImportTiming(module, int(self_us), int(cumulative_us), (len(indent) - 1) // 2))
+    return timings
+
+def profile_imports(module: str = 'lambda_handler', src_dir: str = SRC_DIR,
+                    extra_env: Optional[Dict[str, str]] = None) -> List[ImportTiming]:
+    """
+    Import timings for module and everything it pulls in, measured in a fresh
+    interpreter (interpreter startup imports are excluded; empty if the module
+    was already loaded at startup, e.g. by a .pth file)
+    """
+    env = _cold_start_env()
+    env.update(extra_env or {})
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', f'import {module}'],
+        cwd=src_dir, env=env, capture_output=True, text=True
+    )
+    timings = parse_importtime(result.stderr)
+    if result.returncode != 0:
+        raise RuntimeError(f"Importing {module} failed: {result.stderr.strip().splitlines()[-1]}")
+
+    # The module's own subtree ends at its depth-0 line
+    ends = [i for i, timing in enumerate(timings) if timing.module == module and timing.depth == 0]
+    if not ends:
+        return []
+    end = ends[-1]
+    start = end
+    while start > 0 and timings[start - 1].depth > 0:
+        start -= 1
+    return timings[start:end + 1]
+
+def format_import_report(timings: List[ImportTiming], module: str, top: int = 20) -> str:
+    """Per-package and per-module breakdown of profile_imports() output"""
+    total_us = timings[-1].cumulative_us if timings else 0
+    by_package = defaultdict(int)
+    for timing in timings:
+        by_package[timing.module.split('.')[0]] += timing.self_us
+
+    lines = [f"Cold-start import profile: {module} ({total_us / 1000:.1f} ms, {len(timings)} modules)", "",
+             "Top-level packages by self time:", f"{'ms':>8} {'%':>6}  package"]
+    for package, self_us in sorted(by_package.items(), key=lambda item: -item[1])[:top]:
+        lines.append(f"{self_us / 1000:8.1f} {100 * self_us / max(1, total_us):6.1f}  {package}")
+
+    lines += ["", "Slowest modules (cumulative):", f"{'ms':>8} {'self ms':>8}  module"]
+    for timing in sorted(timings, key=lambda t: -t.cumulative_us)[:top]:
+        lines.append(f"{timing.cumulative_us / 1000:8.1f} {timing.self_us / 1000:8.1f}  "
+                     f"{'  ' * timing.depth}{timing.module}")
+    return "\n".join(lines)
+
+def measure_cold_start(module: str = 'lambda_handler', runs: int = 10, src_dir: str = SRC_DIR,
+                       init_searcher: bool = True) -> Dict[str, List[float]]:
+    """Phase timings in milliseconds, one entry per fresh-interpreter run"""
+    script = BENCHMARK_SCRIPT.format(module=module, init_searcher=init_searcher)
+    samples = defaultdict(list)
+    for _ in range(runs):
+        result = subprocess.run([sys.executable, '-c', script], cwd=src_dir, env=_cold_start_env(),
+                                capture_output=True, text=True)
+        if result.returncode != 0:
+            raise RuntimeError(f"Cold-start run failed: {result.stderr.strip().splitlines()[-1]}")
+        for phase, elapsed_ms in json.loads(result.stdout.strip().splitlines()[-1]).items():
+            samples[phase].append(elapsed_ms)
+    return dict(samples)
+
+def format_benchmark(samples: Dict[str, List[float]], label: Optional[str] = None) -> str:
+    lines = [f"Cold-start benchmark{f' ({label})' if label else ''}: {len(next(iter(samples.values())))} runs",
+             f"{'phase':<16} {'median':>8} {'min':>8} {'max':>8}  (ms)"]
+    for phase, values in samples.items():
+        lines.append(f"{phase:<16} {statistics.median(values):8.1f} {min(values):8.1f} {max(values):8.1f}")
+    return "\n".join(lines)
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure Lambda cold-start import and initialization cost')
+    parser.add_argument('--module', default='lambda_handler', help='Module to cold-start (default: lambda_handler)')
+    parser.add_argument('--runs', type=int, default=10, help='Fresh-interpreter runs (default: 10)')
+    parser.add_argument('--src', default=SRC_DIR, help='Source directory to run from (default: this directory)')
+    parser.add_argument('--imports', action='store_true', help='Also print the per-module import profile')
+    parser.add_argument('--no-searcher', action='store_true', help='Only time the import (Lambda INIT)')
+    args = parser.parse_args()
+
+    src_dir = os.path.abspath(args.src)
+    if args.imports:
+        print(format_import_report(profile_imports(args.module, src_dir), args.module))
+        print()
+
+    samples = measure_cold_start(args.module, args.runs, src_dir, init_searcher=not args.no_searcher)
+    print(format_benchmark(samples, src_dir))
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,56 @@
+#!/usr/bin/env python3
+"""
+Company Name Normalization
+
+This module holds the name helpers shared by the EDGAR index, LLM context
+selection and the search result store, so they agree on when two names refer
+to the same company:
+- normalize_name() lowercases, spells out '&', drops punctuation, EDGAR state
+  tags (/DE/) and legal suffixes (Inc, Corp, Ltd, ...), so "Apple" and
+  "Apple Inc." normalize alike
+- name_tokens() gives the distinct, non-stopword tokens used for fuzzy matching
+- mentions_name() tells whether a text mentions a normalized name as whole
+  words ("apple" is not found in "pineapple")
+"""
+
+import re
+from functools import lru_cache
+from typing import List
+
+LEGAL_SUFFIXES = {
+    'inc', 'incorporated', 'corp', 'corporation', 'co', 'company', 'cos', 'ltd', 'limited',
+    'llc', 'plc', 'lp', 'llp', 'sa', 'ag', 'nv', 'se', 'the'
+}
+STOPWORDS = {'the', 'and', 'of', 'a', 'an'}
+
+def normalize_name(name: str) -> str:
+    """
+    Normalize an entity name for lookup: lowercase, '&' -> 'and', punctuation
+    removed and legal suffixes (Inc, Corp, Ltd, ...) and EDGAR state tags (/DE/) dropped
+    """
+    text = name.lower().replace('&', ' and ')
+    text = re.sub(r'\s*/[a-z]{2,3}/?\s*$', '', text)   # "IBM CORP /NY/" state tag
+    text = re.sub(r"['’.]", '', text)               # "McDonald's", "U.S."
+    tokens = re.sub(r'[^a-z0-9]+', ' ', text).split()
+    stripped = list(tokens)
+    while stripped and stripped[-1] in LEGAL_SUFFIXES:
+        stripped.pop()
+    if stripped and stripped[0] == 'the':
+        stripped.pop(0)
+    return ' '.join(stripped or tokens)
+
+def name_tokens(normalized: str) -> List[str]:
+    """Distinct tokens used for fuzzy matching"""
+    return sorted({token for token in normalized.split() if token not in STOPWORDS})
+
+@lru_cache(maxsize=4096)
+def _name_pattern(normalized: str):
+    words = r'[^a-z0-9]+'.join(re.escape(token) for token in normalized.split())
+    return re.compile(rf'(?<![a-z0-9]){words}(?![a-z0-9])')
+
+def mentions_name(text: str, normalized: str) -> bool:
+    """Whether text mentions the normalized name, its tokens as whole words in order"""
+    if not normalized:
+        return False
+    text = re.sub(r"['’.]", '', text.lower().replace('&', ' and '))
+    return _name_pattern(normalized).search(text) is not None
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+LLM Context Selection
+
+This module chooses which search results go into the Nova prompt, instead of
+the first N unique results in query order:
+- Every result is scored for source authority (sec.gov, Wikipedia, financial
+  sources, ...), coverage of the fields the prompt asks for (keyword groups,
+  one literal scan per result) and how well it matches the company name
+- Results are picked greedily (maximal marginal relevance): field groups
+  already covered by picked results count less, and snippets similar to a
+  picked one (token-set Jaccard) are penalized. Scores only fall as picks are
+  made, so stale scores in a heap are upper bounds and only the top candidate
+  is rescored each round (lazy greedy)
+- Picks stop when the estimated token budget or result limit is reached
+- A focus (subset of the field groups) restricts selection to results that can
+  fill those groups and scores coverage on them only, for prompts that extract
+  one group of fields
+"""
+
+import re
+import heapq
+from typing import Dict, Iterable, List, Optional, Set
+from urllib.parse import urlparse
+
+from company_names import normalize_name, name_tokens
+from literal_matcher import LiteralMatcher
+
+CHARS_PER_TOKEN = 4          # rough estimate for English web text
+RESULT_OVERHEAD_TOKENS = 8   # numbering and "Title/Snippet/Source" labels in the prompt
+
+# Domain suffix -> authority score (first match wins, most specific first)
+SOURCE_AUTHORITY = (
+    ('sec.gov', 1.0),
+    ('wikipedia.org', 0.8),
+    ('reuters.com', 0.6),
+    ('bloomberg.com', 0.6),
+    ('finance.yahoo.com', 0.6),
+    ('opencorporates.com', 0.6),
+    ('linkedin.com', 0.5),
+    ('macrotrends.net', 0.5),
+    ('stockanalysis.com', 0.5),
+    ('zoominfo.com', 0.4),
+    ('dnb.com', 0.4),
+)
+DEFAULT_AUTHORITY = 0.3
+
+# Field group -> keywords that suggest a result can fill it
+FIELD_KEYWORDS = {
+    'registration': ('commission file number', 'file no', 'file number', '001-', '000-', 'registration number'),
+    'incorporation': ('incorporated', 'incorporation', 'state of organization', 'founded'),
+    # Short identifiers are matched with a delimiter, as the scan matches inside words
+    'identifiers': ('cik:', 'cik ', 'lei:', ' lei ', 'duns', 'ein:', ' ein ', 'employer identification',
+                    'central index key'),
+    'executives': ('ceo', 'chief executive', 'cfo', 'chief financial', 'president', 'chairman', 'board of directors'),
+    'financials': ('revenue', 'market cap', 'net income', 'employees', 'fiscal year'),
+    'headquarters': ('headquarter', 'principal executive offices', 'address'),
+    'filings': ('10-k', '20-f', '8-k', 'def 14a', 'proxy statement', 'annual report', 'edgar'),
+    'structure': ('subsidiary', 'subsidiaries', 'parent company', 'acquired by', 'ticker', 'nyse', 'nasdaq'),
+}
+FIELD_BITS = {group: 1 << i for i, group in enumerate(FIELD_KEYWORDS)}
+
+WORD = re.compile(r'[a-z0-9]+')
+
+def estimate_tokens(text: str) -> int:
+    return (len(text) + CHARS_PER_TOKEN - 1) // CHARS_PER_TOKEN
+
+def _jaccard(a: Set[str], b: Set[str]) -> float:
+    if not a or not b:
+        return 0.0
+    return len(a & b) / len(a | b)
+
+def source_authority(link: str) -> float:
+    """Authority score of the site a result comes from (SOURCE_AUTHORITY, else DEFAULT_AUTHORITY)"""
+    host = urlparse(link).netloc.lower()
+    for suffix, score in SOURCE_AUTHORITY:
+        if host == suffix or host.endswith('.' + suffix):
+            return score
+    return DEFAULT_AUTHORITY
+
+class ContextSelector:
+    """Scores search results and packs the best ones into a prompt token budget"""
+
+    def __init__(self, token_budget: int = 1500, max_results: int = 40,
+                 authority_weight: float = 1.0, field_weight: float = 2.0,
+                 entity_weight: float = 1.0, novelty_weight: float = 0.7):
+        self.token_budget = token_budget
+        self.max_results = max_results
+        self.authority_weight = authority_weight
+        self.field_weight = field_weight
+        self.entity_weight = entity_weight
+        self.novelty_weight = novelty_weight
+        self._field_matcher = LiteralMatcher({
+            keyword: FIELD_BITS[group] for group, keywords in FIELD_KEYWORDS.items() for keyword in keywords
+        })
+
+    @staticmethod
+    def _entity_match(text_lower: str, normalized: str, tokens: List[str]) -> float:
+        """1.0 for the full normalized name, else 0.8 x the fraction of name tokens present"""
+        if not tokens:
+            return 0.0
+        if normalized in text_lower:
+            return 1.0
+        words = set(WORD.findall(text_lower))
+        return 0.8 * sum(1 for token in tokens if token in words) / len(tokens)
+
+    def select(self, search_results: List[Dict], company_name: str,
+               token_budget: Optional[int] = None, max_results: Optional[int] = None,
+               focus: Optional[Iterable[str]] = None) -> List[Dict]:
+        """
+        Best results for the prompt, most useful first, within the token budget
+        (only results matching a FIELD_KEYWORDS group in focus, when given and not empty)
+        """
+        token_budget = self.token_budget if token_budget is None else token_budget
+        max_results = self.max_results if max_results is None else max_results
+        focus = None if focus is None else set(focus)
+        if not focus:
+            # No focus (or an empty one): every field group counts
+            focus = None
+            focus_mask = sum(FIELD_BITS.values())
+        else:
+            focus_mask = sum(FIELD_BITS[group] for group in focus)
+        normalized = normalize_name(company_name)
+        tokens = name_tokens(normalized)
+
+        candidates = []
+        for result in search_results:
+            title = result.get('title', '')
+            snippet = result.get('snippet', '')
+            link = result.get('link', '')
+            text_lower = f"{title} {snippet}".lower()
+            fields = self._field_matcher.scan(text_lower) & focus_mask
+            if focus is not None and not fields:
+                continue
+            entity = self._entity_match(f"{link.lower()} {text_lower}", normalized, tokens)
+            candidates.append({
+                'result': result,
+                'base': self.authority_weight * source_authority(link) + self.entity_weight * entity,
+                'fields': fields,
+                'words': set(WORD.findall(snippet.lower())),
+                'cost': estimate_tokens(f"{title}{snippet}{link}") + RESULT_OVERHEAD_TOKENS,
+                'similarity': 0.0,
+                'seen': 0,   # number of picks the similarity has been compared against
+            })
+
+        selected = []
+        picked_words = []
+        covered = 0
+        used_tokens = 0
+        group_count = bin(focus_mask).count('1')
+
+        def score(candidate) -> float:
+            # Only field groups no picked result covers yet count towards coverage
+            new_fields = bin(candidate['fields'] & ~covered).count('1')
+            return (candidate['base'] + self.field_weight * new_fields / group_count
+                    - self.novelty_weight * candidate['similarity'])
+
+        # Ties go to the earlier result (query order)
+        heap = [(-score(candidate), index) for index, candidate in enumerate(candidates)]
+        heapq.heapify(heap)
+        while heap and len(selected) < max_results:
+            _, index = heapq.heappop(heap)
+            candidate = candidates[index]
+            if used_tokens + candidate['cost'] > token_budget:
+                # Used tokens only grow, so it will never fit; smaller candidates may still
+                continue
+
+            for words in picked_words[candidate['seen']:]:
+                candidate['similarity'] = max(candidate['similarity'], _jaccard(candidate['words'], words))
+            candidate['seen'] = len(picked_words)
+            entry = (-score(candidate), index)
+            if heap and entry > heap[0]:
+                heapq.heappush(heap, entry)
+                continue
+
+            selected.append(candidate['result'])
+            picked_words.append(candidate['words'])
+            covered |= candidate['fields']
+            used_tokens += candidate['cost']
+
+        return selected
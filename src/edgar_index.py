@@ -0,0 +1,380 @@
+#!/usr/bin/env python3
+"""
+Local EDGAR Company Index
+
+This module resolves company names and tickers to SEC CIKs offline, replacing
+per-name browse-edgar requests:
+- Built once from SEC's bulk company_tickers.json and (optionally) the
+  submissions.zip bulk archive, which adds every filer and its former names
+- Stored as one sorted, line-oriented file that is memory-mapped, so loading
+  is instant and lookups are binary searches over the mapped bytes
+- Normalized exact, word prefix (like browse-edgar's "starts with" search), ticker
+  and token-based fuzzy lookup
+
+Usage:
+    python edgar_index.py build --download --output edgar_index.dat
+    python edgar_index.py build --tickers company_tickers.json --submissions submissions.zip
+    python edgar_index.py lookup "International Business Machines"
+"""
+
+import os
+import json
+import mmap
+import time
+import zipfile
+import argparse
+import threading
+import logging
+from collections import defaultdict
+from dataclasses import dataclass
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+from company_names import normalize_name, name_tokens
+
+logger = logging.getLogger(__name__)
+
+INDEX_MAGIC = b'EDGAR-COMPANY-INDEX'
+INDEX_VERSION = 1
+SECTIONS = ('names', 'tickers', 'tokens', 'entities')
+
+COMPANY_TICKERS_URL = 'https://www.sec.gov/files/company_tickers.json'
+SUBMISSIONS_ZIP_URL = 'https://www.sec.gov/Archives/edgar/daily-index/bulkdata/submissions.zip'
+
+# Name ranks: lower ranks win when several entities share a normalized name
+RANK_LISTED = 0    # Current name of an exchange-listed company (company_tickers.json)
+RANK_CURRENT = 1   # Current name of any EDGAR filer (submissions)
+RANK_FORMER = 2    # Former name of an EDGAR filer (submissions)
+
+@dataclass
+class IndexMatch:
+    """A resolved EDGAR entity"""
+    cik: str
+    name: str
+    match_type: str   # exact, ticker, prefix or fuzzy
+    score: float = 1.0
+
+class EdgarCompanyIndex:
+    """Read-only, memory-mapped EDGAR name/ticker/CIK index"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._file = open(path, 'rb')
+        self._mm = mmap.mmap(self._file.fileno(), 0, access=mmap.ACCESS_READ)
+
+        header_end = self._mm.find(b'\n')
+        header = self._mm[:header_end].split(b'\t', 2)
+        if header[0] != INDEX_MAGIC or int(header[1]) != INDEX_VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {INDEX_VERSION} EDGAR company index")
+        self.metadata = json.loads(header[2]) if len(header) > 2 else {}
+
+        # Section bounds: [start of first line, start of next section marker)
+        self._sections: Dict[str, Tuple[int, int]] = {}
+        markers = []
+        for section in SECTIONS + ('end',):
+            marker = b'\n@' + section.encode() + b'\n'
+            position = self._mm.find(marker)
+            if position < 0:
+                self.close()
+                raise ValueError(f"{path} is missing the '{section}' section")
+            markers.append((section, position + 1, position + len(marker)))
+        for (section, _, start), (_, next_marker, _) in zip(markers, markers[1:]):
+            self._sections[section] = (start, next_marker)
+
+    def close(self):
+        self._mm.close()
+        self._file.close()
+
+    def _lower_bound(self, section: str, key: bytes) -> int:
+        """Offset of the first line in section whose key is >= key"""
+        start, end = self._sections[section]
+        mm = self._mm
+        lo, hi = start, end
+        while lo < hi:
+            mid = (lo + hi) // 2
+            line_start = max(start, mm.rfind(b'\n', start, mid) + 1)
+            line_end = mm.find(b'\n', line_start, end)
+            if mm[line_start:line_end].split(b'\t', 1)[0] < key:
+                lo = line_end + 1
+            else:
+                hi = line_start
+        return lo
+
+    def _scan(self, section: str, key: bytes, prefix: bool = False) -> Iterator[List[bytes]]:
+        """Yield the fields of consecutive lines whose key equals (or starts with) key"""
+        _, end = self._sections[section]
+        mm = self._mm
+        position = self._lower_bound(section, key)
+        while position < end:
+            line_end = mm.find(b'\n', position, end)
+            fields = mm[position:line_end].split(b'\t')
+            if not (fields[0].startswith(key) if prefix else fields[0] == key):
+                return
+            yield fields
+            position = line_end + 1
+
+    def lookup_exact(self, name: str) -> List[IndexMatch]:
+        """Entities whose normalized name equals the normalized query, best ranked first"""
+        key = normalize_name(name).encode()
+        if not key:
+            return []
+        return [IndexMatch(cik.decode(), display.decode('utf-8'), 'exact')
+                for _, _, cik, display in self._scan('names', key)]
+
+    def lookup_prefix(self, name: str, limit: int = 10) -> List[IndexMatch]:
+        """Entities whose normalized name starts with the normalized query's words, in name order"""
+        key = normalize_name(name).encode()
+        matches: List[IndexMatch] = []
+        if not key:
+            return matches
+        seen = set()
+        # Whole words only: "ford" matches "ford motor" but not "fordham"
+        for normalized, _, cik, display in self._scan('names', key + b' ', prefix=True):
+            if cik not in seen:
+                seen.add(cik)
+                matches.append(IndexMatch(cik.decode(), display.decode('utf-8'), 'prefix',
+                                          len(key) / max(len(normalized), 1)))
+                if len(matches) >= limit:
+                    break
+        return matches
+
+    def lookup_ticker(self, ticker: str) -> Optional[IndexMatch]:
+        key = ticker.strip().lower().encode()
+        for _, cik, display in self._scan('tickers', key):
+            return IndexMatch(cik.decode(), display.decode('utf-8'), 'ticker')
+        return None
+
+    def lookup_fuzzy(self, name: str, limit: int = 5, min_score: float = 0.5) -> List[IndexMatch]:
+        """Entities ranked by token Jaccard similarity to the query"""
+        tokens = name_tokens(normalize_name(name))
+        if not tokens:
+            return []
+
+        shared: Dict[Tuple[bytes, int], int] = defaultdict(int)
+        for token in tokens:
+            for fields in self._scan('tokens', token.encode()):
+                for posting in fields[1].split(b','):
+                    cik, token_count = posting.split(b':')
+                    shared[(cik, int(token_count))] += 1
+
+        best: Dict[bytes, float] = {}
+        for (cik, token_count), count in shared.items():
+            score = count / (len(tokens) + token_count - count)
+            if score >= min_score and score > best.get(cik, 0.0):
+                best[cik] = score
+
+        ranked = sorted(best.items(), key=lambda item: (-item[1], item[0]))[:limit]
+        return [IndexMatch(cik.decode(), self.entity_name(cik.decode()) or '', 'fuzzy', round(score, 3))
+                for cik, score in ranked]
+
+    def entity_name(self, cik: str) -> Optional[str]:
+        """Current name of an entity by CIK"""
+        for _, display in self._scan('entities', cik.zfill(10).encode()):
+            return display.decode('utf-8')
+        return None
+
+    def resolve(self, name: str, min_score: float = 0.6) -> Optional[IndexMatch]:
+        """Best single match: exact name, then ticker, then name prefix, then fuzzy"""
+        exact = self.lookup_exact(name)
+        if exact:
+            return exact[0]
+
+        candidate = name.strip()
+        if candidate and len(candidate) <= 6 and ' ' not in candidate and candidate.upper() == candidate:
+            ticker = self.lookup_ticker(candidate)
+            if ticker:
+                return ticker
+
+        prefix = self.lookup_prefix(name, limit=1)
+        if prefix:
+            return prefix[0]
+
+        fuzzy = self.lookup_fuzzy(name, limit=1, min_score=min_score)
+        return fuzzy[0] if fuzzy else None
+
+def _clean_field(value: str) -> str:
+    return ' '.join(str(value).split())
+
+def build_index(entries: Iterable[Tuple[str, str, Optional[str], int]], path: str,
+                metadata: Optional[Dict] = None) -> Dict[str, int]:
+    """
+    Write an index file from (cik, name, ticker, rank) entries
+
+    Returns counts of names, tickers, tokens and entities written.
+    """
+    names = {}
+    tickers = {}
+    entities = {}
+    for cik, name, ticker, rank in entries:
+        cik = str(cik).zfill(10)
+        display = _clean_field(name)
+        normalized = normalize_name(display)
+        if not normalized:
+            continue
+        key = (normalized, cik)
+        if key not in names or rank < names[key][0]:
+            names[key] = (rank, display)
+        if rank < entities.get(cik, (RANK_FORMER + 1,))[0]:
+            entities[cik] = (rank, display)
+        if ticker:
+            ticker_key = (_clean_field(ticker).lower(), cik)
+            if ticker_key not in tickers or rank < tickers[ticker_key][0]:
+                tickers[ticker_key] = (rank, display)
+
+    postings = defaultdict(set)
+    for normalized, cik in names:
+        tokens = name_tokens(normalized)
+        for token in tokens:
+            postings[token].add(f"{cik}:{len(tokens)}")
+
+    name_lines = sorted(
+        (normalized.encode(), rank, cik.encode(), display.encode('utf-8'))
+        for (normalized, cik), (rank, display) in names.items()
+    )
+    ticker_lines = sorted(
+        (ticker.encode(), rank, cik.encode(), display.encode('utf-8'))
+        for (ticker, cik), (rank, display) in tickers.items()
+    )
+
+    metadata = dict(metadata or {}, built_at=int(time.time()))
+    temp_path = f"{path}.tmp"
+    with open(temp_path, 'wb') as f:
+        f.write(INDEX_MAGIC + b'\t' + str(INDEX_VERSION).encode() + b'\t' +
+                json.dumps(metadata, sort_keys=True).encode() + b'\n')
+        f.write(b'@names\n')
+        for normalized, rank, cik, display in name_lines:
+            f.write(b'\t'.join((normalized, str(rank).encode(), cik, display)) + b'\n')
+        f.write(b'@tickers\n')
+        for ticker, _, cik, display in ticker_lines:
+            f.write(b'\t'.join((ticker, cik, display)) + b'\n')
+        f.write(b'@tokens\n')
+        for token in sorted(postings):
+            f.write(token.encode() + b'\t' + ','.join(sorted(postings[token])).encode() + b'\n')
+        f.write(b'@entities\n')
+        for cik in sorted(entities):
+            f.write(cik.encode() + b'\t' + entities[cik][1].encode('utf-8') + b'\n')
+        f.write(b'@end\n')
+    os.replace(temp_path, path)
+
+    return {'names': len(name_lines), 'tickers': len(ticker_lines),
+            'tokens': len(postings), 'entities': len(entities)}
+
+def iter_company_tickers(path: str) -> Iterator[Tuple[str, str, Optional[str], int]]:
+    """Entries from SEC's company_tickers.json"""
+    with open(path, 'r', encoding='utf-8') as f:
+        data = json.load(f)
+    records = data.values() if isinstance(data, dict) else data
+    for record in records:
+        yield str(record['cik_str']), record['title'], record.get('ticker'), RANK_LISTED
+
+def iter_submissions(zip_path: str) -> Iterator[Tuple[str, str, Optional[str], int]]:
+    """Entries (current and former names, tickers) from SEC's submissions.zip bulk archive"""
+    with zipfile.ZipFile(zip_path) as archive:
+        for member in archive.namelist():
+            # CIK##########.json holds the entity; CIK##########-submissions-NNN.json only filings
+            if not member.startswith('CIK') or not member.endswith('.json') or '-' in member:
+                continue
+            try:
+                submission = json.loads(archive.read(member))
+            except ValueError:
+                logger.warning(f"Skipping unreadable submissions file: {member}")
+                continue
+            cik = str(submission.get('cik') or member[3:13])
+            name = submission.get('name')
+            if not name:
+                continue
+            tickers = submission.get('tickers') or [None]
+            for ticker in tickers:
+                yield cik, name, ticker, RANK_CURRENT
+            for former in submission.get('formerNames') or []:
+                if former.get('name'):
+                    yield cik, former['name'], None, RANK_FORMER
+
+def download_file(url: str, path: str, user_agent: Optional[str] = None):
+    """Download an SEC bulk file through the rate-limited SEC client"""
+    from sec_client import SECClient, get_sec_client
+
+    logger.info(f"Downloading {url} -> {path}")
+    client = SECClient(user_agent=user_agent) if user_agent else get_sec_client()
+    client.download(url, path)
+
+_shared_index: Optional[EdgarCompanyIndex] = None
+_shared_index_path: Optional[str] = None
+_shared_index_lock = threading.Lock()
+
+def get_edgar_index(path: Optional[str] = None) -> Optional[EdgarCompanyIndex]:
+    """
+    Get the process-wide index from path (default: EDGAR_INDEX_PATH), or None
+    when no index file is configured or present
+    """
+    global _shared_index, _shared_index_path
+
+    path = path or os.getenv('EDGAR_INDEX_PATH')
+    if not path or not os.path.exists(path):
+        return None
+
+    with _shared_index_lock:
+        if _shared_index is None or _shared_index_path != path:
+            try:
+                index = EdgarCompanyIndex(path)
+            except (OSError, ValueError) as e:
+                logger.error(f"Could not load EDGAR index {path}: {e}")
+                return None
+            if _shared_index is not None:
+                _shared_index.close()
+            _shared_index, _shared_index_path = index, path
+            logger.info(f"EDGAR index loaded: {path} ({index.metadata})")
+        return _shared_index
+
+def main():
+    parser = argparse.ArgumentParser(description='Build or query the local EDGAR company index')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    build = subparsers.add_parser('build', help='Build the index from SEC bulk files')
+    build.add_argument('--tickers', help='Path to company_tickers.json')
+    build.add_argument('--submissions', help='Optional path to submissions.zip (all filers and former names)')
+    build.add_argument('--download', action='store_true', help='Download company_tickers.json from SEC')
+    build.add_argument('--download-submissions', action='store_true',
+                       help='Also download submissions.zip from SEC (several GB)')
+    build.add_argument('--user-agent', help='User-Agent for SEC downloads (default: SEC_USER_AGENT)')
+    build.add_argument('--output', '-o', default=os.getenv('EDGAR_INDEX_PATH', 'edgar_index.dat'))
+
+    lookup = subparsers.add_parser('lookup', help='Resolve a company name or ticker')
+    lookup.add_argument('name')
+    lookup.add_argument('--index', default=os.getenv('EDGAR_INDEX_PATH', 'edgar_index.dat'))
+
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
+
+    if args.command == 'build':
+        tickers_path = args.tickers
+        if args.download and not tickers_path:
+            tickers_path = 'company_tickers.json'
+            download_file(COMPANY_TICKERS_URL, tickers_path, args.user_agent)
+        if args.download_submissions and not args.submissions:
+            args.submissions = 'submissions.zip'
+            download_file(SUBMISSIONS_ZIP_URL, args.submissions, args.user_agent)
+        if not tickers_path and not args.submissions:
+            parser.error('build needs --tickers, --download or --submissions')
+
+        def entries():
+            if tickers_path:
+                yield from iter_company_tickers(tickers_path)
+            if args.submissions:
+                yield from iter_submissions(args.submissions)
+
+        sources = [os.path.basename(p) for p in (tickers_path, args.submissions) if p]
+        started = time.monotonic()
+        counts = build_index(entries(), args.output, metadata={'sources': sources})
+        print(f"Built {args.output} in {time.monotonic() - started:.1f}s: {counts}")
+        return
+
+    index = EdgarCompanyIndex(args.index)
+    started = time.perf_counter()
+    match = index.resolve(args.name)
+    elapsed_us = (time.perf_counter() - started) * 1e6
+    print(json.dumps({'query': args.name, 'match': match.__dict__ if match else None,
+                      'lookup_us': round(elapsed_us, 1)}, indent=2))
+
+if __name__ == "__main__":
+    main()
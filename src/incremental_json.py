@@ -0,0 +1,149 @@
+#!/usr/bin/env python3
+"""
+Incremental JSON Field Parser
+
+This module parses the JSON object an LLM streams back, member by member:
+- Text is fed in chunks as it arrives; anything before the first `{` (prose,
+  a ```json fence) is skipped
+- Each top-level member is emitted as soon as its value is complete: strings
+  at their closing quote, objects and arrays at their closing bracket, numbers
+  and literals at the following `,` or `}`
+- Every character is scanned once, so feeding a response costs the same as
+  parsing it in one go
+- A truncated response (e.g. cut off at max_new_tokens) still yields every
+  member completed before the cut; a malformed key ends parsing there
+"""
+
+import json
+import logging
+from typing import Any, Dict, List, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Scanner states
+_SEEK_OBJECT = 0     # before the opening brace
+_KEY_OR_END = 1      # expecting a key, a comma or the closing brace
+_KEY = 2             # inside a key string
+_COLON = 3
+_VALUE_START = 4
+_VALUE_STRING = 5
+_VALUE_NESTED = 6    # inside an object or array value
+_VALUE_SCALAR = 7    # number, true, false or null
+_DONE = 8
+
+class IncrementalJSONParser:
+    """Emits (key, value) pairs of a streamed top-level JSON object as they complete"""
+
+    def __init__(self):
+        self.fields: Dict[str, Any] = {}
+        self._text = ""
+        self._pos = 0
+        self._state = _SEEK_OBJECT
+        self._start = 0          # start of the current key or value in _text
+        self._key = None
+        self._depth = 0
+        self._in_string = False  # inside a string within a nested value
+        self._escaped = False
+
+    @property
+    def done(self) -> bool:
+        """Whether the closing brace of the object has been seen"""
+        return self._state == _DONE
+
+    @property
+    def text(self) -> str:
+        """Everything fed so far"""
+        return self._text
+
+    def feed(self, chunk: str) -> List[Tuple[str, Any]]:
+        """Add streamed text; returns the members completed by it, in order"""
+        if self._state == _DONE:
+            return []
+        self._text += chunk
+        completed = []
+        text = self._text
+        pos = self._pos
+        while pos < len(text) and self._state != _DONE:
+            char = text[pos]
+            state = self._state
+
+            if state == _SEEK_OBJECT:
+                if char == '{':
+                    self._state = _KEY_OR_END
+            elif state == _KEY_OR_END:
+                if char == '"':
+                    self._start = pos
+                    self._state = _KEY
+                elif char == '}':
+                    self._state = _DONE
+            elif state in (_KEY, _VALUE_STRING):
+                if self._escaped:
+                    self._escaped = False
+                elif char == '\\':
+                    self._escaped = True
+                elif char == '"':
+                    literal = text[self._start:pos + 1]
+                    if state == _KEY:
+                        try:
+                            self._key = json.loads(literal)
+                        except json.JSONDecodeError:
+                            # Members after a malformed key cannot be trusted; keep what was parsed
+                            logger.debug(f"Stopping at unparseable key: {literal[:80]}")
+                            self._state = _DONE
+                            break
+                        self._state = _COLON
+                    else:
+                        self._emit(literal, completed)
+            elif state == _COLON:
+                if char == ':':
+                    self._state = _VALUE_START
+            elif state == _VALUE_START:
+                if not char.isspace():
+                    self._start = pos
+                    if char == '"':
+                        self._state = _VALUE_STRING
+                    elif char in '{[':
+                        self._depth = 1
+                        self._state = _VALUE_NESTED
+                    else:
+                        self._state = _VALUE_SCALAR
+            elif state == _VALUE_NESTED:
+                if self._in_string:
+                    if self._escaped:
+                        self._escaped = False
+                    elif char == '\\':
+                        self._escaped = True
+                    elif char == '"':
+                        self._in_string = False
+                elif char == '"':
+                    self._in_string = True
+                elif char in '{[':
+                    self._depth += 1
+                elif char in '}]':
+                    self._depth -= 1
+                    if self._depth == 0:
+                        self._emit(text[self._start:pos + 1], completed)
+            elif state == _VALUE_SCALAR:
+                if char in ',}' or char.isspace():
+                    self._emit(text[self._start:pos], completed)
+                    if char == '}':
+                        self._state = _DONE
+            pos += 1
+        self._pos = pos
+        return completed
+
+    def _emit(self, literal: str, completed: List[Tuple[str, Any]]):
+        self._state = _KEY_OR_END
+        try:
+            value = json.loads(literal)
+        except json.JSONDecodeError:
+            logger.debug(f"Skipping unparseable value for {self._key!r}: {literal[:80]}")
+            return
+        self.fields[self._key] = value
+        completed.append((self._key, value))
+
+def parse_complete_fields(text: str) -> Dict[str, Any]:
+    """Top-level members of a possibly truncated JSON object that are complete in text"""
+    parser = IncrementalJSONParser()
+    parser.feed(text)
+    return parser.fields
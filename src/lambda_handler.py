@@ -9,51 +9,240 @@ Environment Variables Required:
 - SERPER_API_KEY: API key for SERPER search service
 - AWS_REGION: AWS region (default: us-east-1)
 
+Every invocation runs against a deadline: the remaining invocation time minus
+LAMBDA_SAFETY_MARGIN_SECONDS (default 10). Near the deadline the search skips
+low-priority queries and shortens the LLM prompt, and returns what it found with
+"partial": true rather than being killed by the Lambda timeout.
+
+The searcher (boto3 session, Bedrock client, pooled HTTP sessions) and the event
+loop are created on the first invocation and reused by warm invocations of the
+same execution environment. They are rebuilt when AWS credentials expire or the
+SERPER key changes.
+
 Usage:
     Event format:
     {
         "company_name": "Apple Inc",
         "output_format": "json"  # optional, defaults to json
     }
+
+    Several companies per invocation, screened concurrently:
+    {
+        "company_names": ["Apple Inc", "Intel Corp"]
+    }
+
+    SQS batch events (message body: {"company_name": ...}, a JSON string or plain
+    text) are screened concurrently within the remaining invocation time. Enable
+    ReportBatchItemFailures on the event source mapping so only companies that
+    failed or did not finish are retried.
 """
 
 import json
 import os
 import asyncio
+import time
 import logging
-from typing import Dict, Any
-from optimized_company_search import OptimizedCompanySearcher
+from dataclasses import asdict
+from typing import Dict, Any, List, Optional
+from optimized_company_search import OptimizedCompanySearcher, load_environment, configure_logging
+from batch_screening import BatchScreener, NAME_COLUMNS
 
 # Configure logging for Lambda
 logger = logging.getLogger()
 logger.setLevel(logging.INFO)
 
+# Reused across warm invocations of this execution environment
+_searcher: Optional[OptimizedCompanySearcher] = None
+_event_loop: Optional[asyncio.AbstractEventLoop] = None
+
+def _get_event_loop() -> asyncio.AbstractEventLoop:
+    """Persistent event loop, so pooled async connections survive between invocations"""
+    global _event_loop
+    if _event_loop is None or _event_loop.is_closed():
+        _event_loop = asyncio.new_event_loop()
+        asyncio.set_event_loop(_event_loop)
+    return _event_loop
+
+def _get_searcher(loop: asyncio.AbstractEventLoop) -> OptimizedCompanySearcher:
+    """Warm searcher, rebuilt if its credentials or configuration went stale"""
+    global _searcher
+    if _searcher is not None and not _searcher.is_healthy():
+        logger.info("Searcher health check failed - rebuilding clients")
+        try:
+            loop.run_until_complete(_searcher.close())
+        except Exception as e:
+            logger.warning(f"Error closing stale searcher: {e}")
+        _searcher = None
+    
+    if _searcher is None:
+        _searcher = OptimizedCompanySearcher()
+        logger.info("Searcher initialized (cold start)")
+    return _searcher
+
+def _safety_margin() -> float:
+    return float(os.getenv('LAMBDA_SAFETY_MARGIN_SECONDS', '10'))
+
+def _time_budget(context: Any) -> float:
+    """Seconds available for screening: remaining invocation time minus a safety margin"""
+    return max(1.0, context.get_remaining_time_in_millis() / 1000.0 - _safety_margin())
+
+def _company_name_from_record(record: Dict[str, Any]) -> Optional[str]:
+    """
+    Company name from an SQS message body: JSON object, JSON string or plain text
+    (None unless the name is a non-blank string)
+    """
+    body = (record.get('body') or '').strip()
+    try:
+        payload = json.loads(body)
+    except ValueError:
+        return body or None
+    
+    if isinstance(payload, dict):
+        payload = next((payload[column] for column in NAME_COLUMNS if payload.get(column)), None)
+    if isinstance(payload, str):
+        return payload.strip() or None
+    return None
+
+async def _screen_companies(searcher: OptimizedCompanySearcher, company_names: List[str],
+                            time_budget: float) -> Dict[str, Any]:
+    """
+    Screen companies concurrently, stopping when the time budget runs out
+    
+    Each company degrades to a partial result as the deadline approaches; companies
+    that still have not returned shortly after it (half the safety margin) are cut.
+    Returns company name -> CompanyInfo for every company that finished (including
+    failed and partial ones); companies cut at the hard limit are left out.
+    """
+    hard_limit = time_budget + _safety_margin() / 2
+    screener = BatchScreener(
+        searcher,
+        max_concurrent_companies=int(os.getenv('BATCH_MAX_CONCURRENT_COMPANIES', '4')),
+        company_timeout=min(float(os.getenv('BATCH_COMPANY_TIMEOUT', '300')), hard_limit),
+        deadline=time.monotonic() + time_budget,
+        deadline_margin=_safety_margin() / 2
+    )
+    results = {}
+    
+    async def collect():
+        async for company_name, company_info in screener.screen(company_names):
+            results[company_name] = company_info
+    
+    try:
+        await asyncio.wait_for(collect(), timeout=hard_limit)
+    except asyncio.TimeoutError:
+        logger.warning(f"Time budget of {time_budget:.0f}s exhausted: "
+                       f"{len(results)}/{len(company_names)} companies finished")
+    return results
+
+def _is_failed(company_info: Any) -> bool:
+    return company_info is None or any(str(source).startswith('Error:') for source in company_info.sources)
+
+def _handle_sqs_batch(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
+    """Screen every company in an SQS batch; report unfinished, partial or failed messages for retry"""
+    records = event.get('Records', [])
+    message_names = {}
+    failures = []
+    for record in records:
+        company_name = _company_name_from_record(record)
+        if company_name:
+            message_names[record['messageId']] = company_name
+        else:
+            # Retrying cannot fix a message without a (string) company name, so it is dropped
+            logger.error(f"SQS message {record.get('messageId')} has no valid company name: {record.get('body')!r}")
+    
+    company_names = list(dict.fromkeys(message_names.values()))
+    logger.info(f"Screening SQS batch of {len(company_names)} companies from {len(records)} messages")
+    
+    try:
+        loop = _get_event_loop()
+        searcher = _get_searcher(loop)
+        results = loop.run_until_complete(_screen_companies(searcher, company_names, _time_budget(context)))
+    except Exception as e:
+        logger.error(f"Error processing SQS batch: {str(e)}")
+        results = {}
+    
+    for message_id, company_name in message_names.items():
+        company_info = results.get(company_name)
+        if _is_failed(company_info):
+            failures.append({'itemIdentifier': message_id})
+        elif company_info.partial:
+            # Partial results are not checkpointed as completed; the retry finishes the work
+            logger.info(json.dumps({'partial_company_result': asdict(company_info)}, default=str))
+            failures.append({'itemIdentifier': message_id})
+        else:
+            logger.info(json.dumps({'company_result': asdict(company_info)}, default=str))
+    
+    logger.info(f"SQS batch complete: {len(message_names) - len(failures)} succeeded, {len(failures)} to retry")
+    return {'batchItemFailures': failures}
+
+def _handle_company_names(company_names: List[str], context: Any) -> Dict[str, Any]:
+    """Screen a list of companies in one invocation"""
+    company_names = list(dict.fromkeys(name.strip() for name in company_names if name and name.strip()))
+    logger.info(f"Starting company research for {len(company_names)} companies")
+    
+    loop = _get_event_loop()
+    searcher = _get_searcher(loop)
+    started = time.monotonic()
+    results = loop.run_until_complete(_screen_companies(searcher, company_names, _time_budget(context)))
+    
+    failed = [name for name in company_names if _is_failed(results.get(name))]
+    body = {
+        'results': [asdict(results[name]) for name in company_names if name in results],
+        'failed': failed,
+        'unfinished': [name for name in company_names if name not in results],
+        'elapsed_seconds': round(time.monotonic() - started, 1),
+        'lambda_execution': {
+            'request_id': context.aws_request_id,
+            'function_name': context.function_name,
+            'function_version': context.function_version,
+            'memory_limit': context.memory_limit_in_mb,
+            'remaining_time': context.get_remaining_time_in_millis()
+        }
+    }
+    
+    return {
+        'statusCode': 200,
+        'headers': {
+            'Content-Type': 'application/json',
+            'Access-Control-Allow-Origin': '*',
+            'Access-Control-Allow-Headers': 'Content-Type',
+            'Access-Control-Allow-Methods': 'POST, GET, OPTIONS'
+        },
+        'body': json.dumps(body, indent=2, default=str)
+    }
+
 def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
     """
     AWS Lambda handler for company screening
     
     Args:
-        event: Lambda event containing company_name
+        event: Lambda event containing company_name, company_names, or SQS Records
         context: Lambda context object
         
     Returns:
         Dict containing company information or error message
+        (for SQS events: the batchItemFailures to retry)
     """
     
+    if 'Records' in event:
+        if not os.environ.get('SERPER_API_KEY'):
+            logger.error("SERPER_API_KEY environment variable not configured")
+            return {'batchItemFailures': [{'itemIdentifier': record['messageId']} for record in event['Records']]}
+        return _handle_sqs_batch(event, context)
+    
     try:
         # Extract company name from event
         company_name = event.get('company_name')
-        if not company_name:
+        company_names = event.get('company_names')
+        if not company_name and not company_names:
             return {
                 'statusCode': 400,
                 'body': json.dumps({
                     'error': 'Missing required parameter: company_name',
-                    'usage': 'Provide company_name in the event payload'
+                    'usage': 'Provide company_name (or a company_names list) in the event payload'
                 })
             }
         
-        logger.info(f"Starting company research for: {company_name}")
-        
         # Validate environment variables
         serper_key = os.environ.get('SERPER_API_KEY')
         if not serper_key:
@@ -64,19 +253,38 @@ def lambda_handler(event: Dict[str, Any], context: Any) -> Dict[str, Any]:
                 })
             }
         
-        # Initialize company searcher
-        searcher = OptimizedCompanySearcher()
+        if company_names:
+            if not isinstance(company_names, list):
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': 'company_names must be a list of company names'})
+                }
+            invalid = [f"{index} ({type(name).__name__})" for index, name in enumerate(company_names)
+                       if not isinstance(name, str)]
+            if invalid:
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': f"company_names entries must be strings; invalid entries: "
+                                                 f"{', '.join(invalid[:10])}"})
+                }
+            if not any(name.strip() for name in company_names):
+                return {
+                    'statusCode': 400,
+                    'body': json.dumps({'error': 'company_names contains no company names'})
+                }
+            return _handle_company_names(company_names, context)
+        
+        logger.info(f"Starting company research for: {company_name}")
         
-        # Run the async search function
-        loop = asyncio.new_event_loop()
-        asyncio.set_event_loop(loop)
+        # Reuse the warm searcher and event loop (created on first use)
+        loop = _get_event_loop()
+        searcher = _get_searcher(loop)
         
-        try:
-            company_info = loop.run_until_complete(
-                searcher.search_company(company_name)
-            )
-        finally:
-            loop.close()
+        # Run the async search function, returning a partial result rather than timing out
+        deadline = time.monotonic() + _time_budget(context)
+        company_info = loop.run_until_complete(
+            searcher.search_company(company_name, deadline=deadline)
+        )
         
         # Convert to dictionary for JSON serialization
         if hasattr(company_info, '__dict__'):
@@ -138,6 +346,10 @@ def test_handler():
         "company_name": "Apple Inc"
     }
     
+    # Local run: load .env and log to the console like the CLI
+    load_environment()
+    configure_logging()
+    
     # Set environment variables for testing
     os.environ['SERPER_API_KEY'] = os.environ.get('SERPER_API_KEY', 'test-key')
     os.environ['AWS_REGION'] = 'us-east-1'
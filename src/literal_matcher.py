@@ -0,0 +1,68 @@
+#!/usr/bin/env python3
+"""
+Multi-Literal Prefilter
+
+This module finds which of a fixed set of literal keywords occur in a text in
+one pass, Aho-Corasick style:
+- Each literal carries a bitmask of the extractors it can trigger
+- One scan per text returns the OR of the masks of every literal present
+- Literals that start before a split offset can be excluded, so one scan over
+  "url title snippet" also answers "which literals are in title snippet"
+
+The scan is a single compiled alternation (longest literal first), so the
+automaton walk happens inside the regex engine; Python only runs once per hit,
+resuming one character after each hit so overlapping literals are not missed.
+"""
+
+import re
+from typing import Dict, Tuple
+
+class LiteralMatcher:
+    """Case-insensitive scanner mapping literal keywords to bitmasks"""
+
+    def __init__(self, literals: Dict[str, int]):
+        masks: Dict[str, int] = {}
+        for literal, mask in literals.items():
+            literal = literal.lower()
+            if literal:
+                masks[literal] = masks.get(literal, 0) | mask
+
+        # At each position only the longest alternative is reported, so a literal
+        # also carries the masks of every literal it contains
+        for literal in masks:
+            for other, mask in masks.items():
+                if other != literal and other in literal:
+                    masks[literal] |= mask
+
+        self._masks = masks
+        ordered = sorted(masks, key=len, reverse=True)
+        self._scanner = re.compile(
+            '|'.join(re.escape(literal) for literal in ordered)
+        ) if ordered else None
+
+    def scan(self, text_lower: str) -> int:
+        """OR of the masks of all literals present in text_lower (already lowercased)"""
+        return self.scan_split(text_lower, len(text_lower))[0]
+
+    def scan_split(self, text_lower: str, split: int) -> Tuple[int, int]:
+        """
+        Masks of the literals present in the whole text and in text_lower[split:]
+
+        Returns (whole_mask, tail_mask); a literal starting at or after split
+        counts towards both.
+        """
+        whole_mask = 0
+        tail_mask = 0
+        if self._scanner is None:
+            return whole_mask, tail_mask
+
+        masks = self._masks
+        search = self._scanner.search
+        match = search(text_lower)
+        while match:
+            mask = masks[match.group()]
+            whole_mask |= mask
+            if match.start() >= split:
+                tail_mask |= mask
+            match = search(text_lower, match.start() + 1)
+        return whole_mask, tail_mask
@@ -23,21 +23,35 @@ Key Success Patterns Integrated:
 
 Usage:
     python optimized_company_search.py --company "Company Name"
+    python optimized_company_search.py --import-profile   # per-module cold-start import cost
+
+Heavy dependencies (boto3/botocore, requests, aiohttp, python-dotenv) are imported
+on first use, and .env loading and logging setup happen when a searcher is created
+or the CLI runs, so importing this module (Lambda INIT) stays cheap.
 """
 
 import os
 import json
+import time
+import random
 import asyncio
 import argparse
-from typing import Dict, List, Optional, Any
-from dataclasses import dataclass, asdict
+import threading
+from typing import Dict, List, Optional, Any, AsyncIterator, Callable, Tuple
+from dataclasses import dataclass, asdict, replace
 from datetime import datetime
+from email.utils import parsedate_to_datetime
+from concurrent.futures import ThreadPoolExecutor
 import logging
 
-import requests
-import boto3
-from dotenv import load_dotenv
-from botocore.exceptions import ClientError, NoCredentialsError
+from rate_limiter import TokenBucketRateLimiter, get_shared_rate_limiter
+from response_cache import SQLiteCache, MemoryLRUCache, SearchResponseCache, LLMResultCache
+from query_plan import QueryBudget, QueryPlan, PlannedQuery, build_query_plan
+from checkpoint_store import CheckpointStore
+from context_selector import ContextSelector
+from result_dedup import ResultDeduplicator
+from result_store import SearchResultStore
+from incremental_json import IncrementalJSONParser, parse_complete_fields
 
 # Import SEC data extractors
 try:
@@ -50,30 +64,52 @@ try:
 except ImportError:
     SearchBasedSECExtractor = None
 
-# Load environment variables
-load_dotenv()
-
-# Configure logging (Lambda-compatible)
-import os
-if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
-    # Lambda environment - only use StreamHandler
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[logging.StreamHandler()]
-    )
-else:
-    # Local environment - use both file and stream handlers
-    logging.basicConfig(
-        level=logging.INFO,
-        format='%(asctime)s - %(levelname)s - %(message)s',
-        handlers=[
-            logging.FileHandler('optimized_company_search.log'),
-            logging.StreamHandler()
-        ]
-    )
 logger = logging.getLogger(__name__)
 
+_environment_loaded = False
+_aiohttp = None
+_aiohttp_checked = False
+
+def load_environment():
+    """Load variables from .env into the environment (once per process)"""
+    global _environment_loaded
+    if not _environment_loaded:
+        from dotenv import load_dotenv
+        load_dotenv()
+        _environment_loaded = True
+
+def configure_logging():
+    """Configure root logging for command-line runs (Lambda-compatible)"""
+    if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
+        # Lambda environment - only use StreamHandler
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[logging.StreamHandler()]
+        )
+    else:
+        # Local environment - use both file and stream handlers
+        logging.basicConfig(
+            level=logging.INFO,
+            format='%(asctime)s - %(levelname)s - %(message)s',
+            handlers=[
+                logging.FileHandler('optimized_company_search.log'),
+                logging.StreamHandler()
+            ]
+        )
+
+def _get_aiohttp():
+    """Optional native asyncio HTTP client for SERPER searches (None when not installed)"""
+    global _aiohttp, _aiohttp_checked
+    if not _aiohttp_checked:
+        try:
+            import aiohttp
+            _aiohttp = aiohttp
+        except ImportError:
+            _aiohttp = None
+        _aiohttp_checked = True
+    return _aiohttp
+
 @dataclass
 class CompanyInfo:
     """Optimized data structure for complete company information"""
@@ -106,6 +142,7 @@ class CompanyInfo:
     sources: List[str] = None
     confidence_level: str = ""
     last_updated: str = ""
+    partial: bool = False   # True when the deadline cut searches, LLM analysis or SEC lookup short
     
     def __post_init__(self):
         if self.key_executives is None:
@@ -140,53 +177,349 @@ class CompanyInfo:
             self.revenue = self.annual_revenue
 
 class SerperAPI:
-    """Optimized SERPER API interface"""
+    """Optimized SERPER API interface with pooled keep-alive connections"""
     
-    def __init__(self, api_key: str):
+    def __init__(self, api_key: str, max_connections: int = 20, keepalive_timeout: float = 30.0,
+                 rate_limiter: Optional[TokenBucketRateLimiter] = None, max_retries: int = 3,
+                 cache: Optional[SearchResponseCache] = None):
         self.api_key = api_key
         self.base_url = "https://google.serper.dev/search"
         self.headers = {
             "X-API-KEY": api_key,
             "Content-Type": "application/json"
         }
+        self.max_connections = max_connections
+        self.keepalive_timeout = keepalive_timeout
+        self.timeout = 30
+        
+        # Shared throttle for every SERPER caller; retries back off on HTTP 429
+        self.rate_limiter = rate_limiter
+        self.max_retries = max_retries
+        self.max_backoff = 60.0
+        
+        # Optional persistent response cache in front of the API
+        self.cache = cache
+        
+        # Long-lived connection pools, created on first use and reused across queries/companies
+        self._session = None
+        self._async_session = None
+        self._async_session_loop = None
     
-    def search(self, query: str, num_results: int = 10) -> Dict[str, Any]:
-        """Perform optimized web search"""
-        try:
-            payload = {
-                "q": query,
-                "num": num_results,
-                "gl": "us",
-                "hl": "en"
-            }
-            
-            logger.info(f"Searching: {query}")
-            response = requests.post(
-                self.base_url,
+    def _build_payload(self, query: str, num_results: int) -> Dict[str, Any]:
+        """Build SERPER request payload"""
+        return {
+            "q": query,
+            "num": num_results,
+            "gl": "us",
+            "hl": "en"
+        }
+    
+    def _get_session(self) -> "requests.Session":
+        """Get pooled requests session for synchronous searches"""
+        if self._session is None:
+            import requests
+            session = requests.Session()
+            adapter = requests.adapters.HTTPAdapter(
+                pool_connections=1,
+                pool_maxsize=self.max_connections
+            )
+            session.mount('https://', adapter)
+            session.headers.update(self.headers)
+            self._session = session
+        return self._session
+    
+    async def _get_async_session(self):
+        """Get pooled aiohttp session bound to the running event loop"""
+        aiohttp = _get_aiohttp()
+        loop = asyncio.get_running_loop()
+        if (self._async_session is None or self._async_session.closed
+                or self._async_session_loop is not loop):
+            connector = aiohttp.TCPConnector(
+                limit=self.max_connections,
+                limit_per_host=self.max_connections,
+                keepalive_timeout=self.keepalive_timeout,
+                ttl_dns_cache=300
+            )
+            self._async_session = aiohttp.ClientSession(
+                connector=connector,
                 headers=self.headers,
-                json=payload,
-                timeout=30
+                timeout=aiohttp.ClientTimeout(total=self.timeout)
             )
-            response.raise_for_status()
+            self._async_session_loop = loop
+        return self._async_session
+    
+    def _retry_delay(self, retry_after: Optional[str], attempt: int) -> float:
+        """Seconds to wait after a 429: Retry-After if given, else exponential backoff with jitter"""
+        backoff = min(self.max_backoff, (2 ** attempt) * (1 + random.random()))
+        if not retry_after:
+            return backoff
+        
+        try:
+            return min(self.max_backoff, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+        
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return min(self.max_backoff, max(0.0, retry_at.timestamp() - time.time()))
+        except (TypeError, ValueError):
+            return backoff
+    
+    def _get_cached(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        """Return cached response for payload, if any"""
+        if not self.cache:
+            return None
+        cached = self.cache.get(payload)
+        if cached is not None:
+            logger.info(f"Cache hit: {payload['q']}")
+        return cached
+    
+    def _store_cached(self, payload: Dict[str, Any], response: Dict[str, Any], category: Optional[str]):
+        if self.cache:
+            self.cache.set(payload, response, category)
+    
+    def search(self, query: str, num_results: int = 10, category: Optional[str] = None) -> Dict[str, Any]:
+        """Perform optimized web search (category selects the cache TTL)"""
+        import requests
+        
+        try:
+            payload = self._build_payload(query, num_results)
+            cached = self._get_cached(payload)
+            if cached is not None:
+                return cached
             
-            return response.json()
+            for attempt in range(self.max_retries + 1):
+                if self.rate_limiter:
+                    self.rate_limiter.acquire()
+                
+                logger.info(f"Searching: {query}")
+                response = self._get_session().post(
+                    self.base_url,
+                    json=payload,
+                    timeout=self.timeout
+                )
+                
+                if response.status_code == 429 and attempt < self.max_retries:
+                    delay = self._retry_delay(response.headers.get('Retry-After'), attempt)
+                    logger.warning(f"SERPER rate limited (429), retrying in {delay:.1f}s: {query}")
+                    if self.rate_limiter:
+                        self.rate_limiter.penalize(delay)
+                    else:
+                        time.sleep(delay)
+                    continue
+                
+                response.raise_for_status()
+                results = response.json()
+                self._store_cached(payload, results, category)
+                return results
             
         except requests.exceptions.RequestException as e:
             logger.error(f"SERPER API error: {e}")
             return {"organic": [], "error": str(e)}
+    
+    async def asearch(self, query: str, num_results: int = 10, category: Optional[str] = None) -> Dict[str, Any]:
+        """Perform optimized web search without blocking the event loop"""
+        aiohttp = _get_aiohttp()
+        if aiohttp is None:
+            # aiohttp not installed - run the pooled sync client in a worker thread
+            return await asyncio.to_thread(self.search, query, num_results, category)
+        
+        try:
+            payload = self._build_payload(query, num_results)
+            cached = self._get_cached(payload)
+            if cached is not None:
+                return cached
+            
+            session = await self._get_async_session()
+            
+            for attempt in range(self.max_retries + 1):
+                if self.rate_limiter:
+                    await self.rate_limiter.acquire_async()
+                
+                logger.info(f"Searching: {query}")
+                try:
+                    async with session.post(self.base_url, json=payload) as response:
+                        if response.status == 429 and attempt < self.max_retries:
+                            delay = self._retry_delay(response.headers.get('Retry-After'), attempt)
+                            logger.warning(f"SERPER rate limited (429), retrying in {delay:.1f}s: {query}")
+                        else:
+                            response.raise_for_status()
+                            results = await response.json()
+                            self._store_cached(payload, results, category)
+                            return results
+                except (aiohttp.ServerDisconnectedError, aiohttp.ClientOSError) as e:
+                    # Pooled keep-alive connections can go stale, e.g. in a frozen Lambda container
+                    if attempt >= self.max_retries:
+                        raise
+                    logger.warning(f"SERPER connection dropped, retrying: {e}")
+                    continue
+                
+                if self.rate_limiter:
+                    self.rate_limiter.penalize(delay)
+                else:
+                    await asyncio.sleep(delay)
+                
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            logger.error(f"SERPER API error: {e}")
+            return {"organic": [], "error": str(e)}
+    
+    async def aclose(self):
+        """Close pooled connections"""
+        if self._async_session is not None and not self._async_session.closed:
+            await self._async_session.close()
+        self._async_session = None
+        self._async_session_loop = None
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+@dataclass(frozen=True)
+class ExtractionGroup:
+    """Fields extracted together by one prompt in grouped extraction mode"""
+    name: str
+    fields: tuple             # response fields; the group is skipped when all are already known
+    focus: tuple              # context_selector.FIELD_KEYWORDS groups whose results go into the prompt
+    max_new_tokens: int
+    extra_fields: tuple = ("sources",)   # always requested
+
+EXTRACTION_GROUPS = (
+    ExtractionGroup("identity",
+                    ("legal_name", "registration_number", "incorporation_date", "incorporation_country",
+                     "jurisdiction", "business_type", "alternate_names", "identifiers", "regulatory_filings",
+                     "headquarters", "website"),
+                    ("registration", "incorporation", "identifiers", "headquarters", "filings"),
+                    max_new_tokens=1200, extra_fields=("sources", "confidence_level")),
+    ExtractionGroup("executives", ("key_executives",), ("executives",), max_new_tokens=500),
+    ExtractionGroup("financials", ("stock_symbol", "market_cap", "annual_revenue", "employees", "founded_year"),
+                    ("financials", "structure"), max_new_tokens=400),
+    ExtractionGroup("structure", ("industry", "description", "products_services", "subsidiaries", "parent_company"),
+                    ("structure", "incorporation", "headquarters"), max_new_tokens=800),
+)
+
+def _has_value(value) -> bool:
+    """Whether an extracted field holds data ("Not available" and empty values do not count)"""
+    if isinstance(value, str):
+        return bool(value.strip()) and value != "Not available"
+    if isinstance(value, (list, tuple)):
+        return any(_has_value(item) for item in value)
+    if isinstance(value, dict):
+        return any(_has_value(item) for item in value.values())
+    return value is not None
 
 class AWSNovaLLM:
     """Optimized AWS Nova Pro LLM interface"""
     
-    def __init__(self, profile_name: str = "diligent", region: str = "us-east-1"):
+    # Context budget of the reduced (deadline) prompt, in estimated tokens
+    REDUCED_CONTEXT_TOKENS = 500
+    
+    # Fields the model is asked to return, with the example value shown for each
+    RESPONSE_FIELDS = {
+        "legal_name": '"Official legal company name"',
+        "registration_number": '"Commission File Number or incorporation number"',
+        "incorporation_date": '"YYYY-MM-DD format"',
+        "incorporation_country": '"Country of incorporation"',
+        "jurisdiction": '"State/province and country"',
+        "business_type": '"Corporation/LLC/Partnership"',
+        "industry": '"Primary industry sector"',
+        "headquarters": '"Complete headquarters address"',
+        "website": '"Official website URL"',
+        "description": '"Business description"',
+        "products_services": '"Main products and services"',
+        "alternate_names": '["Alternative names", "Former names"]',
+        "identifiers": """{
+        "LEI": "Legal Entity Identifier",
+        "DUNS": "DUNS number",
+        "EIN": "Employer ID Number",
+        "CIK": "SEC Central Index Key"
+    }""",
+        "key_executives": '["Name - Title", "Name - Title"]',
+        "subsidiaries": '["Subsidiary 1", "Subsidiary 2"]',
+        "parent_company": '"Parent company if applicable"',
+        "stock_symbol": '"Stock ticker"',
+        "market_cap": '"Market capitalization with currency"',
+        "annual_revenue": '"Revenue with year and currency"',
+        "employees": '"Employee count with year"',
+        "founded_year": '"Year founded"',
+        "regulatory_filings": '["SEC filing URLs"]',
+        "sources": '["Source URLs"]',
+        "confidence_level": '"High/Medium/Low"'
+    }
+    IDENTIFIER_KEYS = ("LEI", "DUNS", "EIN", "CIK")
+    
+    # Where to find each field (MANDATORY FIELD COMPLETION in the full prompt)
+    FIELD_INSTRUCTIONS = {
+        "legal_name": "Extract from SEC filing headers or Wikipedia infobox",
+        "registration_number": 'Look for "001-XXXXX" or "File No. XXXXXXX" patterns',
+        "incorporation_date": "Find in SEC filings or Wikipedia (format: YYYY-MM-DD)",
+        "incorporation_country": 'Usually "United States" for US companies',
+        "jurisdiction": 'Look for "Delaware" or other state incorporation',
+        "business_type": '"Corporation", "LLC", "Partnership"',
+        "industry": "Primary business sector",
+        "headquarters": "Complete address from corporate websites",
+        "website": "Official corporate website URL",
+        "description": "Business description from official sources",
+        "products_services": "Main offerings from business descriptions",
+        "alternate_names": "Former names, abbreviations, trade names",
+        "identifiers": "Extract LEI, DUNS, EIN, CIK when mentioned",
+        "key_executives": "CEO, CFO, CTO, COO from SEC filings/Wikipedia/LinkedIn (prioritize current data)",
+        "subsidiaries": "Major subsidiary companies",
+        "stock_symbol": "NYSE/NASDAQ ticker",
+        "market_cap": "Current market capitalization",
+        "annual_revenue": "Latest annual revenue with year",
+        "employees": "Current employee count",
+        "founded_year": "Year company was founded",
+        "regulatory_filings": "SEC filing URLs when found"
+    }
+    
+    # JSON object the model is asked to return (shared by the full and reduced prompts)
+    RESPONSE_SCHEMA = "{\n" + ",\n".join(f'    "{name}": {example}' for name, example in RESPONSE_FIELDS.items()) + "\n}"
+    
+    # Grouped extraction mode: share of the context token budget each group prompt gets
+    GROUP_CONTEXT_SHARE = 0.5
+    # Executives already found (by regex) needed to skip the executives group; the search
+    # planner's threshold (SearchBasedSECExtractor.MIN_EXECUTIVES)
+    MIN_KNOWN_EXECUTIVES = 2
+    
+    def __init__(self, profile_name: str = "diligent", region: str = "us-east-1",
+                 result_cache: Optional[LLMResultCache] = None, max_concurrency: int = 4,
+                 context_selector: Optional[ContextSelector] = None, max_new_tokens: int = 4000,
+                 extraction_mode: str = "single", streaming: bool = False):
+        if extraction_mode not in ("single", "grouped"):
+            raise ValueError(f"Unknown LLM extraction mode: {extraction_mode}")
         self.profile_name = profile_name
         self.region = region
         self.session = None
         self.bedrock_client = None
+        # Bedrock calls block, so async callers run them on a pool sized to the Bedrock concurrency quota
+        self.max_concurrency = max(1, max_concurrency)
+        self._executor = None
+        self.model_id = "amazon.nova-pro-v1:0"
+        self.inference_config = {
+            "max_new_tokens": max_new_tokens,
+            "temperature": 0.1
+        }
+        # Shorter prompt and answer used when a deadline leaves too little time for a full analysis
+        self.reduced_inference_config = {
+            "max_new_tokens": 1500,
+            "temperature": 0.1
+        }
+        # Picks the search results that go into the prompt, within a token budget
+        self.context_selector = context_selector or ContextSelector()
+        # single: one prompt for every field; grouped: parallel EXTRACTION_GROUPS prompts
+        # for the fields not already known (full analyses only, reduced ones stay single)
+        self.extraction_mode = extraction_mode
+        # Stream the answer and hand each field to on_field callbacks as soon as it is complete
+        self.streaming = streaming
+        # Optional cache of parsed results keyed by model, inference config and prompt digest
+        self.result_cache = result_cache
         self._initialize_aws_session()
     
     def _initialize_aws_session(self):
         """Initialize AWS session"""
+        import boto3
+        from botocore.config import Config
+        from botocore.exceptions import NoCredentialsError
+        
         try:
             # Use profile only in local environment, not in Lambda
             if os.environ.get('AWS_LAMBDA_FUNCTION_NAME'):
@@ -200,7 +533,8 @@ class AWSNovaLLM:
             
             self.bedrock_client = self.session.client(
                 'bedrock-runtime',
-                region_name=self.region
+                region_name=self.region,
+                config=Config(max_pool_connections=self.max_concurrency)
             )
             
         except NoCredentialsError:
@@ -210,29 +544,234 @@ class AWSNovaLLM:
             logger.error(f"AWS initialization error: {e}")
             raise
     
-    def analyze_company_data(self, search_results: List[Dict], company_name: str) -> Dict[str, Any]:
-        """Analyze search results with optimized prompt"""
+    def credentials_valid(self) -> bool:
+        """Whether the AWS session still holds usable credentials (refreshing them if needed)"""
+        if self.session is None or self.bedrock_client is None:
+            return False
+        
         try:
-            prompt = self._create_optimized_prompt(search_results, company_name)
+            credentials = self.session.get_credentials()
+            if credentials is None:
+                return False
+            # Refreshable credentials (assume-role, SSO, container role) refresh here or raise
+            frozen = credentials.get_frozen_credentials()
+        except Exception as e:
+            logger.warning(f"AWS credentials check failed: {e}")
+            return False
+        
+        # Credentials read from the environment go stale once the environment is rotated
+        env_access_key = os.environ.get('AWS_ACCESS_KEY_ID')
+        if credentials.method == 'env' and env_access_key and frozen.access_key != env_access_key:
+            logger.info("AWS environment credentials rotated")
+            return False
+        
+        return True
+    
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            self._executor = ThreadPoolExecutor(
+                max_workers=self.max_concurrency,
+                thread_name_prefix='bedrock'
+            )
+        return self._executor
+    
+    async def analyze_company_data_async(self, search_results: List[Dict], company_name: str,
+                                         reduced: bool = False, known: Optional[Dict[str, Any]] = None,
+                                         on_field: Optional[Callable[[str, Any], None]] = None,
+                                         cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Analyze search results on the Bedrock thread pool without blocking the event loop
+        
+        known holds fields found before the LLM runs (e.g. by regex extraction); in grouped
+        mode they are not asked for again. on_field(field, value) is called from the worker
+        thread for every field of the answer, as it streams in when streaming is enabled;
+        setting cancel stops a streaming answer at the next chunk.
+        """
+        if self.extraction_mode == "grouped" and not reduced:
+            return await self.analyze_field_groups_async(search_results, company_name, known, on_field, cancel)
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._get_executor(), self.analyze_company_data, search_results, company_name, reduced, on_field, cancel
+        )
+    
+    async def stream_company_data_async(self, search_results: List[Dict], company_name: str,
+                                        reduced: bool = False,
+                                        known: Optional[Dict[str, Any]] = None) -> AsyncIterator[Tuple[str, Any]]:
+        """
+        Yield (field, value) pairs as the analysis produces them (all at the end unless
+        streaming is enabled); leaving the loop early stops the generation
+        """
+        loop = asyncio.get_running_loop()
+        queue = asyncio.Queue()
+        cancel = threading.Event()
+        
+        def on_field(field: str, value: Any):
+            loop.call_soon_threadsafe(queue.put_nowait, (field, value))
+        
+        task = asyncio.ensure_future(
+            self.analyze_company_data_async(search_results, company_name, reduced, known, on_field, cancel)
+        )
+        # Runs after every field queued by the worker threads
+        task.add_done_callback(lambda _: queue.put_nowait(None))
+        try:
+            while True:
+                item = await queue.get()
+                if item is None:
+                    break
+                yield item
+            result = task.result()
+            if 'error' in result:
+                raise RuntimeError(f"LLM analysis failed: {result['error']}")
+        finally:
+            cancel.set()
+            task.cancel()
+    
+    async def analyze_field_groups_async(self, search_results: List[Dict], company_name: str,
+                                         known: Optional[Dict[str, Any]] = None,
+                                         on_field: Optional[Callable[[str, Any], None]] = None,
+                                         cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """
+        Extract each field group with its own small prompt, all in parallel, and merge the
+        answers; wall-clock time is that of the slowest group instead of one long generation
+        
+        If only some groups fail, their errors are listed under 'group_errors'.
+        """
+        known = known or {}
+        loop = asyncio.get_running_loop()
+        calls = []
+        for group in EXTRACTION_GROUPS:
+            missing = [field for field in group.fields if not self._is_known(field, known)]
+            if not missing:
+                logger.info(f"Grouped extraction: skipping {group.name} - already known")
+                continue
+            selected = self.context_selector.select(
+                search_results, company_name,
+                token_budget=int(self.context_selector.token_budget * self.GROUP_CONTEXT_SHARE),
+                focus=group.focus
+            )
+            if not selected:
+                logger.info(f"Grouped extraction: skipping {group.name} - no relevant search results")
+                continue
+            calls.append((group, loop.run_in_executor(
+                self._get_executor(), self.analyze_field_group, group, missing, selected, company_name, on_field, cancel
+            )))
+        
+        if not calls:
+            return {}
+        
+        analysis = {}
+        sources = []
+        errors = []
+        for (group, _), result in zip(calls, await asyncio.gather(*(call for _, call in calls))):
+            if 'error' in result:
+                logger.error(f"Grouped extraction: {group.name} failed: {result['error']}")
+                errors.append(f"{group.name}: {result['error']}")
+                continue
+            sources.extend(result.pop('sources', None) or [])
+            analysis.update({field: value for field, value in result.items()
+                             if field in group.fields or field in group.extra_fields})
+        
+        if errors and len(errors) == len(calls):
+            return {"error": "; ".join(errors)}
+        if errors:
+            # The other groups' fields are used, but the screening is incomplete
+            analysis['group_errors'] = errors
+        if sources:
+            analysis['sources'] = sources
+        return analysis
+    
+    def _is_known(self, field: str, known: Dict[str, Any]) -> bool:
+        value = known.get(field)
+        if field == "identifiers":
+            return isinstance(value, dict) and all(_has_value(value.get(key)) for key in self.IDENTIFIER_KEYS)
+        if field == "key_executives":
+            # As in the search planner, one regex match is often stray; the model is still asked
+            return isinstance(value, list) and sum(1 for name in value if _has_value(name)) >= self.MIN_KNOWN_EXECUTIVES
+        return _has_value(value)
+    
+    def close(self):
+        """Shut down the Bedrock thread pool (recreated on next use)"""
+        if self._executor is not None:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+    
+    def analyze_company_data(self, search_results: List[Dict], company_name: str, reduced: bool = False,
+                             on_field: Optional[Callable[[str, Any], None]] = None,
+                             cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Analyze search results with optimized prompt (reduced: fewer results, shorter answer)"""
+        from botocore.exceptions import ClientError
+        
+        try:
+            if reduced:
+                prompt = self._create_reduced_prompt(search_results, company_name)
+                inference_config = self.reduced_inference_config
+            else:
+                prompt = self._create_optimized_prompt(search_results, company_name)
+                inference_config = self.inference_config
             
-            response = self.bedrock_client.invoke_model(
-                modelId="amazon.nova-pro-v1:0",
-                body=json.dumps({
-                    "messages": [
+            return self._invoke_model(prompt, inference_config, company_name, self.RESPONSE_FIELDS,
+                                      on_field, cancel)
+            
+        except ClientError as e:
+            logger.error(f"AWS Bedrock error: {e}")
+            return {"error": str(e)}
+        except Exception as e:
+            logger.error(f"LLM analysis error: {e}")
+            return {"error": str(e)}
+    
+    def analyze_field_group(self, group: ExtractionGroup, fields: List[str], search_results: List[Dict],
+                            company_name: str, on_field: Optional[Callable[[str, Any], None]] = None,
+                            cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Extract one field group from already selected search results"""
+        from botocore.exceptions import ClientError
+        
+        try:
+            fields = fields + list(group.extra_fields)
+            prompt = self._create_group_prompt(search_results, company_name, fields)
+            inference_config = {
+                "max_new_tokens": min(group.max_new_tokens, self.inference_config["max_new_tokens"]),
+                "temperature": self.inference_config["temperature"]
+            }
+            return self._invoke_model(prompt, inference_config, company_name, fields, on_field, cancel)
+            
+        except ClientError as e:
+            logger.error(f"AWS Bedrock error ({group.name} fields): {e}")
+            return {"error": str(e)}
+        except Exception as e:
+            logger.error(f"LLM analysis error ({group.name} fields): {e}")
+            return {"error": str(e)}
+    
+    def _invoke_model(self, prompt: str, inference_config: Dict[str, Any], company_name: str, fields,
+                      on_field: Optional[Callable[[str, Any], None]] = None,
+                      cancel: Optional[threading.Event] = None) -> Dict[str, Any]:
+        """Run one prompt through Bedrock (or the result cache) and parse the JSON answer with the requested fields"""
+        if self.result_cache:
+            cached = self.result_cache.get(self.model_id, inference_config, prompt)
+            if cached is not None:
+                logger.info(f"LLM cache hit for {company_name} - skipping Bedrock call")
+                self._report_fields(cached, on_field)
+                return cached
+        
+        body = json.dumps({
+            "messages": [
+                {
+                    "role": "user",
+                    "content": [
                         {
-                            "role": "user",
-                            "content": [
-                                {
-                                    "text": prompt
-                                }
-                            ]
+                            "text": prompt
                         }
-                    ],
-                    "inferenceConfig": {
-                        "max_new_tokens": 4000,
-                        "temperature": 0.1
-                    }
-                }),
+                    ]
+                }
+            ],
+            "inferenceConfig": inference_config
+        })
+        
+        if self.streaming:
+            result, complete = self._invoke_model_streaming(body, fields, company_name, on_field, cancel)
+        else:
+            response = self.bedrock_client.invoke_model(
+                modelId=self.model_id,
+                body=body,
                 contentType="application/json"
             )
             
@@ -242,26 +781,72 @@ class AWSNovaLLM:
             content = message.get('content', [])
             analysis = content[0].get('text', '') if content else ''
             
-            return self._parse_llm_response(analysis)
-            
-        except ClientError as e:
-            logger.error(f"AWS Bedrock error: {e}")
-            return {"error": str(e)}
-        except Exception as e:
-            logger.error(f"LLM analysis error: {e}")
-            return {"error": str(e)}
+            result, complete = self._parse_llm_response(analysis)
+            if response_body.get('stopReason') == 'max_tokens':
+                complete = False
+            self._report_fields(result, on_field)
+        
+        # Truncated, salvaged or failed answers are not cached, so the next call retries
+        if self.result_cache and complete and 'error' not in result:
+            self.result_cache.set(self.model_id, inference_config, prompt, result)
+        return result
+    
+    def _invoke_model_streaming(self, body: str, fields, company_name: str,
+                                on_field: Optional[Callable[[str, Any], None]],
+                                cancel: Optional[threading.Event]) -> Tuple[Dict[str, Any], bool]:
+        """
+        Stream the answer, parsing fields as they complete; stops reading once every
+        requested field has arrived. Returns the result and whether it is complete.
+        """
+        response = self.bedrock_client.invoke_model_with_response_stream(
+            modelId=self.model_id,
+            body=body,
+            contentType="application/json"
+        )
+        stream = response['body']
+        parser = IncrementalJSONParser()
+        pending = set(fields)
+        cancelled = False
+        try:
+            for event in stream:
+                if cancel is not None and cancel.is_set():
+                    cancelled = True
+                    break
+                chunk = event.get('chunk')
+                if not chunk:
+                    continue
+                delta = json.loads(chunk['bytes']).get('contentBlockDelta', {}).get('delta', {})
+                for field, value in parser.feed(delta.get('text', '')):
+                    pending.discard(field)
+                    if on_field:
+                        on_field(field, value)
+                if parser.done or not pending:
+                    break
+        finally:
+            # Closing the connection ends the generation early when fields arrived before the end
+            stream.close()
+        
+        complete = parser.done or not pending
+        if cancelled:
+            logger.info(f"LLM answer for {company_name} cancelled after {len(parser.fields)} fields")
+        elif not complete:
+            logger.warning(f"LLM answer for {company_name} truncated with {len(parser.fields)} of "
+                           f"{len(pending) + len(parser.fields)} fields")
+        if not parser.fields:
+            result, parsed_complete = self._parse_llm_response(parser.text)
+            return result, complete and parsed_complete
+        return dict(parser.fields), complete
+    
+    @staticmethod
+    def _report_fields(result: Dict[str, Any], on_field: Optional[Callable[[str, Any], None]]):
+        if on_field and 'error' not in result:
+            for field, value in result.items():
+                on_field(field, value)
     
     def _create_optimized_prompt(self, search_results: List[Dict], company_name: str) -> str:
         """Create optimized prompt based on successful patterns"""
         
-        formatted_results = []
-        for i, result in enumerate(search_results[:15], 1):  # More results for analysis
-            title = result.get('title', 'No title')
-            snippet = result.get('snippet', 'No snippet')
-            link = result.get('link', 'No link')
-            formatted_results.append(f"{i}. Title: {title}\n   Snippet: {snippet}\n   Source: {link}\n")
-        
-        search_data = "\n".join(formatted_results)
+        search_data = self._format_search_results(self.context_selector.select(search_results, company_name))
         
         prompt = f"""
 You are an expert business researcher. Extract COMPLETE information about {company_name} AS A COMPANY/CORPORATION from the search results.
@@ -291,27 +876,7 @@ CRITICAL SUCCESS PATTERNS (from Tesla: 001-34756, Walmart: 001-06991):
 13. For PRIVATE/ACQUIRED companies, prioritize SEC filings, Wikipedia, and LinkedIn over other sources
 
 MANDATORY FIELD COMPLETION:
-- legal_name: Extract from SEC filing headers or Wikipedia infobox
-- registration_number: Look for "001-XXXXX" or "File No. XXXXXXX" patterns
-- incorporation_date: Find in SEC filings or Wikipedia (format: YYYY-MM-DD)
-- incorporation_country: Usually "United States" for US companies
-- jurisdiction: Look for "Delaware" or other state incorporation
-- business_type: "Corporation", "LLC", "Partnership"
-- industry: Primary business sector
-- headquarters: Complete address from corporate websites
-- website: Official corporate website URL
-- description: Business description from official sources
-- products_services: Main offerings from business descriptions
-- alternate_names: Former names, abbreviations, trade names
-- identifiers: Extract LEI, DUNS, EIN, CIK when mentioned
-- key_executives: CEO, CFO, CTO, COO from SEC filings/Wikipedia/LinkedIn (prioritize current data)
-- subsidiaries: Major subsidiary companies
-- stock_symbol: NYSE/NASDAQ ticker
-- market_cap: Current market capitalization
-- annual_revenue: Latest annual revenue with year
-- employees: Current employee count
-- founded_year: Year company was founded
-- regulatory_filings: SEC filing URLs when found
+{self._format_field_instructions(self.FIELD_INSTRUCTIONS)}
 
 PROVEN SUCCESSFUL SOURCES (PRIORITIZED FOR EXECUTIVE DATA):
 - SEC EDGAR filings (highest priority for registration numbers)
@@ -333,65 +898,149 @@ EXTRACTION REQUIREMENTS:
 5. Include confidence level: High (official sources), Medium (reliable sources), Low (limited sources)
 
 Respond with ONLY a JSON object containing all fields:
-{{
-    "legal_name": "Official legal company name",
-    "registration_number": "Commission File Number or incorporation number",
-    "incorporation_date": "YYYY-MM-DD format",
-    "incorporation_country": "Country of incorporation",
-    "jurisdiction": "State/province and country",
-    "business_type": "Corporation/LLC/Partnership",
-    "industry": "Primary industry sector",
-    "headquarters": "Complete headquarters address",
-    "website": "Official website URL",
-    "description": "Business description",
-    "products_services": "Main products and services",
-    "alternate_names": ["Alternative names", "Former names"],
-    "identifiers": {{
-        "LEI": "Legal Entity Identifier",
-        "DUNS": "DUNS number",
-        "EIN": "Employer ID Number",
-        "CIK": "SEC Central Index Key"
-    }},
-    "key_executives": ["Name - Title", "Name - Title"],
-    "subsidiaries": ["Subsidiary 1", "Subsidiary 2"],
-    "parent_company": "Parent company if applicable",
-    "stock_symbol": "Stock ticker",
-    "market_cap": "Market capitalization with currency",
-    "annual_revenue": "Revenue with year and currency",
-    "employees": "Employee count with year",
-    "founded_year": "Year founded",
-    "regulatory_filings": ["SEC filing URLs"],
-    "sources": ["Source URLs"],
-    "confidence_level": "High/Medium/Low"
-}}
+{self.RESPONSE_SCHEMA}
 """
         return prompt
     
-    def _parse_llm_response(self, response_text: str) -> Dict[str, Any]:
-        """Parse LLM response and extract structured data"""
+    def _format_search_results(self, search_results: List[Dict]) -> str:
+        formatted_results = []
+        for i, result in enumerate(search_results, 1):
+            title = result.get('title', 'No title')
+            snippet = result.get('snippet', 'No snippet')
+            link = result.get('link', 'No link')
+            formatted_results.append(f"{i}. Title: {title}\n   Snippet: {snippet}\n   Source: {link}\n")
+        
+        return "\n".join(formatted_results)
+    
+    def _format_field_instructions(self, fields) -> str:
+        return "\n".join(f"- {field}: {self.FIELD_INSTRUCTIONS[field]}" for field in fields
+                         if field in self.FIELD_INSTRUCTIONS)
+    
+    def _response_schema(self, fields) -> str:
+        return "{\n" + ",\n".join(f'    "{field}": {self.RESPONSE_FIELDS[field]}' for field in fields) + "\n}"
+    
+    def _create_group_prompt(self, search_results: List[Dict], company_name: str, fields: List[str]) -> str:
+        """Prompt for a subset of the fields, given results already selected for them"""
+        search_data = self._format_search_results(search_results)
+        confidence = ("\nInclude confidence level: High (official sources), Medium (reliable sources), Low (limited sources)"
+                      if "confidence_level" in fields else "")
+        
+        return f"""
+Extract the following fields about {company_name} AS A COMPANY/CORPORATION from the search results.
+Ignore results about people, products or places with the same name.
+
+SEARCH RESULTS:
+{search_data}
+
+FIELDS:
+{self._format_field_instructions(fields)}
+
+Use only the results above. Prioritize official sources (SEC, corporate websites).
+Use "Not available" for anything not found.{confidence}
+
+Respond with ONLY a JSON object containing these fields:
+{self._response_schema(fields)}
+"""
+    
+    def _create_reduced_prompt(self, search_results: List[Dict], company_name: str, max_results: int = 6) -> str:
+        """Short prompt for deadline-constrained runs: top results only, same response fields"""
+        selected = self.context_selector.select(
+            search_results, company_name,
+            token_budget=min(self.context_selector.token_budget, self.REDUCED_CONTEXT_TOKENS),
+            max_results=max_results
+        )
+        search_data = self._format_search_results(selected)
+        
+        return f"""
+Extract information about {company_name} AS A COMPANY/CORPORATION from the search results.
+Ignore results about people, products or places with the same name.
+
+SEARCH RESULTS:
+{search_data}
+
+Use only the results above. Registration numbers look like "Commission File Number: 001-XXXXX".
+Use "Not available" for anything not found. Keep descriptions to one sentence.
+Include confidence level: High (official sources), Medium (reliable sources), Low (limited sources)
+
+Respond with ONLY a JSON object containing all fields:
+{self.RESPONSE_SCHEMA}
+"""
+    
+    def _parse_llm_response(self, response_text: str) -> Tuple[Dict[str, Any], bool]:
+        """
+        Parse LLM response and extract structured data; returns the data and whether
+        the answer was complete (False when fields were salvaged from a truncated answer)
+        """
         try:
             start_idx = response_text.find('{')
             end_idx = response_text.rfind('}') + 1
             
             if start_idx != -1 and end_idx != -1:
                 json_str = response_text[start_idx:end_idx]
-                return json.loads(json_str)
+                return json.loads(json_str), True
             else:
                 logger.warning("No JSON found in LLM response")
-                return {"error": "Invalid response format", "raw_response": response_text}
+                return {"error": "Invalid response format", "raw_response": response_text}, False
                 
         except json.JSONDecodeError as e:
+            # A truncated answer (max_new_tokens) still holds the fields completed before the cut
+            fields = parse_complete_fields(response_text)
+            if fields:
+                logger.warning(f"LLM response incomplete ({e}) - using {len(fields)} complete fields")
+                return fields, False
             logger.error(f"JSON parsing error: {e}")
-            return {"error": "JSON parsing failed", "raw_response": response_text}
+            return {"error": "JSON parsing failed", "raw_response": response_text}, False
 
 class OptimizedCompanySearcher:
     """Optimized company research orchestration"""
     
-    def __init__(self):
+    # Early-termination planner: wave 1 (priority 1) always runs; a query in a later
+    # wave only runs while at least one of its target fields is still missing.
+    PLANNER_FIELDS = {'cik', 'registration_number', 'regulatory_filings',
+                      'key_executives', 'jurisdiction', 'headquarters'}
+    
+    # Deadline mode (search_company(deadline=...)): seconds reserved for the stages after
+    # the searches. With less time left than the full LLM reserve the LLM gets the reduced
+    # prompt; below the minimum it is skipped, as is the SEC fallback below its reserve.
+    DEADLINE_LLM_FULL_SECONDS = 25.0
+    DEADLINE_LLM_MIN_SECONDS = 6.0
+    DEADLINE_SEC_FALLBACK_SECONDS = 4.0
+    DEADLINE_MIN_SEARCH_SECONDS = 5.0
+    
+    # LLM answer fields copied onto CompanyInfo (same names)
+    ANALYSIS_FIELDS = ('legal_name', 'registration_number', 'incorporation_date', 'incorporation_country',
+                       'jurisdiction', 'business_type', 'industry', 'headquarters', 'website', 'description',
+                       'products_services', 'parent_company', 'stock_symbol', 'market_cap', 'annual_revenue',
+                       'employees', 'founded_year', 'confidence_level', 'key_executives', 'subsidiaries',
+                       'alternate_names', 'identifiers', 'regulatory_filings')
+    
+    def __init__(self, max_concurrent_searches: Optional[int] = None, early_termination: Optional[bool] = None,
+                 query_budget: Optional[QueryBudget] = None, checkpoint_store: Optional[CheckpointStore] = None,
+                 result_store: Optional[SearchResultStore] = None):
+        load_environment()
         self.serper_api = None
         self.nova_llm = None
         self.sec_enhancer = None
         self.search_sec_extractor = None
+        # Bounded fan-out: number of SERPER searches allowed in flight at once, shared by
+        # every company this searcher is screening
+        self._search_semaphore = None
+        self._search_semaphore_loop = None
+        self.max_concurrent_searches = max(1, max_concurrent_searches or int(os.getenv('SERPER_MAX_CONCURRENCY', '5')))
+        # Stop sending query groups once the cheap regex extraction has covered their fields
+        if early_termination is None:
+            early_termination = os.getenv('SEARCH_EARLY_TERMINATION', 'false').lower() in ('1', 'true', 'yes')
+        self.early_termination = early_termination
+        # Optional per-deployment limits on the query plan (cost vs. recall tuning)
+        self.query_budget = query_budget or self._budget_from_env()
+        # Optional durable progress record so interrupted runs resume where they stopped
+        self.checkpoint_store = checkpoint_store
+        # Collapses URL variants and near-duplicate snippets before extraction and prompting
+        self.result_deduplicator = ResultDeduplicator(
+            min_similarity=float(os.getenv('RESULT_DEDUP_SIMILARITY', '0.7'))
+        )
+        # Optional store of every result seen, shared by the companies this searcher screens
+        self.result_store = result_store if result_store is not None else self._create_result_store()
         self._initialize_services()
     
     def _initialize_services(self):
@@ -400,12 +1049,35 @@ class OptimizedCompanySearcher:
         if not serper_key:
             raise ValueError("SERPER_API_KEY not found in environment variables")
         
-        self.serper_api = SerperAPI(serper_key)
+        # Rate limiter shared by every SERPER caller in this process (and across
+        # processes when SERPER_RATE_LIMIT_FILE is set)
+        rate_limiter = get_shared_rate_limiter(
+            'serper',
+            rate=float(os.getenv('SERPER_RATE_LIMIT', '10')),
+            burst=int(os.getenv('SERPER_RATE_BURST', '0')) or None,
+            path=os.getenv('SERPER_RATE_LIMIT_FILE')
+        )
+        
+        self.serper_api = SerperAPI(
+            serper_key,
+            max_connections=int(os.getenv('SERPER_MAX_CONNECTIONS', '20')),
+            rate_limiter=rate_limiter,
+            max_retries=int(os.getenv('SERPER_MAX_RETRIES', '3')),
+            cache=self._create_search_cache()
+        )
         
         aws_profile = os.getenv('AWS_PROFILE', 'diligent')
         aws_region = os.getenv('AWS_REGION', 'us-east-1')
         
-        self.nova_llm = AWSNovaLLM(aws_profile, aws_region)
+        self.nova_llm = AWSNovaLLM(
+            aws_profile, aws_region,
+            result_cache=self._create_llm_cache(),
+            max_concurrency=int(os.getenv('BEDROCK_MAX_CONCURRENCY', '4')),
+            context_selector=ContextSelector(token_budget=int(os.getenv('LLM_CONTEXT_TOKEN_BUDGET', '1500'))),
+            max_new_tokens=int(os.getenv('BEDROCK_MAX_NEW_TOKENS', '4000')),
+            extraction_mode=os.getenv('LLM_EXTRACTION_MODE', 'single').lower(),
+            streaming=os.getenv('BEDROCK_STREAMING', 'false').lower() in ('1', 'true', 'yes')
+        )
         
         # Initialize search-based SEC extractor (primary method)
         if SearchBasedSECExtractor:
@@ -423,181 +1095,291 @@ class OptimizedCompanySearcher:
         
         logger.info("All services initialized successfully")
     
+    def _create_search_cache(self) -> Optional[SearchResponseCache]:
+        """Create persistent SERPER response cache when SERPER_CACHE_PATH is set"""
+        cache_path = os.getenv('SERPER_CACHE_PATH')
+        if not cache_path:
+            return None
+        
+        try:
+            # Optional per-category TTL overrides in hours, e.g. SERPER_CACHE_TTL_NEWS=12
+            ttl_overrides = {}
+            for category in ('sec', 'linkedin', 'news', 'default'):
+                hours = os.getenv(f'SERPER_CACHE_TTL_{category.upper()}')
+                if hours:
+                    ttl_overrides[category] = float(hours) * 3600
+            
+            backend = SQLiteCache(
+                cache_path,
+                max_entries=int(os.getenv('SERPER_CACHE_MAX_ENTRIES', '50000'))
+            )
+            logger.info(f"SERPER response cache enabled: {cache_path}")
+            return SearchResponseCache(backend, ttl_overrides)
+        except Exception as e:
+            logger.warning(f"SERPER response cache unavailable: {e}")
+            return None
+    
+    def _create_llm_cache(self) -> Optional[LLMResultCache]:
+        """Create LLM result cache when LLM_CACHE_BACKEND is 'memory' or 'disk'"""
+        backend_name = os.getenv('LLM_CACHE_BACKEND', '').lower()
+        if not backend_name:
+            return None
+        
+        try:
+            max_entries = int(os.getenv('LLM_CACHE_MAX_ENTRIES', '1000'))
+            if backend_name == 'memory':
+                backend = MemoryLRUCache(max_entries=max_entries)
+            elif backend_name == 'disk':
+                backend = SQLiteCache(os.getenv('LLM_CACHE_PATH', 'llm_cache.db'), max_entries=max_entries)
+            else:
+                logger.warning(f"Unknown LLM_CACHE_BACKEND '{backend_name}' - LLM caching disabled")
+                return None
+            
+            ttl = float(os.getenv('LLM_CACHE_TTL_HOURS', '168')) * 3600
+            logger.info(f"LLM result cache enabled: {backend_name} backend")
+            return LLMResultCache(backend, ttl=ttl)
+        except Exception as e:
+            logger.warning(f"LLM result cache unavailable: {e}")
+            return None
+    
+    def _create_result_store(self) -> Optional[SearchResultStore]:
+        """Create the shared search result store when RESULT_STORE_BACKEND is 'memory' or 'disk'"""
+        backend_name = os.getenv('RESULT_STORE_BACKEND', '').lower()
+        if not backend_name:
+            return None
+        
+        try:
+            max_companies = int(os.getenv('RESULT_STORE_MAX_COMPANIES', '1000'))
+            max_age_seconds = self._result_store_max_age()
+            if backend_name == 'memory':
+                store = SearchResultStore(max_companies=max_companies, max_age_seconds=max_age_seconds)
+            elif backend_name == 'disk':
+                store = SearchResultStore(os.getenv('RESULT_STORE_PATH', 'result_store.db'), max_companies=max_companies,
+                                          max_age_seconds=max_age_seconds)
+            else:
+                logger.warning(f"Unknown RESULT_STORE_BACKEND '{backend_name}' - result store disabled")
+                return None
+            
+            logger.info(f"Search result store enabled: {backend_name} backend")
+            return store
+        except Exception as e:
+            logger.warning(f"Search result store unavailable: {e}")
+            return None
+    
+    @staticmethod
+    def _result_store_max_age() -> Optional[float]:
+        """Age limit of results seeded from the store (RESULT_STORE_MAX_AGE_HOURS; 0 means no limit)"""
+        max_age_hours = float(os.getenv('RESULT_STORE_MAX_AGE_HOURS', '24'))
+        return max_age_hours * 3600 if max_age_hours > 0 else None
+    
+    def get_cache_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Hit/miss counters for each enabled cache ('serper', 'llm')"""
+        stats = {}
+        if self.serper_api and self.serper_api.cache:
+            stats['serper'] = self.serper_api.cache.stats.to_dict()
+        if self.nova_llm and self.nova_llm.result_cache:
+            stats['llm'] = self.nova_llm.result_cache.stats.to_dict()
+        return stats
+    
+    def _budget_from_env(self) -> Optional[QueryBudget]:
+        """Query plan budget from QUERY_MAX_* environment variables (None when unset)"""
+        limits = {
+            'max_queries': os.getenv('QUERY_MAX_QUERIES'),
+            'max_results': os.getenv('QUERY_MAX_RESULTS'),
+            'max_cost': os.getenv('QUERY_MAX_COST'),
+            'max_latency': os.getenv('QUERY_MAX_LATENCY')
+        }
+        if not any(limits.values()):
+            return None
+        
+        return QueryBudget(
+            max_queries=int(limits['max_queries']) if limits['max_queries'] else None,
+            max_results=int(limits['max_results']) if limits['max_results'] else None,
+            max_cost=float(limits['max_cost']) if limits['max_cost'] else None,
+            max_latency=float(limits['max_latency']) if limits['max_latency'] else None,
+            concurrency=self.max_concurrent_searches,
+            latency_per_query=float(os.getenv('QUERY_LATENCY_PER_QUERY', '1.0'))
+        )
+    
+    def build_query_plan(self, company_name: str, budget: Optional[QueryBudget] = None) -> QueryPlan:
+        """Build the query plan for a company under the given (or configured) budget"""
+        plan = build_query_plan(company_name, budget or self.query_budget)
+        if plan.skipped:
+            logger.info(f"Query budget: planned {len(plan.queries)} queries, skipped {len(plan.skipped)}")
+        return plan
+    
     def generate_optimized_queries(self, company_name: str) -> List[str]:
         """Generate optimized search queries based on successful patterns"""
+        return [planned.query for planned in self.build_query_plan(company_name).queries]
+    
+    def _get_search_semaphore(self) -> asyncio.Semaphore:
+        """Global in-flight search limit for the running event loop"""
+        loop = asyncio.get_running_loop()
+        if self._search_semaphore is None or self._search_semaphore_loop is not loop:
+            self._search_semaphore = asyncio.Semaphore(self.max_concurrent_searches)
+            self._search_semaphore_loop = loop
+        return self._search_semaphore
+    
+    def _search_deadline(self, deadline: float) -> float:
+        """Time by which searches must finish so the later stages still fit before the deadline"""
+        now = time.monotonic()
+        time_left = deadline - now
+        full_reserve = self.DEADLINE_LLM_FULL_SECONDS + self.DEADLINE_SEC_FALLBACK_SECONDS
+        if time_left - full_reserve >= self.DEADLINE_MIN_SEARCH_SECONDS:
+            return deadline - full_reserve
         
-        # COMPANY-SPECIFIC core queries (exclude people, products, other entities)
-        core_queries = [
-            f'"{company_name}" company corporation Wikipedia',
-            f'site:wikipedia.org "{company_name}" company corporation',
-            f'"{company_name}" company SEC 10-K Edgar',
-            f'site:sec.gov "{company_name}" corporation 10-K',
-            f'"{company_name}" business entity company profile',
-            f'"{company_name}" corporation headquarters address'
-        ]
-        
-        # COMPANY-SPECIFIC registration queries (Tesla: 001-34756, Walmart: 001-06991)
-        registration_queries = [
-            f'"{company_name}" corporation "Commission File Number" SEC',
-            f'"{company_name}" company SEC filing "001-" registration',
-            f'site:sec.gov "{company_name}" corporation "Commission File Number"',
-            f'"{company_name}" company EDGAR "File Number" incorporation',
-            f'site:edgar.sec.gov "{company_name}" corporation incorporation',
-            f'"{company_name}" company SEC 10-K "state of incorporation"',
-            f'"{company_name}" corporation annual report incorporation details',
-            f'"{company_name}" company proxy statement incorporation'
-        ]
-        
-        # COMPANY-SPECIFIC SEC FORM 10-K searches for non-listed companies
-        form_10k_queries = [
-            f'site:sec.gov "{company_name}" corporation "FORM 10-K"',
-            f'"{company_name}" company "FORM 10-K" SEC filing',
-            f'site:edgar.sec.gov "{company_name}" corporation "FORM 10-K"',
-            f'"{company_name}" company "FORM 10-K" incorporation details',
-            f'"{company_name}" corporation "FORM 10-K" registration number',
-            f'site:sec.gov "{company_name}" corporation "FORM 10-K" Delaware',
-            f'"{company_name}" company "FORM 10-K" "state of incorporation"',
-            f'"{company_name}" corporation "FORM 10-K" "Commission File Number"'
-        ]
-        
-        # Enhanced SEC FORM 20-F searches for foreign companies
-        form_20f_queries = [
-            f'site:sec.gov "{company_name}" "FORM 20-F"',
-            f'"{company_name}" "FORM 20-F" SEC filing',
-            f'site:edgar.sec.gov "{company_name}" "FORM 20-F"',
-            f'"{company_name}" "FORM 20-F" annual report',
-            f'"{company_name}" "FORM 20-F" foreign company',
-            f'site:sec.gov "{company_name}" "FORM 20-F" incorporation',
-            f'"{company_name}" "FORM 20-F" "Commission File Number"',
-            f'"{company_name}" "FORM 20-F" jurisdiction country'
-        ]
-        
-        # Enhanced SEC FORM 8-K searches for current events and material changes
-        form_8k_queries = [
-            f'site:sec.gov "{company_name}" "FORM 8-K"',
-            f'"{company_name}" "FORM 8-K" SEC filing',
-            f'site:edgar.sec.gov "{company_name}" "FORM 8-K"',
-            f'"{company_name}" "FORM 8-K" current report',
-            f'"{company_name}" "FORM 8-K" executive changes',
-            f'site:sec.gov "{company_name}" "FORM 8-K" material events',
-            f'"{company_name}" "FORM 8-K" "Commission File Number"',
-            f'"{company_name}" "FORM 8-K" corporate governance'
-        ]
-        
-        # Enhanced SEC Proxy Statement (DEF 14A) searches for governance and executive data
-        proxy_def14a_queries = [
-            f'site:sec.gov "{company_name}" "DEF 14A"',
-            f'"{company_name}" "DEF 14A" SEC filing',
-            f'site:edgar.sec.gov "{company_name}" "DEF 14A"',
-            f'"{company_name}" "Proxy Statement" SEC',
-            f'"{company_name}" "DEF 14A" executive compensation',
-            f'site:sec.gov "{company_name}" "Proxy Statement" executives',
-            f'"{company_name}" "DEF 14A" board of directors',
-            f'"{company_name}" "Proxy Statement" corporate governance'
-        ]
-        
-        # Proven identifier extraction queries
-        identifier_queries = [
-            f'"{company_name}" LEI identifier',
-            f'"{company_name}" DUNS number',
-            f'"{company_name}" EIN tax ID',
-            f'"{company_name}" CIK SEC number',
-            f'"{company_name}" CUSIP identifier'
-        ]
-        
-        # COMPANY-SPECIFIC executive and financial data queries
-        corporate_queries = [
-            f'"{company_name}" company CEO CFO executives 2024',
-            f'site:sec.gov "{company_name}" corporation executive officers',
-            f'"{company_name}" company annual revenue 2024 2023',
-            f'"{company_name}" corporation market cap employees',
-            f'"{company_name}" company headquarters address',
-            f'"{company_name}" corporation subsidiaries companies'
-        ]
-        
-        # REMOVED: Crunchbase and PitchBook queries (0% success rate, wasting ~36 seconds)
-        # These platforms block search engine indexing or require authentication
-        # Executive data is successfully extracted from SEC filings, Wikipedia, and pattern matching
-        
-        # AGGRESSIVE LINKEDIN SEARCHES - Company-specific for current executive information
-        linkedin_queries = [
-            f'site:linkedin.com "{company_name}" company CEO',
-            f'site:linkedin.com "{company_name}" corporation CFO',
-            f'site:linkedin.com "{company_name}" company CTO',
-            f'site:linkedin.com "{company_name}" company executives',
-            f'site:linkedin.com "{company_name}" corporation leadership team',
-            f'site:linkedin.com "{company_name}" company management',
-            f'site:linkedin.com/company "{company_name}"',
-            f'site:linkedin.com "{company_name}" corporation board members',
-            f'site:linkedin.com "{company_name}" company senior management',
-            f'site:linkedin.com "{company_name}" business C-suite',
-            f'"{company_name}" company linkedin CEO profile',
-            f'"{company_name}" corporation linkedin CFO executive',
-            f'"{company_name}" business linkedin company executives',
-            f'"{company_name}" company linkedin leadership team',
-            f'"{company_name}" corporation linkedin management profiles'
-        ]
-        
-        # COMPANY-SPECIFIC enhanced data source queries
-        source_queries = [
-            f'site:bloomberg.com "{company_name}" company profile',
-            f'site:reuters.com "{company_name}" corporation company',
-            f'site:yahoo.com "{company_name}" company profile',
-            f'site:opencorporates.com "{company_name}" corporation'
-        ]
-        
-        # COMPANY-SPECIFIC business information queries
-        business_queries = [
-            f'"{company_name}" company products services business',
-            f'"{company_name}" corporation industry sector business type',
-            f'"{company_name}" company corporate website official',
-            f'"{company_name}" corporation founded established history'
-        ]
-        
-        # COMPANY-SPECIFIC name variation queries with business entity suffixes
-        variations = []
-        if "Inc" not in company_name and "Corp" not in company_name:
-            variations.extend([
-                f'"{company_name} Inc" company SEC filings',
-                f'"{company_name} Corporation" company Wikipedia',
-                f'"{company_name} Corp" company information',
-                f'"{company_name} LLC" business entity',
-                f'"{company_name} Ltd" corporation company'
-            ])
-        
-        # EXCLUSION-ENHANCED queries to filter out people, products, places
-        exclusion_queries = [
-            f'"{company_name}" company business -person -individual -biography',
-            f'"{company_name}" corporation entity -product -service -location',
-            f'"{company_name}" business headquarters -celebrity -athlete -politician',
-            f'"{company_name}" company profile -personal -individual -biography'
-        ]
-        
-        # Combine all COMPANY-SPECIFIC optimized queries with exclusions prioritized
-        all_queries = (
-            core_queries +
-            exclusion_queries +       # HIGH PRIORITY: Filter out non-company entities
-            registration_queries +
-            form_10k_queries +
-            form_20f_queries +
-            form_8k_queries +
-            proxy_def14a_queries +
-            # REMOVED: crunchbase_queries + pitchbook_queries (0% success rate)
-            linkedin_queries +        # MODERATE PRIORITY: Some success for company pages
-            identifier_queries +
-            corporate_queries +
-            source_queries +
-            business_queries +
-            variations
+        # Not enough time for everything: searches get at least the minimum window and
+        # the LLM makes do with the reduced prompt (or is skipped)
+        reduced_reserve = self.DEADLINE_LLM_MIN_SECONDS + self.DEADLINE_SEC_FALLBACK_SECONDS
+        return now + max(min(self.DEADLINE_MIN_SEARCH_SECONDS, time_left), time_left - reduced_reserve)
+    
+    def _deadline_budget(self, search_deadline: float) -> QueryBudget:
+        """Configured query budget with its latency limit tightened to the search window"""
+        window = max(0.0, search_deadline - time.monotonic())
+        budget = self.query_budget or QueryBudget(
+            concurrency=self.max_concurrent_searches,
+            latency_per_query=float(os.getenv('QUERY_LATENCY_PER_QUERY', '1.0'))
         )
+        max_latency = window if budget.max_latency is None else min(budget.max_latency, window)
+        return replace(budget, max_latency=max_latency)
+    
+    async def _run_searches(self, planned_queries: List[PlannedQuery], company_name: str,
+                            search_deadline: Optional[float] = None,
+                            unfinished: Optional[List[PlannedQuery]] = None,
+                            failed: Optional[List[PlannedQuery]] = None) -> List[Dict]:
+        """
+        Run planned searches with bounded concurrency, merging results in query order
+        
+        With a search_deadline, searches start in priority order and any still running at
+        the deadline are cancelled and appended to unfinished. Searches that returned an
+        error are appended to failed.
+        """
+        semaphore = self._get_search_semaphore()
+        
+        # Replay searches completed by an earlier, interrupted run
+        checkpointed = self.checkpoint_store.get_query_results(company_name) if self.checkpoint_store else {}
+        
+        async def run_search(planned: PlannedQuery) -> List[Dict]:
+            saved = checkpointed.get(planned.query_id)
+            if saved and saved['query'] == planned.query:
+                return saved['results']
+            
+            async with semaphore:
+                results = await self.serper_api.asearch(planned.query, planned.num_results, planned.category)
+            
+            organic = results.get('organic', [])
+            if 'error' in results:
+                if failed is not None:
+                    failed.append(planned)
+            elif self.checkpoint_store:
+                self.checkpoint_store.save_query_result(company_name, planned.query_id, planned.query, organic)
+            return organic
+        
+        if checkpointed:
+            logger.info(f"Checkpoint: {len(checkpointed)} completed searches available for {company_name}")
+        logger.info(f"Running {len(planned_queries)} searches with up to {self.max_concurrent_searches} in flight")
+        if search_deadline is None:
+            batches = await asyncio.gather(*(run_search(planned) for planned in planned_queries))
+        else:
+            batches = await self._gather_until(planned_queries, run_search, search_deadline, unfinished)
+        
+        all_search_results = []
+        for batch in batches:
+            all_search_results.extend(batch)
+        return all_search_results
+    
+    async def _gather_until(self, planned_queries: List[PlannedQuery], run_search, search_deadline: float,
+                            unfinished: Optional[List[PlannedQuery]]) -> List[List[Dict]]:
+        """Per-query results of the searches that finished by search_deadline (empty for the rest)"""
+        # Tasks queue on the semaphore in creation order, so high-priority queries go first
+        tasks = {}
+        for index in sorted(range(len(planned_queries)), key=lambda i: planned_queries[i].priority):
+            tasks[index] = asyncio.create_task(run_search(planned_queries[index]))
+        if tasks:
+            await asyncio.wait(tasks.values(), timeout=max(0.0, search_deadline - time.monotonic()))
+        
+        batches = []
+        cut = 0
+        for index, planned in enumerate(planned_queries):
+            task = tasks[index]
+            if task.done() and not task.cancelled() and task.exception() is None:
+                batches.append(task.result())
+                continue
+            task.cancel()
+            batches.append([])
+            cut += 1
+            if unfinished is not None:
+                unfinished.append(planned)
+        
+        if cut:
+            logger.warning(f"Deadline: {cut} of {len(planned_queries)} searches cut short")
+        return batches
+    
+    async def _run_planned_searches(self, plan: QueryPlan, search_deadline: Optional[float] = None,
+                                    unfinished: Optional[List[PlannedQuery]] = None,
+                                    seed_results: Optional[List[Dict]] = None,
+                                    failed: Optional[List[PlannedQuery]] = None) -> List[Dict]:
+        """
+        Run the plan in priority waves, skipping queries whose target fields are already
+        covered (by the results so far or seed_results from the result store; with seed
+        results, the first wave is checked too)
+        """
+        all_search_results = []
+        queries_run = 0
+        for wave_number, wave in enumerate(plan.waves(), 1):
+            if wave_number == 1 and not seed_results:
+                selected = wave
+            else:
+                covered = self.search_sec_extractor.assess_field_coverage((seed_results or []) + all_search_results)
+                missing = self.PLANNER_FIELDS - covered
+                if not missing:
+                    if wave_number == 1:
+                        logger.info("Planner: all target fields covered by stored results")
+                    else:
+                        logger.info(f"Planner: all target fields covered after wave {wave_number - 1}")
+                    break
+                
+                selected = [planned for planned in wave if planned.target_fields & missing]
+                skipped_groups = sorted({planned.group for planned in wave} - {planned.group for planned in selected})
+                logger.info(f"Planner wave {wave_number}: missing {sorted(missing)}, "
+                            f"running {len(selected)} queries, skipping groups {skipped_groups}")
+            
+            if selected and search_deadline is not None and time.monotonic() >= search_deadline:
+                logger.warning(f"Deadline: skipping {len(selected)} queries of planner wave {wave_number}")
+                if unfinished is not None:
+                    unfinished.extend(selected)
+            elif selected:
+                all_search_results.extend(await self._run_searches(
+                    selected, plan.company_name, search_deadline, unfinished, failed
+                ))
+                queries_run += len(selected)
         
-        return all_queries
+        logger.info(f"Planner: ran {queries_run} of {len(plan.queries)} queries "
+                    f"({len(plan.queries) - queries_run} skipped)")
+        return all_search_results
     
-    async def search_company(self, company_name: str) -> CompanyInfo:
-        """Perform optimized company search with SEC data prioritized"""
+    async def search_company(self, company_name: str, deadline: Optional[float] = None,
+                             on_update: Optional[Callable[[CompanyInfo, str], None]] = None) -> CompanyInfo:
+        """
+        Perform optimized company search with SEC data prioritized
+        
+        deadline is an absolute time.monotonic() value. As it approaches, low-priority
+        query groups are dropped, the LLM gets a reduced prompt (or is skipped) and the
+        SEC fallback is skipped; whatever was found by then is returned with partial=True.
+        
+        on_update(company_info, field) is called on the event loop each time an LLM field
+        is filled in, as the answer streams in when BEDROCK_STREAMING is enabled.
+        """
         logger.info(f"Starting optimized search for: {company_name}")
         
+        if self.checkpoint_store:
+            completed = self.checkpoint_store.get_completed(company_name)
+            if completed:
+                logger.info(f"Checkpoint: {company_name} already completed - returning saved result")
+                return CompanyInfo(**completed)
+        
         company_info = CompanyInfo(company_name=company_name)
+        partial_reasons = []
         
         # STEP 1: Initialize basic company info (search-based SEC extraction will happen after search)
         logger.info("STEP 1: Initializing company research")
@@ -606,50 +1388,50 @@ class OptimizedCompanySearcher:
             # STEP 2: COMPLEMENTARY WEB SEARCH (to fill remaining gaps)
             logger.info("STEP 2: Performing complementary web search")
             
-            search_queries = self.generate_optimized_queries(company_name)
-            
-            # Perform searches with optimized result counts
-            all_search_results = []
-            for i, query in enumerate(search_queries):
-                # Higher result counts for proven successful query types
-                if i < 6:  # Core queries (increased from 4 to 6)
-                    num_results = 12
-                elif i < 10:  # Exclusion queries (NEW - filter non-company entities)
-                    num_results = 15
-                elif i < 18:  # Registration queries (highest priority)
-                    num_results = 15
-                elif i < 26:  # FORM 10-K queries (high priority for non-listed companies)
-                    num_results = 15
-                elif i < 34:  # FORM 20-F queries (high priority for foreign companies)
-                    num_results = 15
-                elif i < 42:  # FORM 8-K queries (high priority for current events)
-                    num_results = 12
-                elif i < 50:  # DEF 14A Proxy queries (high priority for executive data)
-                    num_results = 12
-                # REMOVED: Crunchbase (i < 62) and PitchBook (i < 74) ranges - 24 queries eliminated
-                elif i < 65:  # LINKEDIN queries (MODERATE for current executive profiles) - shifted from 89
-                    num_results = 15
-                elif i < 70:  # Identifier queries - shifted from 94
-                    num_results = 10
-                else:  # Other queries
-                    num_results = 8
-                
-                results = self.serper_api.search(query, num_results=num_results)
-                if 'organic' in results:
-                    all_search_results.extend(results['organic'])
-                
-                await asyncio.sleep(0.3)
+            search_deadline = None
+            unfinished = []
+            failed = []
+            if deadline is None:
+                plan = self.build_query_plan(company_name)
+            else:
+                search_deadline = self._search_deadline(deadline)
+                plan = self.build_query_plan(company_name, self._deadline_budget(search_deadline))
+                dropped = len(plan.skipped) - len(build_query_plan(company_name, self.query_budget).skipped)
+                if dropped > 0:
+                    partial_reasons.append(f"{dropped} low-priority queries skipped")
+            
+            # Results seen before for this company, or mentioning it in related companies' screenings
+            seeded = self.result_store.seed_results(company_name) if self.result_store else []
+            if seeded:
+                logger.info(f"Result store: {len(seeded)} stored results for {company_name}")
+            
+            # Perform searches concurrently, merging results in query order
+            if self.early_termination and self.search_sec_extractor:
+                all_search_results = await self._run_planned_searches(plan, search_deadline, unfinished, seeded,
+                                                                      failed)
+            else:
+                all_search_results = await self._run_searches(plan.queries, company_name, search_deadline,
+                                                              unfinished, failed)
+            if unfinished:
+                partial_reasons.append(f"{len(unfinished)} searches cut short")
+            if failed:
+                partial_reasons.append(f"{len(failed)} searches failed")
+            
+            if self.result_store:
+                self.result_store.add(company_name, all_search_results)
+                all_search_results = all_search_results + seeded
             
-            # Remove duplicates
-            unique_results = []
-            seen_urls = set()
-            for result in all_search_results:
-                url = result.get('link', '')
-                if url and url not in seen_urls:
-                    unique_results.append(result)
-                    seen_urls.add(url)
+            # Remove duplicates: same page under another URL form, and near-identical copies
+            # on other sites (the most authoritative copy is kept)
+            unique_results = self.result_deduplicator.dedupe(all_search_results)
             
-            logger.info(f"Found {len(unique_results)} unique search results")
+            logger.info(f"Found {len(unique_results)} unique search results "
+                        f"(from {len(all_search_results)} results)")
+            
+            serper_cache_stats = self.get_cache_stats().get('serper')
+            if serper_cache_stats:
+                logger.info(f"SERPER cache: {serper_cache_stats['hits']} hits, {serper_cache_stats['misses']} misses "
+                            f"({serper_cache_stats['hit_rate']:.0%} hit rate)")
             
             # STEP 2A: Extract SEC data directly from search results (PRIMARY METHOD)
             if unique_results and self.search_sec_extractor:
@@ -668,15 +1450,28 @@ class OptimizedCompanySearcher:
                     logger.info("Search-based SEC extraction completed")
                 except Exception as e:
                     logger.error(f"Search-based SEC extraction failed: {e}")
+                    partial_reasons.append("search-based SEC extraction failed")
             
             # STEP 2B: Analyze with Nova LLM
             if unique_results:
-                analysis = self.nova_llm.analyze_company_data(unique_results, company_name)
+                # Streamed fields are applied as they arrive, so an answer cut short by the
+                # deadline still fills what it got to
+                cancel = threading.Event()
+                try:
+                    analysis = await self._analyze_before_deadline(
+                        unique_results, company_name, deadline, partial_reasons, known=asdict(company_info),
+                        on_field=self._field_applier(company_info, on_update, cancel), cancel=cancel
+                    )
+                finally:
+                    cancel.set()
                 
-                if 'error' not in analysis:
+                if analysis is not None and 'error' not in analysis:
                     self._update_company_info(company_info, analysis, unique_results)
-                else:
+                    if analysis.get('group_errors'):
+                        partial_reasons.append(f"{len(analysis['group_errors'])} LLM field groups failed")
+                elif analysis is not None:
                     logger.error(f"LLM analysis failed: {analysis['error']}")
+                    partial_reasons.append("LLM analysis failed")
             
             # STEP 3: FALLBACK SEC API LOOKUP (only if search-based extraction missed data)
             if self.sec_enhancer:
@@ -685,10 +1480,17 @@ class OptimizedCompanySearcher:
                     has_cik = company_info.identifiers and company_info.identifiers.get('CIK', 'Not available') != 'Not available'
                     has_filings = company_info.regulatory_filings and company_info.regulatory_filings != ['Not available']
                     
-                    if not has_cik or not has_filings:
+                    time_left = None if deadline is None else deadline - time.monotonic()
+                    if (not has_cik or not has_filings) and time_left is not None and time_left < self.DEADLINE_SEC_FALLBACK_SECONDS:
+                        logger.warning("STEP 3: Skipping SEC API fallback - deadline too close")
+                        partial_reasons.append("SEC fallback skipped")
+                    elif not has_cik or not has_filings:
                         logger.info("STEP 3: Fallback SEC API lookup for missing data")
                         company_dict = asdict(company_info)
-                        final_enhanced_dict = self.sec_enhancer.enhance_company_data(company_dict, company_name)
+                        final_enhanced_dict = await asyncio.wait_for(
+                            asyncio.to_thread(self.sec_enhancer.enhance_company_data, company_dict, company_name),
+                            timeout=time_left
+                        )
                         
                         # Update company_info with any additional SEC data found
                         for key, value in final_enhanced_dict.items():
@@ -698,60 +1500,137 @@ class OptimizedCompanySearcher:
                         logger.info("Fallback SEC API lookup completed")
                     else:
                         logger.info("STEP 3: Skipping SEC API fallback - search-based extraction was sufficient")
+                except asyncio.TimeoutError:
+                    logger.warning("Fallback SEC API lookup did not finish before the deadline")
+                    partial_reasons.append("SEC fallback timed out")
                 except Exception as e:
                     logger.error(f"Fallback SEC API lookup failed: {e}")
+                    partial_reasons.append("SEC fallback failed")
+            
+            if self.result_store:
+                # Later screenings of these companies can start from this one's results
+                related = [company_info.parent_company, *company_info.subsidiaries, *company_info.alternate_names]
+                self.result_store.link_related(company_name, [name for name in related
+                                                              if isinstance(name, str) and _has_value(name)])
+            
+            if partial_reasons:
+                # Not checkpointed as completed, so a retry (with more time, or after the failed
+                # service recovers) redoes the missing work
+                company_info.partial = True
+                logger.warning(f"Returning partial result for {company_name}: {'; '.join(partial_reasons)}")
+            elif self.checkpoint_store:
+                self.checkpoint_store.mark_completed(company_name, asdict(company_info))
             
             return company_info
             
         except Exception as e:
             logger.error(f"Search failed for {company_name}: {e}")
-            company_info.sources = [f"Error: {str(e)}"]
-            return company_info
+            return self.failed_company_info(company_name, str(e), company_info)
     
-    def _update_company_info(self, company_info: CompanyInfo, analysis: Dict, search_results: List[Dict]):
-        """Update company info with analysis results"""
+    async def _analyze_before_deadline(self, search_results: List[Dict], company_name: str,
+                                       deadline: Optional[float], partial_reasons: List[str],
+                                       known: Optional[Dict[str, Any]] = None,
+                                       on_field: Optional[Callable[[str, Any], None]] = None,
+                                       cancel: Optional[threading.Event] = None) -> Optional[Dict[str, Any]]:
+        """LLM analysis sized to the time left before the deadline (None if skipped or timed out)"""
+        if deadline is None:
+            return await self.nova_llm.analyze_company_data_async(search_results, company_name, known=known,
+                                                                  on_field=on_field, cancel=cancel)
         
-        # Map all fields from analysis
-        field_mapping = {
-            'legal_name': 'legal_name',
-            'registration_number': 'registration_number',
-            'incorporation_date': 'incorporation_date',
-            'incorporation_country': 'incorporation_country',
-            'jurisdiction': 'jurisdiction',
-            'business_type': 'business_type',
-            'industry': 'industry',
-            'headquarters': 'headquarters',
-            'website': 'website',
-            'description': 'description',
-            'products_services': 'products_services',
-            'parent_company': 'parent_company',
-            'stock_symbol': 'stock_symbol',
-            'market_cap': 'market_cap',
-            'annual_revenue': 'annual_revenue',
-            'employees': 'employees',
-            'founded_year': 'founded_year',
-            'confidence_level': 'confidence_level'
-        }
+        # Time left for the LLM after keeping the SEC fallback reserve; the analysis matters
+        # more than the fallback, so it takes the fallback's reserve when short of time
+        time_left = deadline - time.monotonic()
+        llm_time = time_left - self.DEADLINE_SEC_FALLBACK_SECONDS
+        if llm_time < self.DEADLINE_LLM_MIN_SECONDS:
+            llm_time = time_left
+        if llm_time < self.DEADLINE_LLM_MIN_SECONDS:
+            logger.warning(f"Deadline: skipping LLM analysis ({llm_time:.1f}s left)")
+            partial_reasons.append("LLM analysis skipped")
+            return None
         
-        for analysis_key, info_key in field_mapping.items():
-            if analysis_key in analysis and analysis[analysis_key]:
-                setattr(company_info, info_key, analysis[analysis_key])
+        reduced = llm_time < self.DEADLINE_LLM_FULL_SECONDS
+        if reduced:
+            logger.info(f"Deadline: using reduced LLM prompt ({llm_time:.1f}s left)")
+        try:
+            # On timeout the Bedrock call finishes in its worker thread; its result is discarded
+            return await asyncio.wait_for(
+                self.nova_llm.analyze_company_data_async(search_results, company_name, reduced=reduced, known=known,
+                                                         on_field=on_field, cancel=cancel),
+                timeout=llm_time
+            )
+        except asyncio.TimeoutError:
+            logger.warning(f"LLM analysis did not finish within {llm_time:.1f}s")
+            partial_reasons.append("LLM analysis timed out")
+            return None
+    
+    def failed_company_info(self, company_name: str, error: str,
+                            company_info: Optional[CompanyInfo] = None) -> CompanyInfo:
+        """
+        CompanyInfo recording a failed search; a company_info filled in before the failure
+        keeps its fields and is marked partial
+        """
+        if company_info is None:
+            company_info = CompanyInfo(company_name=company_name)
+        else:
+            company_info.partial = True
+        company_info.sources = [f"Error: {error}"]
+        return company_info
+    
+    def is_healthy(self) -> bool:
+        """Whether the long-lived clients can keep serving requests (API key and AWS credentials still valid)"""
+        if not self.serper_api or self.serper_api.api_key != os.getenv('SERPER_API_KEY'):
+            return False
+        return bool(self.nova_llm and self.nova_llm.credentials_valid())
+    
+    async def close(self):
+        """Release pooled HTTP connections and worker threads"""
+        if self.serper_api:
+            await self.serper_api.aclose()
+        if self.nova_llm:
+            self.nova_llm.close()
+    
+    def _field_applier(self, company_info: CompanyInfo, on_update: Optional[Callable[[CompanyInfo, str], None]],
+                       cancel: threading.Event) -> Callable[[str, Any], None]:
+        """on_field callback for the Bedrock worker threads: applies each field on the event loop"""
+        loop = asyncio.get_running_loop()
         
-        # Handle list and dict fields
-        if 'key_executives' in analysis and analysis['key_executives']:
-            company_info.key_executives = analysis['key_executives']
+        def apply(field: str, value: Any):
+            # Fields arriving after the analysis was given up on are dropped
+            if cancel.is_set():
+                return
+            if self._apply_analysis_field(company_info, field, value) and on_update:
+                on_update(company_info, field)
         
-        if 'subsidiaries' in analysis and analysis['subsidiaries']:
-            company_info.subsidiaries = analysis['subsidiaries']
-            
-        if 'alternate_names' in analysis and analysis['alternate_names']:
-            company_info.alternate_names = analysis['alternate_names']
-            
-        if 'identifiers' in analysis and analysis['identifiers']:
-            company_info.identifiers = analysis['identifiers']
-            
-        if 'regulatory_filings' in analysis and analysis['regulatory_filings']:
-            company_info.regulatory_filings = analysis['regulatory_filings']
+        def on_field(field: str, value: Any):
+            loop.call_soon_threadsafe(apply, field, value)
+        
+        return on_field
+    
+    def _apply_analysis_field(self, company_info: CompanyInfo, field: str, value: Any) -> bool:
+        """
+        Copy one analysis field onto company_info (empty values and unknown fields are
+        ignored, and "Not available" does not replace data found earlier, e.g. by regex)
+        """
+        if field not in self.ANALYSIS_FIELDS or not value:
+            return False
+        if not _has_value(value) and _has_value(getattr(company_info, field)):
+            return False
+        if field == 'identifiers' and isinstance(company_info.identifiers, dict):
+            # Identifiers are requested as a whole; keep the ones already found (e.g. the CIK
+            # from the search results) over the model's "Not available"
+            known = {key: known for key, known in company_info.identifiers.items() if _has_value(known)}
+            if known:
+                value = {**(value if isinstance(value, dict) else {}), **known}
+        setattr(company_info, field, value)
+        return True
+    
+    def _update_company_info(self, company_info: CompanyInfo, analysis: Dict, search_results: List[Dict]):
+        """Update company info with analysis results"""
+        
+        # Map all fields from analysis, including list and dict fields
+        for field in self.ANALYSIS_FIELDS:
+            if field in analysis:
+                self._apply_analysis_field(company_info, field, analysis[field])
         
         # Add sources from search results and analysis
         sources = []
@@ -784,19 +1663,61 @@ class OptimizedCompanySearcher:
 
 async def main():
     """Main function for optimized company search"""
+    load_environment()
+    configure_logging()
+    
     parser = argparse.ArgumentParser(description='Optimized company information extraction')
-    parser.add_argument('--company', '-c', required=True, help='Company name to research')
+    target = parser.add_mutually_exclusive_group(required=True)
+    target.add_argument('--company', '-c', help='Company name to research')
+    target.add_argument('--batch', '-b', help='CSV, JSONL or text file of company names to screen')
+    target.add_argument('--import-profile', nargs='?', const='lambda_handler', metavar='MODULE',
+                        help='Report per-module import cost of a cold start of MODULE (default: lambda_handler)')
     parser.add_argument('--output', '-o', help='Output JSON file path')
     parser.add_argument('--verbose', '-v', action='store_true', help='Enable verbose logging')
+    parser.add_argument('--max-concurrency', type=int, help='Maximum SERPER searches in flight (default: SERPER_MAX_CONCURRENCY or 5)')
+    parser.add_argument('--early-termination', action='store_true', default=None,
+                        help='Run query groups in waves and stop once key fields are found')
+    parser.add_argument('--batch-output', help='JSONL file to append batch results to (default: stdout)')
+    parser.add_argument('--checkpoint', help='SQLite checkpoint file; an interrupted run resumes from it')
+    parser.add_argument('--result-store', help='SQLite search result store shared by runs (default: RESULT_STORE_BACKEND)')
+    parser.add_argument('--max-companies', type=int, default=int(os.getenv('BATCH_MAX_CONCURRENT_COMPANIES', '4')),
+                        help='Companies screened concurrently in batch mode (default: 4)')
+    parser.add_argument('--company-timeout', type=float, default=float(os.getenv('BATCH_COMPANY_TIMEOUT', '300')),
+                        help='Per-company timeout in seconds for batch mode (default: 300)')
     
     args = parser.parse_args()
     
     if args.verbose:
         logging.getLogger().setLevel(logging.DEBUG)
     
+    if args.import_profile:
+        from cold_start_profile import profile_imports, format_import_report
+        print(format_import_report(profile_imports(args.import_profile), args.import_profile))
+        return
+    
     try:
         # Initialize optimized searcher
-        searcher = OptimizedCompanySearcher()
+        searcher = OptimizedCompanySearcher(
+            max_concurrent_searches=args.max_concurrency,
+            early_termination=args.early_termination,
+            checkpoint_store=CheckpointStore(args.checkpoint) if args.checkpoint else None,
+            result_store=(SearchResultStore(args.result_store,
+                                            max_age_seconds=OptimizedCompanySearcher._result_store_max_age())
+                          if args.result_store else None)
+        )
+        
+        if args.batch:
+            from batch_screening import run_batch_file
+            
+            try:
+                await run_batch_file(
+                    searcher, args.batch, args.batch_output,
+                    max_concurrent_companies=args.max_companies,
+                    company_timeout=args.company_timeout
+                )
+            finally:
+                await searcher.close()
+            return
         
         # Perform optimized search
         print(f"🔍 Performing optimized search for: {args.company}")
@@ -844,11 +1765,19 @@ async def main():
         print(f"  Sources Found: {len(company_info.sources)}")
         print(f"  Confidence Level: {company_info.confidence_level or 'Not assessed'}")
         
+        cache_stats = searcher.get_cache_stats()
+        if 'serper' in cache_stats:
+            print(f"  Search Cache: {cache_stats['serper']['hits']} hits / {cache_stats['serper']['misses']} misses")
+        if 'llm' in cache_stats:
+            print(f"  LLM Cache: {cache_stats['llm']['hits']} hits / {cache_stats['llm']['misses']} misses")
+        
         if output_file:
             print(f"\n💾 Complete results saved to: {output_file}")
         
         print(f"⏰ Search completed at: {company_info.last_updated}")
         
+        await searcher.close()
+        
     except KeyboardInterrupt:
         print("\n❌ Search interrupted by user")
     except Exception as e:
@@ -0,0 +1,310 @@
+#!/usr/bin/env python3
+"""
+Declarative Query Plan Registry
+
+This module holds every search query template together with the metadata the
+searcher needs to plan a run, replacing the old index-based num_results bands:
+- category: cache/TTL category (sec, linkedin, news, default)
+- priority: planner wave (1 always runs, later waves fill missing fields)
+- num_results: SERPER result count
+- target_fields: CompanyInfo fields the query is expected to fill
+- cost_weight: relative SERPER credit cost (queries over 10 results cost 2 credits)
+
+build_query_plan() turns the registry into concrete queries for a company,
+optionally trimmed to a budget (max queries, results, cost or latency).
+"""
+
+import math
+from dataclasses import dataclass, field
+from typing import Callable, Dict, FrozenSet, Iterable, List, Optional
+
+@dataclass(frozen=True)
+class QueryTemplate:
+    """Search query template with planning metadata"""
+    template_id: str
+    template: str
+    group: str
+    category: str
+    priority: int
+    num_results: int
+    target_fields: FrozenSet[str]
+    cost_weight: float
+    condition: Optional[Callable[[str], bool]] = None
+
+    def applies_to(self, company_name: str) -> bool:
+        return self.condition is None or self.condition(company_name)
+
+    def render(self, company_name: str) -> str:
+        return self.template.format(company=company_name)
+
+@dataclass(frozen=True)
+class PlannedQuery:
+    """Concrete query for one company"""
+    query_id: str
+    query: str
+    group: str
+    category: str
+    priority: int
+    num_results: int
+    target_fields: FrozenSet[str]
+    cost_weight: float
+
+@dataclass
+class QueryBudget:
+    """Limits applied when building a plan (None means unlimited)"""
+    max_queries: Optional[int] = None
+    max_results: Optional[int] = None
+    max_cost: Optional[float] = None
+    max_latency: Optional[float] = None     # seconds of search wall-clock time
+    concurrency: int = 5                    # searches in flight, for latency estimates
+    latency_per_query: float = 1.0          # seconds per search, for latency estimates
+
+    def estimate_latency(self, query_count: int) -> float:
+        return math.ceil(query_count / max(1, self.concurrency)) * self.latency_per_query
+
+@dataclass
+class QueryPlan:
+    """Ordered queries selected for one company"""
+    company_name: str
+    queries: List[PlannedQuery] = field(default_factory=list)
+    skipped: List[PlannedQuery] = field(default_factory=list)
+
+    @property
+    def total_results(self) -> int:
+        return sum(query.num_results for query in self.queries)
+
+    @property
+    def total_cost(self) -> float:
+        return sum(query.cost_weight for query in self.queries)
+
+    def waves(self) -> List[List[PlannedQuery]]:
+        """Queries grouped by priority, lowest priority number first"""
+        by_priority: Dict[int, List[PlannedQuery]] = {}
+        for query in self.queries:
+            by_priority.setdefault(query.priority, []).append(query)
+        return [by_priority[priority] for priority in sorted(by_priority)]
+
+def _cost_for(num_results: int) -> float:
+    # SERPER charges one credit for up to 10 results and two credits beyond that
+    return 2.0 if num_results > 10 else 1.0
+
+def _group(group: str, category: str, priority: int, num_results: int,
+           target_fields: Iterable[str], templates: List[str],
+           condition: Optional[Callable[[str], bool]] = None) -> List[QueryTemplate]:
+    """Stamp shared metadata onto a family of templates"""
+    return [
+        QueryTemplate(
+            template_id=f"{group}:{index}",
+            template=template,
+            group=group,
+            category=category,
+            priority=priority,
+            num_results=num_results,
+            target_fields=frozenset(target_fields),
+            cost_weight=_cost_for(num_results),
+            condition=condition
+        )
+        for index, template in enumerate(templates)
+    ]
+
+def _lacks_entity_suffix(company_name: str) -> bool:
+    return "Inc" not in company_name and "Corp" not in company_name
+
+# Registry order is the order queries are sent and their results are merged
+QUERY_TEMPLATES: List[QueryTemplate] = (
+    # COMPANY-SPECIFIC core queries (exclude people, products, other entities)
+    _group('core', 'default', 1, 12,
+           ['legal_name', 'description', 'industry', 'headquarters', 'founded_year', 'cik'], [
+        '"{company}" company corporation Wikipedia',
+        'site:wikipedia.org "{company}" company corporation',
+        '"{company}" company SEC 10-K Edgar',
+        'site:sec.gov "{company}" corporation 10-K',
+        '"{company}" business entity company profile',
+        '"{company}" corporation headquarters address'
+    ]) +
+    # EXCLUSION-ENHANCED queries to filter out people, products, places (HIGH PRIORITY)
+    _group('exclusion', 'default', 1, 15, ['description', 'headquarters'], [
+        '"{company}" company business -person -individual -biography',
+        '"{company}" corporation entity -product -service -location',
+        '"{company}" business headquarters -celebrity -athlete -politician',
+        '"{company}" company profile -personal -individual -biography'
+    ]) +
+    # COMPANY-SPECIFIC registration queries (Tesla: 001-34756, Walmart: 001-06991)
+    _group('registration', 'sec', 1, 15,
+           ['registration_number', 'cik', 'jurisdiction', 'incorporation_date'], [
+        '"{company}" corporation "Commission File Number" SEC',
+        '"{company}" company SEC filing "001-" registration',
+        'site:sec.gov "{company}" corporation "Commission File Number"',
+        '"{company}" company EDGAR "File Number" incorporation',
+        'site:edgar.sec.gov "{company}" corporation incorporation',
+        '"{company}" company SEC 10-K "state of incorporation"',
+        '"{company}" corporation annual report incorporation details',
+        '"{company}" company proxy statement incorporation'
+    ]) +
+    # COMPANY-SPECIFIC SEC FORM 10-K searches for non-listed companies
+    _group('form_10k', 'sec', 2, 15,
+           ['cik', 'registration_number', 'jurisdiction', 'regulatory_filings'], [
+        'site:sec.gov "{company}" corporation "FORM 10-K"',
+        '"{company}" company "FORM 10-K" SEC filing',
+        'site:edgar.sec.gov "{company}" corporation "FORM 10-K"',
+        '"{company}" company "FORM 10-K" incorporation details',
+        '"{company}" corporation "FORM 10-K" registration number',
+        'site:sec.gov "{company}" corporation "FORM 10-K" Delaware',
+        '"{company}" company "FORM 10-K" "state of incorporation"',
+        '"{company}" corporation "FORM 10-K" "Commission File Number"'
+    ]) +
+    # Enhanced SEC FORM 20-F searches for foreign companies (only needed while jurisdiction is unknown)
+    _group('form_20f', 'sec', 2, 15, ['jurisdiction'], [
+        'site:sec.gov "{company}" "FORM 20-F"',
+        '"{company}" "FORM 20-F" SEC filing',
+        'site:edgar.sec.gov "{company}" "FORM 20-F"',
+        '"{company}" "FORM 20-F" annual report',
+        '"{company}" "FORM 20-F" foreign company',
+        'site:sec.gov "{company}" "FORM 20-F" incorporation',
+        '"{company}" "FORM 20-F" "Commission File Number"',
+        '"{company}" "FORM 20-F" jurisdiction country'
+    ]) +
+    # Enhanced SEC FORM 8-K searches for current events and material changes
+    _group('form_8k', 'sec', 2, 12, ['regulatory_filings', 'key_executives'], [
+        'site:sec.gov "{company}" "FORM 8-K"',
+        '"{company}" "FORM 8-K" SEC filing',
+        'site:edgar.sec.gov "{company}" "FORM 8-K"',
+        '"{company}" "FORM 8-K" current report',
+        '"{company}" "FORM 8-K" executive changes',
+        'site:sec.gov "{company}" "FORM 8-K" material events',
+        '"{company}" "FORM 8-K" "Commission File Number"',
+        '"{company}" "FORM 8-K" corporate governance'
+    ]) +
+    # Enhanced SEC Proxy Statement (DEF 14A) searches for governance and executive data
+    _group('proxy_def14a', 'sec', 2, 12, ['key_executives'], [
+        'site:sec.gov "{company}" "DEF 14A"',
+        '"{company}" "DEF 14A" SEC filing',
+        'site:edgar.sec.gov "{company}" "DEF 14A"',
+        '"{company}" "Proxy Statement" SEC',
+        '"{company}" "DEF 14A" executive compensation',
+        'site:sec.gov "{company}" "Proxy Statement" executives',
+        '"{company}" "DEF 14A" board of directors',
+        '"{company}" "Proxy Statement" corporate governance'
+    ]) +
+    # REMOVED: Crunchbase and PitchBook queries (0% success rate, wasting ~36 seconds)
+    # These platforms block search engine indexing or require authentication
+    # Executive data is successfully extracted from SEC filings, Wikipedia, and pattern matching
+    #
+    # AGGRESSIVE LINKEDIN SEARCHES - Company-specific for current executive information (MODERATE PRIORITY)
+    _group('linkedin', 'linkedin', 3, 15, ['key_executives'], [
+        'site:linkedin.com "{company}" company CEO',
+        'site:linkedin.com "{company}" corporation CFO',
+        'site:linkedin.com "{company}" company CTO',
+        'site:linkedin.com "{company}" company executives',
+        'site:linkedin.com "{company}" corporation leadership team',
+        'site:linkedin.com "{company}" company management',
+        'site:linkedin.com/company "{company}"',
+        'site:linkedin.com "{company}" corporation board members',
+        'site:linkedin.com "{company}" company senior management',
+        'site:linkedin.com "{company}" business C-suite',
+        '"{company}" company linkedin CEO profile',
+        '"{company}" corporation linkedin CFO executive',
+        '"{company}" business linkedin company executives',
+        '"{company}" company linkedin leadership team',
+        '"{company}" corporation linkedin management profiles'
+    ]) +
+    # Proven identifier extraction queries
+    _group('identifier', 'default', 1, 10, ['identifiers', 'cik'], [
+        '"{company}" LEI identifier',
+        '"{company}" DUNS number',
+        '"{company}" EIN tax ID',
+        '"{company}" CIK SEC number',
+        '"{company}" CUSIP identifier'
+    ]) +
+    # COMPANY-SPECIFIC executive and financial data queries
+    _group('corporate', 'news', 1, 8,
+           ['key_executives', 'annual_revenue', 'market_cap', 'employees', 'headquarters', 'subsidiaries'], [
+        '"{company}" company CEO CFO executives 2024',
+        'site:sec.gov "{company}" corporation executive officers',
+        '"{company}" company annual revenue 2024 2023',
+        '"{company}" corporation market cap employees',
+        '"{company}" company headquarters address',
+        '"{company}" corporation subsidiaries companies'
+    ]) +
+    # COMPANY-SPECIFIC enhanced data source queries
+    _group('source', 'news', 2, 8, ['headquarters', 'stock_symbol', 'market_cap'], [
+        'site:bloomberg.com "{company}" company profile',
+        'site:reuters.com "{company}" corporation company',
+        'site:yahoo.com "{company}" company profile',
+        'site:opencorporates.com "{company}" corporation'
+    ]) +
+    # COMPANY-SPECIFIC business information queries
+    _group('business', 'default', 1, 8,
+           ['products_services', 'industry', 'business_type', 'website', 'founded_year'], [
+        '"{company}" company products services business',
+        '"{company}" corporation industry sector business type',
+        '"{company}" company corporate website official',
+        '"{company}" corporation founded established history'
+    ]) +
+    # COMPANY-SPECIFIC name variation queries with business entity suffixes
+    _group('variations', 'default', 2, 8, ['cik', 'registration_number'], [
+        '"{company} Inc" company SEC filings',
+        '"{company} Corporation" company Wikipedia',
+        '"{company} Corp" company information',
+        '"{company} LLC" business entity',
+        '"{company} Ltd" corporation company'
+    ], condition=_lacks_entity_suffix)
+)
+
+def build_query_plan(company_name: str, budget: Optional[QueryBudget] = None,
+                     templates: Optional[List[QueryTemplate]] = None) -> QueryPlan:
+    """
+    Build the query plan for a company
+
+    Queries are admitted in priority order (registry order within a priority)
+    until the budget is exhausted, then emitted in registry order so result
+    merging stays stable regardless of the budget.
+
+    Args:
+        company_name: Company to research
+        budget: Optional limits on queries, results, cost and estimated latency
+        templates: Template registry (default: QUERY_TEMPLATES)
+    """
+    templates = QUERY_TEMPLATES if templates is None else templates
+    applicable = [template for template in templates if template.applies_to(company_name)]
+
+    selected_ids = set()
+    skipped = []
+    query_count = 0
+    result_count = 0
+    cost = 0.0
+
+    for template in sorted(applicable, key=lambda t: t.priority):
+        if budget:
+            within_budget = (
+                (budget.max_queries is None or query_count + 1 <= budget.max_queries) and
+                (budget.max_results is None or result_count + template.num_results <= budget.max_results) and
+                (budget.max_cost is None or cost + template.cost_weight <= budget.max_cost) and
+                (budget.max_latency is None or budget.estimate_latency(query_count + 1) <= budget.max_latency)
+            )
+            if not within_budget:
+                skipped.append(template)
+                continue
+
+        selected_ids.add(template.template_id)
+        query_count += 1
+        result_count += template.num_results
+        cost += template.cost_weight
+
+    def plan_query(template: QueryTemplate) -> PlannedQuery:
+        return PlannedQuery(
+            query_id=template.template_id,
+            query=template.render(company_name),
+            group=template.group,
+            category=template.category,
+            priority=template.priority,
+            num_results=template.num_results,
+            target_fields=template.target_fields,
+            cost_weight=template.cost_weight
+        )
+
+    return QueryPlan(
+        company_name=company_name,
+        queries=[plan_query(t) for t in applicable if t.template_id in selected_ids],
+        skipped=[plan_query(t) for t in skipped]
+    )
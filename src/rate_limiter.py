@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+Token-Bucket Rate Limiter
+
+This module provides a rate limiter shared by every caller of an external API
+(SERPER search, SEC EDGAR) so the combined request rate stays at or below the
+paid quota, no matter how many companies or coroutines are running.
+
+- Works from threads and coroutines (sync acquire() and async acquire_async())
+- Optional file backend shares one budget across processes on the same host
+- penalize() pauses all callers after a 429 / Retry-After response
+
+The bucket is tracked as a single "theoretical arrival time" (GCRA), which is
+equivalent to a token bucket of size `burst` refilled at `rate` tokens/second
+but needs only one number of state - convenient for the file backend.
+"""
+
+import os
+import time
+import asyncio
+import threading
+import logging
+from typing import Dict, Optional
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None
+
+logger = logging.getLogger(__name__)
+
+class TokenBucketRateLimiter:
+    """In-process token bucket shared across threads and coroutines"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None):
+        if rate <= 0:
+            raise ValueError("Rate limit must be positive")
+        self.rate = float(rate)
+        self.burst = max(1, int(burst if burst is not None else rate))
+        self._interval = 1.0 / self.rate
+        self._tolerance = (self.burst - 1) * self._interval
+        self._tat = 0.0
+        self._lock = threading.Lock()
+
+    def _now(self) -> float:
+        return time.monotonic()
+
+    def _update_tat(self, update) -> float:
+        """Apply update(tat, now) -> (new_tat, result) atomically and return result"""
+        with self._lock:
+            self._tat, result = update(self._tat, self._now())
+            return result
+
+    def _reserve(self) -> float:
+        """Take one token, returning the seconds to wait before it may be used"""
+        def update(tat: float, now: float):
+            tat = max(tat, now)
+            ready = max(now, tat - self._tolerance)
+            return tat + self._interval, ready - now
+
+        return self._update_tat(update)
+
+    def acquire(self):
+        """Block the current thread until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            time.sleep(wait)
+
+    async def acquire_async(self):
+        """Wait without blocking the event loop until a request may be sent"""
+        wait = self._reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+    def penalize(self, delay: float):
+        """Hold back every caller for `delay` seconds (e.g. after HTTP 429)"""
+        def update(tat: float, now: float):
+            return max(tat, now + delay + self._tolerance), None
+
+        self._update_tat(update)
+        logger.info(f"Rate limiter paused for {delay:.1f}s")
+
+class FileTokenBucketRateLimiter(TokenBucketRateLimiter):
+    """Token bucket whose state lives in a locked local file, shared across processes"""
+
+    def __init__(self, rate: float, burst: Optional[int] = None, path: str = '/tmp/serper_rate_limit.state'):
+        if fcntl is None:
+            raise RuntimeError("File-backed rate limiting requires fcntl (POSIX only)")
+        super().__init__(rate, burst)
+        self.path = path
+
+    def _now(self) -> float:
+        # Wall clock so every process measures time the same way
+        return time.time()
+
+    def _update_tat(self, update) -> float:
+        with self._lock:
+            fd = os.open(self.path, os.O_RDWR | os.O_CREAT, 0o644)
+            try:
+                fcntl.flock(fd, fcntl.LOCK_EX)
+                raw = os.read(fd, 64).strip()
+                try:
+                    tat = float(raw) if raw else 0.0
+                except ValueError:
+                    tat = 0.0
+
+                new_tat, result = update(tat, self._now())
+
+                os.lseek(fd, 0, os.SEEK_SET)
+                os.ftruncate(fd, 0)
+                os.write(fd, repr(new_tat).encode('ascii'))
+                return result
+            finally:
+                fcntl.flock(fd, fcntl.LOCK_UN)
+                os.close(fd)
+
+_shared_limiters: Dict[str, TokenBucketRateLimiter] = {}
+_shared_limiters_lock = threading.Lock()
+
+def get_shared_rate_limiter(name: str, rate: float, burst: Optional[int] = None,
+                            path: Optional[str] = None) -> TokenBucketRateLimiter:
+    """
+    Get the process-wide rate limiter for an API, creating it on first use
+
+    Args:
+        name: API name (e.g. 'serper'); callers using the same name share one budget
+        rate: Requests per second
+        burst: Maximum requests sent back to back (default: rate)
+        path: Optional state file to share the budget across processes
+    """
+    with _shared_limiters_lock:
+        limiter = _shared_limiters.get(name)
+        if limiter is None:
+            if path:
+                limiter = FileTokenBucketRateLimiter(rate, burst, path=path)
+            else:
+                limiter = TokenBucketRateLimiter(rate, burst)
+            _shared_limiters[name] = limiter
+            logger.info(f"Rate limiter '{name}' initialized: {limiter.rate} req/s, burst {limiter.burst}")
+        return limiter
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Persistent Response Cache
+
+This module caches SERPER search responses and Bedrock analysis results so
+repeated screening runs do not pay for identical work again:
+- Content-addressed keys (normalized query + num + gl + hl, or prompt digest)
+- TTL per query category (SEC filings change slowly, news changes daily)
+- Size-bounded LRU eviction in memory or in a single SQLite file
+- Hit/miss counters to measure the savings
+"""
+
+import json
+import time
+import sqlite3
+import hashlib
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, asdict
+from typing import Any, Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+HOUR = 3600
+
+# Default time-to-live per query category (seconds)
+DEFAULT_CATEGORY_TTLS = {
+    'sec': 30 * 24 * HOUR,       # SEC filings / EDGAR data rarely change
+    'linkedin': 7 * 24 * HOUR,   # Executive profiles change occasionally
+    'news': 24 * HOUR,           # Financial and current-events results go stale quickly
+    'default': 7 * 24 * HOUR
+}
+
+SEC_QUERY_MARKERS = ['sec.gov', 'edgar', 'form 10-k', 'form 20-f', 'form 8-k', 'def 14a',
+                     'proxy statement', 'commission file number', 'cik', ' sec ']
+NEWS_QUERY_MARKERS = ['news', 'revenue', 'market cap', 'current report', 'ceo cfo', '2024', '2023',
+                      'bloomberg.com', 'reuters.com', 'yahoo.com']
+
+def normalize_query(query: str) -> str:
+    """Normalize a query so trivially different spellings share a cache entry"""
+    return ' '.join(query.lower().split())
+
+def classify_query(query: str) -> str:
+    """Assign a query to a cache category (sec, linkedin, news, default)"""
+    normalized = f" {normalize_query(query)} "
+    if 'linkedin' in normalized:
+        return 'linkedin'
+    if any(marker in normalized for marker in SEC_QUERY_MARKERS):
+        return 'sec'
+    if any(marker in normalized for marker in NEWS_QUERY_MARKERS):
+        return 'news'
+    return 'default'
+
+@dataclass
+class CacheStats:
+    """Cache effectiveness counters"""
+    hits: int = 0
+    misses: int = 0
+    writes: int = 0
+    evictions: int = 0
+
+    @property
+    def hit_rate(self) -> float:
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        stats = asdict(self)
+        stats['hit_rate'] = round(self.hit_rate, 3)
+        return stats
+
+class SQLiteCache:
+    """Size-bounded LRU cache with per-entry TTL, stored in a SQLite file"""
+
+    def __init__(self, path: str, max_entries: int = 50000, eviction_interval: int = 100):
+        self.path = path
+        self.max_entries = max_entries
+        self.eviction_interval = eviction_interval
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._writes_since_eviction = 0
+
+        self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+        self._conn.execute('PRAGMA journal_mode=WAL')
+        self._conn.execute('PRAGMA synchronous=NORMAL')
+        self._conn.execute(
+            'CREATE TABLE IF NOT EXISTS cache ('
+            'key TEXT PRIMARY KEY, value TEXT NOT NULL, '
+            'expires_at REAL NOT NULL, last_access REAL NOT NULL)'
+        )
+        self._conn.execute('CREATE INDEX IF NOT EXISTS idx_cache_last_access ON cache(last_access)')
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return cached value, or None when missing or expired"""
+        now = time.time()
+        with self._lock:
+            row = self._conn.execute(
+                'SELECT value, expires_at FROM cache WHERE key = ?', (key,)
+            ).fetchone()
+
+            if row is None:
+                self.stats.misses += 1
+                return None
+
+            value, expires_at = row
+            if expires_at <= now:
+                self._conn.execute('DELETE FROM cache WHERE key = ?', (key,))
+                self.stats.misses += 1
+                return None
+
+            self._conn.execute('UPDATE cache SET last_access = ? WHERE key = ?', (now, key))
+            self.stats.hits += 1
+
+        return json.loads(value)
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store value for ttl seconds"""
+        now = time.time()
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._conn.execute(
+                'INSERT OR REPLACE INTO cache (key, value, expires_at, last_access) VALUES (?, ?, ?, ?)',
+                (key, payload, now + ttl, now)
+            )
+            self.stats.writes += 1
+            self._writes_since_eviction += 1
+            if self._writes_since_eviction >= self.eviction_interval:
+                self._evict(now)
+
+    def _evict(self, now: float):
+        """Drop expired entries, then least-recently-used entries over max_entries"""
+        self._writes_since_eviction = 0
+        expired = self._conn.execute('DELETE FROM cache WHERE expires_at <= ?', (now,)).rowcount
+        count = self._conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
+        overflow = max(0, count - self.max_entries)
+        if overflow:
+            self._conn.execute(
+                'DELETE FROM cache WHERE key IN '
+                '(SELECT key FROM cache ORDER BY last_access ASC LIMIT ?)', (overflow,)
+            )
+        self.stats.evictions += expired + overflow
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute('DELETE FROM cache')
+
+    def close(self):
+        with self._lock:
+            self._conn.close()
+
+class MemoryLRUCache:
+    """Size-bounded in-process LRU cache with per-entry TTL"""
+
+    def __init__(self, max_entries: int = 1000):
+        self.max_entries = max_entries
+        self.stats = CacheStats()
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return cached value, or None when missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None or entry[1] <= time.time():
+                if entry is not None:
+                    del self._entries[key]
+                self.stats.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.stats.hits += 1
+            return json.loads(entry[0])
+
+    def set(self, key: str, value: Any, ttl: float):
+        """Store value for ttl seconds"""
+        # Stored serialized so callers can never mutate a cached value in place
+        payload = json.dumps(value, ensure_ascii=False)
+        with self._lock:
+            self._entries[key] = (payload, time.time() + ttl)
+            self._entries.move_to_end(key)
+            self.stats.writes += 1
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.stats.evictions += 1
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def close(self):
+        self.clear()
+
+class SearchResponseCache:
+    """Cache of SERPER responses keyed by normalized query and search parameters"""
+
+    def __init__(self, backend: SQLiteCache, ttl_by_category: Optional[Dict[str, float]] = None):
+        self.backend = backend
+        self.ttl_by_category = dict(DEFAULT_CATEGORY_TTLS)
+        if ttl_by_category:
+            self.ttl_by_category.update(ttl_by_category)
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.backend.stats
+
+    def make_key(self, payload: Dict[str, Any]) -> str:
+        """Content-addressed key from the SERPER request payload"""
+        key_material = json.dumps([
+            normalize_query(payload.get('q', '')),
+            payload.get('num'),
+            payload.get('gl'),
+            payload.get('hl')
+        ])
+        return hashlib.sha256(key_material.encode('utf-8')).hexdigest()
+
+    def get(self, payload: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+        return self.backend.get(self.make_key(payload))
+
+    def set(self, payload: Dict[str, Any], response: Dict[str, Any], category: Optional[str] = None):
+        """Store a successful response using its category TTL"""
+        if 'error' in response:
+            return
+        category = category or classify_query(payload.get('q', ''))
+        ttl = self.ttl_by_category.get(category, self.ttl_by_category['default'])
+        self.backend.set(self.make_key(payload), response, ttl)
+
+class LLMResultCache:
+    """Cache of parsed LLM analysis results keyed by model, inference config and prompt"""
+
+    def __init__(self, backend, ttl: float = 7 * 24 * HOUR):
+        self.backend = backend
+        self.ttl = ttl
+
+    @property
+    def stats(self) -> CacheStats:
+        return self.backend.stats
+
+    def make_key(self, model_id: str, inference_config: Dict[str, Any], prompt: str) -> str:
+        """Digest of everything that determines the model output"""
+        digest = hashlib.sha256()
+        digest.update(model_id.encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(json.dumps(inference_config, sort_keys=True).encode('utf-8'))
+        digest.update(b'\0')
+        digest.update(prompt.encode('utf-8'))
+        return digest.hexdigest()
+
+    def get(self, model_id: str, inference_config: Dict[str, Any], prompt: str) -> Optional[Dict[str, Any]]:
+        return self.backend.get(self.make_key(model_id, inference_config, prompt))
+
+    def set(self, model_id: str, inference_config: Dict[str, Any], prompt: str, result: Dict[str, Any]):
+        """Store a successfully parsed result"""
+        if 'error' in result:
+            return
+        self.backend.set(self.make_key(model_id, inference_config, prompt), result, self.ttl)
@@ -0,0 +1,181 @@
+#!/usr/bin/env python3
+"""
+Search Result Deduplication
+
+This module collapses duplicate search results before extraction and prompting:
+- Links are compared in canonical form: https, no `www.`/mobile host labels,
+  LinkedIn country mirrors folded into linkedin.com, tracking parameters
+  (utm_*, gclid, ...) and fragments dropped, remaining parameters sorted, and
+  EDGAR inline viewer links (`/ix?doc=...`) mapped to the document itself
+- Near-duplicates (syndicated news, copied profiles) are found on the word
+  bigrams of title and snippet: a 16-value MinHash signature (the values are
+  32-bit slices of one blake2b digest per bigram) in 8 bands of 2 finds
+  candidate pairs (a pair with 70% bigram overlap shares a band with >99%
+  probability), which are confirmed by their exact Jaccard similarity.
+  Snippets are too short for SimHash, whose bit distance is noisy at a few
+  dozen words. Only results from different sites that mention the same
+  numbers are collapsed, so filings or figures for different years stay apart
+- Of each group of duplicates the most authoritative copy is kept, at the
+  position of the first one
+"""
+
+import re
+import struct
+import hashlib
+import logging
+from functools import lru_cache
+from typing import Dict, FrozenSet, List, Optional
+from urllib.parse import urlsplit, parse_qsl, urlencode, unquote
+
+from context_selector import source_authority
+
+logger = logging.getLogger(__name__)
+
+MINHASH_VALUES = 16          # 32-bit hash values per signature: one 64-byte blake2b digest
+BANDS = 8
+ROWS_PER_BAND = MINHASH_VALUES // BANDS
+_DIGEST = struct.Struct(f'>{MINHASH_VALUES}I')
+
+# Query parameters that only track the click, never select content
+TRACKING_PARAMS = {'gclid', 'fbclid', 'msclkid', 'dclid', 'yclid', 'mc_cid', 'mc_eid', 'igshid',
+                   'ref', 'ref_src', 'ref_url', 'trk', 'trkinfo', 'originalsubdomain', 'cmpid',
+                   'srsltid', '_ga', '_gl'}
+TRACKING_PREFIXES = ('utm_',)
+
+# Host labels for the same site's mobile or www variant
+ALIAS_LABELS = {'www', 'm', 'mobile'}
+
+# Sites whose country subdomains mirror the same pages
+MIRRORED_SITES = ('linkedin.com',)
+
+WORD = re.compile(r'[a-z0-9]+')
+NUMBER = re.compile(r'\d[\d,.]*\d|\d')
+
+def canonical_url(url: str) -> str:
+    """Comparable form of a result link (not meant to be fetched)"""
+    try:
+        parts = urlsplit(url.strip())
+    except ValueError:
+        return url.strip()
+    if not parts.netloc:
+        return url.strip()
+
+    host = parts.hostname or ''
+    labels = host.split('.')
+    if len(labels) > 2:
+        labels = [label for i, label in enumerate(labels) if i == len(labels) - 2 or label not in ALIAS_LABELS]
+    host = '.'.join(labels)
+    for site in MIRRORED_SITES:
+        if host.endswith('.' + site):
+            host = site
+    if parts.port and parts.port not in (80, 443):
+        host = f"{host}:{parts.port}"
+
+    path = parts.path or '/'
+    params = parse_qsl(parts.query, keep_blank_values=True)
+    if host == 'sec.gov' and path.rstrip('/') == '/ix':
+        # Inline XBRL viewer: https://www.sec.gov/ix?doc=/Archives/edgar/data/...
+        doc = dict(params).get('doc')
+        if doc:
+            path, params = unquote(doc), []
+    if len(path) > 1:
+        path = path.rstrip('/')
+
+    params = sorted((key, value) for key, value in params
+                    if key.lower() not in TRACKING_PARAMS and not key.lower().startswith(TRACKING_PREFIXES))
+    query = f"?{urlencode(params)}" if params else ''
+    return f"https://{host}{path}{query}"
+
+def shingles(text_lower: str) -> FrozenSet[str]:
+    """Word bigrams of the text (the words themselves for a single word)"""
+    words = WORD.findall(text_lower)
+    return frozenset(f"{a} {b}" for a, b in zip(words, words[1:])) or frozenset(words)
+
+@lru_cache(maxsize=65536)
+def _feature_hashes(feature: str) -> tuple:
+    return _DIGEST.unpack(hashlib.blake2b(feature.encode('utf-8'), digest_size=_DIGEST.size).digest())
+
+def minhash(features: FrozenSet[str]) -> List[int]:
+    """MinHash signature of a non-empty feature set (minimum of each hash value)"""
+    return [min(column) for column in zip(*(_feature_hashes(feature) for feature in features))]
+
+def jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    return len(a & b) / len(a | b) if a or b else 0.0
+
+class ResultDeduplicator:
+    """Removes repeated and near-duplicate search results, keeping the most authoritative copy"""
+
+    def __init__(self, min_similarity: float = 0.7, min_words: int = 8):
+        self.min_similarity = min_similarity
+        # Shorter texts overlap by chance; they are only deduplicated by link
+        self.min_words = min_words
+
+    def dedupe(self, search_results: List[Dict]) -> List[Dict]:
+        """Unique results in first-seen order (results without a link are dropped)"""
+        kept: List[Dict] = []
+        entries: List[Optional[Dict]] = []   # per kept result: shingles, site and numbers (None if short)
+        by_url: Dict[str, int] = {}
+        buckets: Dict[tuple, List[int]] = {}
+        url_duplicates = near_duplicates = 0
+
+        for result in search_results:
+            link = result.get('link', '')
+            if not link:
+                continue
+            url = canonical_url(link)
+            if url in by_url:
+                url_duplicates += 1
+                continue
+
+            text = f"{result.get('title', '')} {result.get('snippet', '')}".lower()
+            features = shingles(text)
+            entry = None
+            if len(features) >= self.min_words - 1:
+                signature = minhash(features)
+                entry = {
+                    'shingles': features,
+                    'site': url.split('/', 3)[2] if url.startswith('https://') else '',
+                    'numbers': frozenset(NUMBER.findall(text)),
+                    'bands': [(band, tuple(signature[band * ROWS_PER_BAND:(band + 1) * ROWS_PER_BAND]))
+                              for band in range(BANDS)],
+                }
+                match = self._find_near_duplicate(entry, entries, buckets)
+                if match is not None:
+                    near_duplicates += 1
+                    by_url[url] = match
+                    if source_authority(link) > source_authority(kept[match].get('link', '')):
+                        # Later results are compared with the copy that is kept
+                        kept[match] = result
+                        entries[match] = entry
+                        for band in entry['bands']:
+                            bucket = buckets.setdefault(band, [])
+                            if match not in bucket:
+                                bucket.append(match)
+                    continue
+
+            index = len(kept)
+            kept.append(result)
+            entries.append(entry)
+            by_url[url] = index
+            if entry is not None:
+                for band in entry['bands']:
+                    buckets.setdefault(band, []).append(index)
+
+        if url_duplicates or near_duplicates:
+            logger.debug(f"Dedup: {len(search_results)} results -> {len(kept)} "
+                         f"({url_duplicates} same link, {near_duplicates} near-duplicates)")
+        return kept
+
+    def _find_near_duplicate(self, entry: Dict, entries: List[Optional[Dict]],
+                             buckets: Dict[tuple, List[int]]) -> Optional[int]:
+        checked = set()
+        for band in entry['bands']:
+            for index in buckets.get(band, ()):
+                if index in checked:
+                    continue
+                checked.add(index)
+                other = entries[index]
+                if (other['site'] != entry['site'] and other['numbers'] == entry['numbers']
+                        and jaccard(other['shingles'], entry['shingles']) >= self.min_similarity):
+                    return index
+        return None
@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Shared Search Result Store
+
+This module keeps the search results seen by every screening in one place, so
+results found for one company can be reused by the next:
+- Results are indexed by canonical URL (result_dedup.canonical_url); titles,
+  snippets and sources (sites) are interned, as syndicated copies and
+  overlapping queries repeat them
+- A reverse index maps each company (normalized name, so "Apple" and "Apple Inc"
+  share an entry) to its result IDs, and related companies (parent,
+  subsidiaries, former names) are linked to each other
+- seed_results() joins a company's earlier results with related companies'
+  results that mention it, without searching again; results no search has
+  returned within max_age_seconds are left out, so re-screens see fresh data
+- The in-process tier holds the most recently used companies; with a path,
+  everything is also written to a SQLite file and loaded per company on demand,
+  so other processes and later runs share the store
+"""
+
+import sys
+import time
+import sqlite3
+import threading
+import logging
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from company_names import normalize_name, mentions_name
+from result_dedup import canonical_url
+
+logger = logging.getLogger(__name__)
+
+class SearchResultStore:
+    """Search results by canonical URL, with a company -> result IDs reverse index"""
+
+    def __init__(self, path: Optional[str] = None, max_companies: int = 1000,
+                 max_age_seconds: Optional[float] = None):
+        self.path = path
+        self.max_companies = max(1, max_companies)
+        self.max_age_seconds = max_age_seconds
+        self._lock = threading.Lock()
+        self._ids: Dict[str, int] = {}                                # canonical URL -> result ID
+        self._results: Dict[int, Tuple[str, str, str, str]] = {}      # ID -> (title, snippet, link, source)
+        self._refcounts: Dict[int, int] = {}                          # ID -> companies holding it in memory
+        self._last_seen: Dict[int, float] = {}                        # ID -> time a search last returned it
+        self._companies: 'OrderedDict[str, Set[int]]' = OrderedDict() # company key -> result IDs (LRU order)
+        self._related: Dict[str, Set[str]] = {}
+        self._next_id = 1
+        self._conn = None
+        if path:
+            self._conn = sqlite3.connect(path, check_same_thread=False, isolation_level=None)
+            self._conn.execute('PRAGMA journal_mode=WAL')
+            self._conn.execute('PRAGMA synchronous=NORMAL')
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS results ('
+                'id INTEGER PRIMARY KEY, url TEXT UNIQUE NOT NULL, title TEXT NOT NULL, '
+                'snippet TEXT NOT NULL, link TEXT NOT NULL, source TEXT NOT NULL, first_seen REAL NOT NULL, '
+                'last_seen REAL NOT NULL)'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS company_results ('
+                'company_key TEXT NOT NULL, result_id INTEGER NOT NULL, '
+                'PRIMARY KEY (company_key, result_id)) WITHOUT ROWID'
+            )
+            self._conn.execute(
+                'CREATE TABLE IF NOT EXISTS related_companies ('
+                'company_key TEXT NOT NULL, related_key TEXT NOT NULL, '
+                'PRIMARY KEY (company_key, related_key)) WITHOUT ROWID'
+            )
+
+    @staticmethod
+    def _company_key(company_name: str) -> str:
+        return normalize_name(company_name)
+
+    def add(self, company_name: str, search_results: Iterable[Dict]) -> List[int]:
+        """Store results seen for a company; returns their IDs (existing URLs keep their first copy)"""
+        key = self._company_key(company_name)
+        now = time.time()
+        with self._lock:
+            result_ids = self._load_company(key)
+            added = []
+            if self._conn:
+                self._conn.execute('BEGIN')
+            try:
+                for result in search_results:
+                    link = result.get('link', '')
+                    if not link:
+                        continue
+                    result_id = self._store_result(canonical_url(link), result, now)
+                    added.append(result_id)
+                    if result_id not in result_ids:
+                        result_ids.add(result_id)
+                        self._refcounts[result_id] = self._refcounts.get(result_id, 0) + 1
+                        if self._conn:
+                            self._conn.execute('INSERT OR IGNORE INTO company_results (company_key, result_id) '
+                                               'VALUES (?, ?)', (key, result_id))
+            finally:
+                if self._conn:
+                    self._conn.execute('COMMIT')
+            self._evict()
+        return added
+
+    def _store_result(self, url: str, result: Dict, now: float) -> int:
+        result_id = self._ids.get(url)
+        if result_id is not None:
+            self._last_seen[result_id] = now
+            if self._conn:
+                self._conn.execute('UPDATE results SET last_seen = ? WHERE id = ?', (now, result_id))
+            return result_id
+
+        entry = (sys.intern(result.get('title', '')), sys.intern(result.get('snippet', '')),
+                 result.get('link', ''), sys.intern(url.split('/', 3)[2]))
+        if self._conn:
+            self._conn.execute(
+                'INSERT INTO results (url, title, snippet, link, source, first_seen, last_seen) '
+                'VALUES (?, ?, ?, ?, ?, ?, ?) ON CONFLICT (url) DO UPDATE SET last_seen = excluded.last_seen',
+                (url, *entry, now, now)
+            )
+            row = self._conn.execute('SELECT id, title, snippet, link, source FROM results WHERE url = ?',
+                                     (url,)).fetchone()
+            result_id = row[0]
+            entry = (sys.intern(row[1]), sys.intern(row[2]), row[3], sys.intern(row[4]))
+        else:
+            result_id = self._next_id
+            self._next_id += 1
+        self._ids[url] = result_id
+        self._results[result_id] = entry
+        self._last_seen[result_id] = now
+        return result_id
+
+    def link_related(self, company_name: str, related_names: Iterable[str]):
+        """Record related companies (parent, subsidiaries, former names), in both directions"""
+        key = self._company_key(company_name)
+        pairs = set()
+        for name in related_names:
+            related_key = self._company_key(name) if name else ''
+            if related_key and related_key != key:
+                pairs.update({(key, related_key), (related_key, key)})
+        if not pairs:
+            return
+        with self._lock:
+            for company_key, related_key in pairs:
+                self._related.setdefault(company_key, set()).add(related_key)
+            if self._conn:
+                self._conn.executemany('INSERT OR IGNORE INTO related_companies (company_key, related_key) '
+                                       'VALUES (?, ?)', sorted(pairs))
+
+    def related_companies(self, company_name: str) -> Set[str]:
+        """Keys of the companies linked to company_name"""
+        key = self._company_key(company_name)
+        with self._lock:
+            return set(self._load_related(key))
+
+    def company_result_ids(self, company_name: str) -> Set[int]:
+        key = self._company_key(company_name)
+        with self._lock:
+            return set(self._load_company(key))
+
+    def results_for(self, company_name: str) -> List[Dict]:
+        """Results stored for the company (or another name normalizing to the same key)"""
+        key = self._company_key(company_name)
+        with self._lock:
+            result_ids = sorted(self._load_company(key))
+            return [self._as_result(result_id) for result_id in result_ids]
+
+    def seed_results(self, company_name: str) -> List[Dict]:
+        """
+        Results a new screening can start from: the company's own, then results of
+        related companies that mention it by name, as whole words (only those a search returned within
+        max_age_seconds)
+        """
+        key = self._company_key(company_name)
+        oldest = None if self.max_age_seconds is None else time.time() - self.max_age_seconds
+        with self._lock:
+            own = self._load_company(key)
+            seen = set(own)
+            if oldest is not None:
+                own = {result_id for result_id in own if self._last_seen[result_id] >= oldest}
+            seeded = [self._as_result(result_id) for result_id in sorted(own)]
+            for related_key in sorted(self._load_related(key)):
+                for result_id in sorted(self._load_company(related_key) - seen):
+                    if oldest is not None and self._last_seen[result_id] < oldest:
+                        continue
+                    title, snippet, link, _ = self._results[result_id]
+                    if mentions_name(f"{title} {snippet}", key):
+                        seeded.append(self._as_result(result_id))
+                        seen.add(result_id)
+            self._evict()
+        return seeded
+
+    def stats(self) -> Dict[str, Any]:
+        """Sizes of the in-process tier, and results shared by several companies"""
+        with self._lock:
+            shared = sum(1 for count in self._refcounts.values() if count > 1)
+            return {
+                'results': len(self._results),
+                'companies': len(self._companies),
+                'shared_results': shared,
+                'company_links': sum(len(result_ids) for result_ids in self._companies.values()),
+            }
+
+    def close(self):
+        if self._conn:
+            self._conn.close()
+            self._conn = None
+
+    def _as_result(self, result_id: int) -> Dict[str, str]:
+        title, snippet, link, _ = self._results[result_id]
+        return {'title': title, 'snippet': snippet, 'link': link}
+
+    def _load_company(self, key: str) -> Set[int]:
+        """Result IDs of a company, loaded from disk on first use (caller holds the lock)"""
+        result_ids = self._companies.get(key)
+        if result_ids is not None:
+            self._companies.move_to_end(key)
+            return result_ids
+
+        result_ids = set()
+        if self._conn:
+            rows = self._conn.execute(
+                'SELECT r.id, r.url, r.title, r.snippet, r.link, r.source, r.last_seen FROM company_results c '
+                'JOIN results r ON r.id = c.result_id WHERE c.company_key = ?', (key,)
+            ).fetchall()
+            for result_id, url, title, snippet, link, source, last_seen in rows:
+                if result_id not in self._results:
+                    self._ids[url] = result_id
+                    self._results[result_id] = (sys.intern(title), sys.intern(snippet), link, sys.intern(source))
+                    self._last_seen[result_id] = last_seen
+                result_ids.add(result_id)
+                self._refcounts[result_id] = self._refcounts.get(result_id, 0) + 1
+        self._companies[key] = result_ids
+        return result_ids
+
+    def _load_related(self, key: str) -> Set[str]:
+        related = self._related.get(key)
+        if related is None:
+            related = set()
+            if self._conn:
+                rows = self._conn.execute('SELECT related_key FROM related_companies WHERE company_key = ?',
+                                          (key,)).fetchall()
+                related = {row[0] for row in rows}
+            self._related[key] = related
+        return related
+
+    def _evict(self):
+        """Drop least recently used companies, and results no remaining company holds, from memory"""
+        while len(self._companies) > self.max_companies:
+            _, result_ids = self._companies.popitem(last=False)
+            for result_id in result_ids:
+                self._refcounts[result_id] -= 1
+                if self._refcounts[result_id] == 0:
+                    del self._refcounts[result_id]
+                    self._last_seen.pop(result_id, None)
+                    title, snippet, link, source = self._results.pop(result_id)
+                    self._ids.pop(canonical_url(link), None)
@@ -11,14 +11,78 @@ instead of making separate API calls to SEC databases. This approach is:
 
 import re
 import logging
-from typing import Dict, List, Optional, Tuple
+from typing import Dict, List, NamedTuple, Optional, Pattern, Set, Tuple
 from urllib.parse import urlparse
 
+from literal_matcher import LiteralMatcher
+
 logger = logging.getLogger(__name__)
 
+class PreparedResult(NamedTuple):
+    """A search result with its match texts built once"""
+    url: str
+    title: str
+    snippet: str
+    text: str          # "title snippet" - registration, URL and executive patterns
+    full_text: str     # "url title snippet" - CIK patterns
+    mask: int          # literal anchors present anywhere in full_text
+    text_mask: int     # literal anchors present in text
+
+def prepare_result(result: Dict, matcher: LiteralMatcher) -> PreparedResult:
+    url = result.get('link', '')
+    title = result.get('title', '')
+    snippet = result.get('snippet', '')
+    full_text = f"{url} {title} {snippet}"
+    mask, text_mask = matcher.scan_split(full_text.lower(), len(url) + 1)
+    return PreparedResult(url, title, snippet, f"{title} {snippet}", full_text, mask, text_mask)
+
+def compile_alternation(patterns: List[str], flags: int = 0) -> Tuple[Pattern, Dict[str, Tuple[int, int]]]:
+    """
+    Combine patterns into one regex of named alternatives (?P<p0>...)|(?P<p1>...)
+
+    Returns the compiled regex and, per alternative name, the pattern index and
+    the group holding its value (its first capture group, else the whole alternative),
+    mirroring what re.findall would return for the pattern on its own.
+    """
+    alternatives = []
+    value_groups = {}
+    group_index = 1
+    for index, pattern in enumerate(patterns):
+        name = f"p{index}"
+        inner_groups = re.compile(pattern, flags).groups
+        alternatives.append(f"(?P<{name}>{pattern})")
+        value_groups[name] = (index, group_index + 1 if inner_groups else group_index)
+        group_index += 1 + inner_groups
+    return re.compile('|'.join(alternatives), flags), value_groups
+
 class SearchBasedSECExtractor:
     """Extract SEC data directly from search results"""
     
+    # Extractor bits set by the literal prefilter
+    SEC_RELATED = 1 << 0
+    HAS_CIK = 1 << 1
+    HAS_REGISTRATION = 1 << 2
+    HAS_SEC_URL = 1 << 3
+    HAS_JURISDICTION = 1 << 4
+    HAS_HEADQUARTERS = 1 << 5
+    ROLE_BITS = {'CEO': 1 << 6, 'CFO': 1 << 7, 'CTO': 1 << 8, 'COO': 1 << 9}
+    # A single name is often a stray match - executives count as found from two on
+    MIN_EXECUTIVES = 2
+    
+    SEC_INDICATORS = [
+        'sec.gov',
+        'edgar.sec.gov',
+        'SEC filing',
+        'Form 10-K',
+        'Form 10-Q',
+        'Form 8-K',
+        'DEF 14A',
+        'Proxy Statement',
+        'Commission File Number',
+        'CIK',
+        'EDGAR'
+    ]
+    
     def __init__(self):
         # Patterns for extracting SEC data from search results
         self.cik_patterns = [
@@ -63,6 +127,120 @@ class SearchBasedSECExtractor:
             r'([A-Z][a-z]+ [A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)\s*[-–—]\s*(?:Chief Operating Officer|COO)',
             r'(?:Chief Operating Officer|COO)[:\s]*([A-Z][a-z]+ [A-Z][a-z]+(?:\s+[A-Z][a-z]+)?)',
         ]
+        
+        # Cheap presence checks used by the search planner (no values extracted)
+        self.jurisdiction_patterns = [
+            r'(?:incorporated|organized) (?:in|under the laws of) (?:the )?(?:State of )?[A-Z][a-z]+',
+            r'state (?:or other jurisdiction )?of incorporation',
+            r'(?:a|an) (?:Delaware|Nevada|California|New York) (?:corporation|company|limited liability company)',
+        ]
+        
+        self.headquarters_patterns = [
+            r'headquartered in [A-Z][a-z]+',
+            r'headquarters[:\s]+(?:is |are |located )?(?:in |at )?[A-Z0-9][a-z0-9]*',
+            r'principal executive offices',
+        ]
+        
+        # Literals at least one pattern of each extractor must contain (case-insensitive).
+        # A result without any of them skips that extractor's regexes entirely, so
+        # keep these in sync with the patterns above.
+        self.literal_anchors = {
+            self.HAS_CIK: ['cik', 'central index key', 'edgar/data/'],
+            self.HAS_REGISTRATION: ['-'],
+            self.HAS_SEC_URL: ['https://www.sec.gov/', 'https://edgar.sec.gov/'],
+            self.HAS_JURISDICTION: ['incorporated', 'organized', 'incorporation', 'corporation', 'company'],
+            self.HAS_HEADQUARTERS: ['headquartered in', 'headquarters', 'principal executive offices'],
+            self.ROLE_BITS['CEO']: ['ceo', 'chief executive officer'],
+            self.ROLE_BITS['CFO']: ['cfo', 'chief financial officer'],
+            self.ROLE_BITS['CTO']: ['cto', 'chief technology officer'],
+            self.ROLE_BITS['COO']: ['coo', 'chief operating officer'],
+        }
+        
+        self._compile_patterns()
+    
+    def _compile_patterns(self):
+        """Compile every pattern once; CIK, registration and URL patterns become one scan each"""
+        self._cik_scanner, self._cik_groups = compile_alternation(self.cik_patterns, re.IGNORECASE)
+        self._registration_scanner, self._registration_groups = compile_alternation(
+            self.registration_patterns, re.IGNORECASE)
+        self._sec_url_scanner, self._sec_url_groups = compile_alternation(self.sec_url_patterns)
+        self._registration_format = re.compile(r'\d{3}-\d{5}')
+        
+        # Executive patterns overlap heavily, so they keep their own scans (and output order).
+        # Each only runs when its role keyword is present; patterns without a role always run.
+        self._executive_scanners = []
+        for pattern in self.executive_patterns:
+            role = self._role_from_pattern(pattern)
+            self._executive_scanners.append(
+                (re.compile(pattern, re.IGNORECASE), pattern, role, self.ROLE_BITS.get(role, 0))
+            )
+        
+        self._jurisdiction_scanner = re.compile('|'.join(f"(?:{p})" for p in self.jurisdiction_patterns), re.IGNORECASE)
+        self._headquarters_scanner = re.compile('|'.join(f"(?:{p})" for p in self.headquarters_patterns), re.IGNORECASE)
+        
+        literals = {indicator: self.SEC_RELATED for indicator in self.SEC_INDICATORS}
+        for bit, anchors in self.literal_anchors.items():
+            for anchor in anchors:
+                literals[anchor] = literals.get(anchor, 0) | bit
+        self._matcher = LiteralMatcher(literals)
+    
+    @staticmethod
+    def _first_match_per_pattern(scanner: Pattern, value_groups: Dict[str, Tuple[int, int]], text: str) -> Dict[int, str]:
+        """One scan of text returning the first value matched by each pattern index"""
+        first_matches = {}
+        for match in scanner.finditer(text):
+            index, group = value_groups[match.lastgroup]
+            if index not in first_matches:
+                first_matches[index] = match.group(group)
+        return first_matches
+    
+    def _scan_results(self, search_results: List[Dict], include_presence: bool = False, log: bool = False) -> Dict:
+        """
+        Single pass over the search results collecting every extracted field
+        
+        Each result's text is built once. CIK and registration stop scanning once
+        found, URLs once 5 are collected and executives once 10 are collected.
+        """
+        scan = {
+            'cik': None,
+            'registration_number': None,
+            'sec_filings': [],
+            'executives': [],
+            'sec_result_count': 0,
+            'jurisdiction': False,
+            'headquarters': False
+        }
+        found_names = set()
+        
+        for result in search_results:
+            prepared = prepare_result(result, self._matcher)
+            
+            if prepared.mask & self.SEC_RELATED:
+                scan['sec_result_count'] += 1
+                if log:
+                    logger.info(f"📋 SEC result found: {prepared.title[:50]}...")
+                
+                if scan['cik'] is None:
+                    scan['cik'] = self._cik_from_prepared(prepared)
+                if scan['registration_number'] is None:
+                    scan['registration_number'] = self._registration_from_prepared(prepared)
+                if len(scan['sec_filings']) < 5:
+                    self._sec_urls_from_prepared(prepared, scan['sec_filings'])
+            
+            if len(scan['executives']) < 10:
+                self._executives_from_prepared(prepared, scan['executives'], found_names)
+            
+            if include_presence:
+                if (not scan['jurisdiction'] and prepared.text_mask & self.HAS_JURISDICTION
+                        and self._jurisdiction_scanner.search(prepared.text)):
+                    scan['jurisdiction'] = True
+                if (not scan['headquarters'] and prepared.text_mask & self.HAS_HEADQUARTERS
+                        and self._headquarters_scanner.search(prepared.text)):
+                    scan['headquarters'] = True
+        
+        scan['sec_filings'] = scan['sec_filings'][:5]  # Limit to top 5 filings
+        scan['executives'] = scan['executives'][:10]  # Limit to top 10 executives
+        return scan
     
     def extract_sec_data_from_search_results(self, search_results: List[Dict], company_name: str) -> Dict:
         """
@@ -86,32 +264,13 @@ class SearchBasedSECExtractor:
                 'confidence': 'Low'
             }
             
-            sec_results = []
-            
-            # Step 1: Filter and prioritize SEC-related results
-            for result in search_results:
-                url = result.get('link', '')
-                title = result.get('title', '')
-                snippet = result.get('snippet', '')
-                
-                # Check if this is a SEC-related result
-                if self._is_sec_related(url, title, snippet):
-                    sec_results.append(result)
-                    logger.info(f"📋 SEC result found: {title[:50]}...")
-            
-            logger.info(f"📊 Found {len(sec_results)} SEC-related results")
-            
-            # Step 2: Extract CIK from SEC results
-            extracted_data['cik'] = self._extract_cik_from_results(sec_results)
-            
-            # Step 3: Extract registration number
-            extracted_data['registration_number'] = self._extract_registration_from_results(sec_results)
-            
-            # Step 4: Extract SEC filing URLs
-            extracted_data['sec_filings'] = self._extract_sec_urls_from_results(sec_results)
+            # Steps 1-5: Filter SEC-related results and extract CIK, registration number,
+            # SEC filing URLs (from SEC results) and executives (from all results) in one pass
+            scan = self._scan_results(search_results, log=True)
+            logger.info(f"📊 Found {scan['sec_result_count']} SEC-related results")
             
-            # Step 5: Extract executive information from all search results
-            extracted_data['executives'] = self._extract_executives_from_results(search_results)
+            for field in ('cik', 'registration_number', 'sec_filings', 'executives'):
+                extracted_data[field] = scan[field]
             
             # Step 6: Determine confidence level
             extracted_data['confidence'] = self._calculate_confidence(extracted_data)
@@ -136,97 +295,121 @@ class SearchBasedSECExtractor:
                 'confidence': 'Low'
             }
     
+    def assess_field_coverage(self, search_results: List[Dict]) -> Set[str]:
+        """
+        Cheaply check which CompanyInfo fields the search results already cover
+        
+        Used by the search planner to decide which query groups are still needed.
+        Returns a subset of: cik, registration_number, regulatory_filings,
+        key_executives, jurisdiction, headquarters
+        """
+        covered = set()
+        scan = self._scan_results(search_results, include_presence=True)
+        
+        if scan['cik']:
+            covered.add('cik')
+        if scan['registration_number']:
+            covered.add('registration_number')
+        if scan['sec_filings']:
+            covered.add('regulatory_filings')
+        if len(scan['executives']) >= self.MIN_EXECUTIVES:
+            covered.add('key_executives')
+        for field in ('jurisdiction', 'headquarters'):
+            if scan[field]:
+                covered.add(field)
+        
+        return covered
+    
     def _is_sec_related(self, url: str, title: str, snippet: str) -> bool:
         """Check if a search result is SEC-related"""
-        sec_indicators = [
-            'sec.gov',
-            'edgar.sec.gov',
-            'SEC filing',
-            'Form 10-K',
-            'Form 10-Q',
-            'Form 8-K',
-            'DEF 14A',
-            'Proxy Statement',
-            'Commission File Number',
-            'CIK',
-            'EDGAR'
-        ]
+        return bool(self._matcher.scan(f"{url} {title} {snippet}".lower()) & self.SEC_RELATED)
+    
+    def _cik_from_prepared(self, prepared: PreparedResult) -> Optional[str]:
+        if not prepared.mask & self.HAS_CIK:
+            return None
+        first_matches = self._first_match_per_pattern(self._cik_scanner, self._cik_groups, prepared.full_text)
+        for index in sorted(first_matches):
+            # Clean and validate CIK
+            cik = first_matches[index].strip()
+            if cik.isdigit() and len(cik) <= 10:
+                # Pad with zeros to 10 digits if needed
+                formatted_cik = cik.zfill(10) if len(cik) < 10 else cik
+                logger.info(f"✅ CIK extracted: {formatted_cik} from pattern: {self.cik_patterns[index]}")
+                return formatted_cik
         
-        text_to_check = f"{url} {title} {snippet}".lower()
+        return None
+    
+    def _registration_from_prepared(self, prepared: PreparedResult) -> Optional[str]:
+        if not prepared.text_mask & self.HAS_REGISTRATION:
+            return None
+        first_matches = self._first_match_per_pattern(
+            self._registration_scanner, self._registration_groups, prepared.text)
+        for index in sorted(first_matches):
+            registration = first_matches[index].strip()
+            # Validate format (XXX-XXXXX)
+            if self._registration_format.match(registration):
+                logger.info(f"✅ Registration number extracted: {registration}")
+                return registration
         
-        for indicator in sec_indicators:
-            if indicator.lower() in text_to_check:
-                return True
+        return None
+    
+    def _sec_urls_from_prepared(self, prepared: PreparedResult, sec_urls: List[str]):
+        # Check if the URL itself is a SEC filing
+        if self._is_sec_filing_url(prepared.url):
+            sec_urls.append(prepared.url)
+            logger.info(f"✅ SEC filing URL found: {prepared.url}")
         
-        return False
+        # Look for SEC URLs in snippet text, in pattern order
+        if not prepared.text_mask & self.HAS_SEC_URL:
+            return
+        matches = [(self._sec_url_groups[match.lastgroup][0], match.group())
+                   for match in self._sec_url_scanner.finditer(prepared.text)]
+        matches.sort(key=lambda item: item[0])
+        for _, match in matches:
+            if match not in sec_urls:
+                sec_urls.append(match)
+                logger.info(f"✅ SEC filing URL extracted from text: {match}")
+    
+    def _executives_from_prepared(self, prepared: PreparedResult, executives: List[str], found_names: Set[str]):
+        for scanner, pattern, role, role_bit in self._executive_scanners:
+            if role_bit and not prepared.text_mask & role_bit:
+                continue
+            for match in scanner.finditer(prepared.text):
+                name = match.group(1) if scanner.groups else match.group()
+                if name and name.strip():
+                    name = name.strip()
+                    # Role comes from the pattern, falling back to the surrounding context
+                    executive_entry = f"{name} - {role or self._determine_executive_role(pattern, prepared.text, name)}"
+                    
+                    # Avoid duplicates
+                    if name not in found_names and len(name.split()) >= 2:
+                        executives.append(executive_entry)
+                        found_names.add(name)
+                        logger.info(f"✅ Executive extracted: {executive_entry}")
     
     def _extract_cik_from_results(self, sec_results: List[Dict]) -> Optional[str]:
         """Extract CIK from SEC results"""
         for result in sec_results:
-            url = result.get('link', '')
-            title = result.get('title', '')
-            snippet = result.get('snippet', '')
-            
-            # Combine all text for pattern matching
-            combined_text = f"{url} {title} {snippet}"
-            
-            # Try each CIK pattern
-            for pattern in self.cik_patterns:
-                matches = re.findall(pattern, combined_text, re.IGNORECASE)
-                if matches:
-                    # Clean and validate CIK
-                    cik = matches[0].strip()
-                    if cik.isdigit() and len(cik) <= 10:
-                        # Pad with zeros to 10 digits if needed
-                        formatted_cik = cik.zfill(10) if len(cik) < 10 else cik
-                        logger.info(f"✅ CIK extracted: {formatted_cik} from pattern: {pattern}")
-                        return formatted_cik
+            cik = self._cik_from_prepared(prepare_result(result, self._matcher))
+            if cik:
+                return cik
         
         return None
     
     def _extract_registration_from_results(self, sec_results: List[Dict]) -> Optional[str]:
         """Extract registration number from SEC results"""
         for result in sec_results:
-            title = result.get('title', '')
-            snippet = result.get('snippet', '')
-            
-            # Combine text for pattern matching
-            combined_text = f"{title} {snippet}"
-            
-            # Try each registration pattern
-            for pattern in self.registration_patterns:
-                matches = re.findall(pattern, combined_text, re.IGNORECASE)
-                if matches:
-                    registration = matches[0].strip()
-                    # Validate format (XXX-XXXXX)
-                    if re.match(r'\d{3}-\d{5}', registration):
-                        logger.info(f"✅ Registration number extracted: {registration}")
-                        return registration
+            registration = self._registration_from_prepared(prepare_result(result, self._matcher))
+            if registration:
+                return registration
         
         return None
     
     def _extract_sec_urls_from_results(self, sec_results: List[Dict]) -> List[str]:
         """Extract SEC filing URLs from results"""
         sec_urls = []
-        
         for result in sec_results:
-            url = result.get('link', '')
-            title = result.get('title', '')
-            snippet = result.get('snippet', '')
-            
-            # Check if the URL itself is a SEC filing
-            if self._is_sec_filing_url(url):
-                sec_urls.append(url)
-                logger.info(f"✅ SEC filing URL found: {url}")
-            
-            # Look for SEC URLs in snippet text
-            combined_text = f"{title} {snippet}"
-            for pattern in self.sec_url_patterns:
-                matches = re.findall(pattern, combined_text)
-                for match in matches:
-                    if match not in sec_urls:
-                        sec_urls.append(match)
-                        logger.info(f"✅ SEC filing URL extracted from text: {match}")
+            self._sec_urls_from_prepared(prepare_result(result, self._matcher), sec_urls)
         
         return sec_urls[:5]  # Limit to top 5 filings
     
@@ -234,41 +417,13 @@ class SearchBasedSECExtractor:
         """Extract executive information from search results"""
         executives = []
         found_names = set()
-        
         for result in search_results:
-            title = result.get('title', '')
-            snippet = result.get('snippet', '')
-            
-            # Combine text for pattern matching
-            combined_text = f"{title} {snippet}"
-            
-            # Try each executive pattern
-            for pattern in self.executive_patterns:
-                matches = re.findall(pattern, combined_text, re.IGNORECASE)
-                for match in matches:
-                    if isinstance(match, tuple):
-                        name = match[0] if match[0] else match[1] if len(match) > 1 else None
-                    else:
-                        name = match
-                    
-                    if name and name.strip():
-                        name = name.strip()
-                        # Determine role based on pattern
-                        role = self._determine_executive_role(pattern, combined_text, name)
-                        
-                        executive_entry = f"{name} - {role}"
-                        
-                        # Avoid duplicates
-                        if name not in found_names and len(name.split()) >= 2:
-                            executives.append(executive_entry)
-                            found_names.add(name)
-                            logger.info(f"✅ Executive extracted: {executive_entry}")
+            self._executives_from_prepared(prepare_result(result, self._matcher), executives, found_names)
         
         return executives[:10]  # Limit to top 10 executives
     
-    def _determine_executive_role(self, pattern: str, text: str, name: str) -> str:
-        """Determine executive role based on pattern and context"""
-        text_lower = text.lower()
+    @staticmethod
+    def _role_from_pattern(pattern: str) -> Optional[str]:
         pattern_lower = pattern.lower()
         
         if 'ceo' in pattern_lower or 'chief executive' in pattern_lower:
@@ -279,6 +434,15 @@ class SearchBasedSECExtractor:
             return 'CTO'
         elif 'coo' in pattern_lower or 'chief operating' in pattern_lower:
             return 'COO'
+        return None
+    
+    def _determine_executive_role(self, pattern: str, text: str, name: str) -> str:
+        """Determine executive role based on pattern and context"""
+        text_lower = text.lower()
+        role = self._role_from_pattern(pattern)
+        
+        if role:
+            return role
         else:
             # Try to determine from context around the name
             name_lower = name.lower()
@@ -0,0 +1,206 @@
+#!/usr/bin/env python3
+"""
+SEC EDGAR HTTP Client
+
+This module is the single way the tool talks to sec.gov / data.sec.gov, within
+SEC's fair access rules (declared User-Agent, at most 10 requests/second per host):
+- One persistent pooled session, so requests reuse keep-alive connections
+- A process-wide token-bucket limiter (capped at 10 req/s) shared by every
+  thread and coroutine, optionally across processes via a state file
+- Conditional requests (ETag / If-Modified-Since): unchanged documents come
+  back as 304 and are served from memory
+- gzip/deflate responses decoded transparently
+- HTTP 429/503 retried after Retry-After, pausing every caller
+"""
+
+import os
+import json
+import time
+import random
+import asyncio
+import threading
+import logging
+from collections import OrderedDict
+from dataclasses import dataclass, field, replace
+from email.utils import parsedate_to_datetime
+from typing import Any, Dict, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.structures import CaseInsensitiveDict
+
+from rate_limiter import get_shared_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+SEC_MAX_RATE = 10.0   # SEC fair access limit, requests/second
+DEFAULT_USER_AGENT = 'Company Research Tool (compliance@example.com)'
+RETRY_STATUSES = (429, 503)
+
+@dataclass
+class SECResponse:
+    """A completed SEC response (possibly revalidated from the conditional cache)"""
+    url: str
+    status_code: int
+    content: bytes
+    headers: Dict[str, str] = field(default_factory=CaseInsensitiveDict)
+    encoding: str = 'utf-8'
+    from_cache: bool = False
+
+    @property
+    def text(self) -> str:
+        return self.content.decode(self.encoding or 'utf-8', errors='replace')
+
+    def json(self) -> Any:
+        return json.loads(self.content)
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise requests.HTTPError(f"{self.status_code} Error for url: {self.url}")
+
+class SECClient:
+    """Rate-limited, pooled, conditional-request HTTP client for SEC EDGAR"""
+
+    def __init__(self, user_agent: Optional[str] = None, rate: Optional[float] = None,
+                 burst: Optional[int] = None, max_connections: int = 10, max_retries: int = 3,
+                 timeout: float = 10.0, conditional_cache_size: int = 512):
+        self.user_agent = user_agent or os.getenv('SEC_USER_AGENT', DEFAULT_USER_AGENT)
+        self.max_retries = max_retries
+        self.timeout = timeout
+        self.max_backoff = 60.0
+
+        requested_rate = rate if rate is not None else float(os.getenv('SEC_RATE_LIMIT', str(SEC_MAX_RATE)))
+        if requested_rate > SEC_MAX_RATE:
+            logger.warning(f"SEC rate limit {requested_rate} req/s exceeds fair access limit, using {SEC_MAX_RATE}")
+        self.rate_limiter = get_shared_rate_limiter(
+            'sec',
+            rate=min(requested_rate, SEC_MAX_RATE),
+            burst=burst if burst is not None else int(os.getenv('SEC_RATE_BURST', '0')) or None,
+            path=os.getenv('SEC_RATE_LIMIT_FILE') or None
+        )
+
+        self.session = requests.Session()
+        self.session.headers.update({
+            'User-Agent': self.user_agent,
+            'Accept-Encoding': 'gzip, deflate',
+            'Connection': 'keep-alive',
+        })
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_connections)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+        # url -> (etag, last_modified, SECResponse) for conditional revalidation
+        self.conditional_cache_size = conditional_cache_size
+        self._conditional_cache: "OrderedDict[str, tuple]" = OrderedDict()
+        self._cache_lock = threading.Lock()
+
+    def _retry_delay(self, retry_after: Optional[str], attempt: int) -> float:
+        """Seconds to wait after a 429/503: Retry-After if given, else exponential backoff with jitter"""
+        backoff = min(self.max_backoff, (2 ** attempt) * (1 + random.random()))
+        if not retry_after:
+            return backoff
+
+        try:
+            return min(self.max_backoff, max(0.0, float(retry_after)))
+        except ValueError:
+            pass
+
+        try:
+            retry_at = parsedate_to_datetime(retry_after)
+            return min(self.max_backoff, max(0.0, retry_at.timestamp() - time.time()))
+        except (TypeError, ValueError):
+            return backoff
+
+    def _cached(self, key: str) -> Optional[tuple]:
+        with self._cache_lock:
+            entry = self._conditional_cache.get(key)
+            if entry is not None:
+                self._conditional_cache.move_to_end(key)
+            return entry
+
+    def _store(self, key: str, response: SECResponse):
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if not (etag or last_modified) or self.conditional_cache_size <= 0:
+            return
+        with self._cache_lock:
+            self._conditional_cache[key] = (etag, last_modified, response)
+            self._conditional_cache.move_to_end(key)
+            while len(self._conditional_cache) > self.conditional_cache_size:
+                self._conditional_cache.popitem(last=False)
+
+    def get(self, url: str, params: Optional[Dict[str, Any]] = None,
+            headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> SECResponse:
+        """
+        Rate-limited GET; raises requests.RequestException on network errors
+
+        HTTP error statuses are returned, not raised - call raise_for_status().
+        """
+        key = requests.Request('GET', url, params=params).prepare().url
+        cached = self._cached(key)
+        request_headers = dict(headers or {})
+        if cached:
+            etag, last_modified, _ = cached
+            if etag:
+                request_headers['If-None-Match'] = etag
+            if last_modified:
+                request_headers['If-Modified-Since'] = last_modified
+
+        for attempt in range(self.max_retries + 1):
+            self.rate_limiter.acquire()
+            response = self.session.get(url, params=params, headers=request_headers,
+                                        timeout=timeout or self.timeout)
+
+            if response.status_code in RETRY_STATUSES and attempt < self.max_retries:
+                delay = self._retry_delay(response.headers.get('Retry-After'), attempt)
+                logger.warning(f"SEC throttled ({response.status_code}), retrying in {delay:.1f}s: {url}")
+                self.rate_limiter.penalize(delay)
+                continue
+            break
+
+        if response.status_code == 304 and cached:
+            logger.debug(f"SEC not modified, using cached copy: {key}")
+            return replace(cached[2], from_cache=True)
+
+        result = SECResponse(
+            url=response.url,
+            status_code=response.status_code,
+            content=response.content,
+            headers=CaseInsensitiveDict(response.headers),
+            encoding=response.encoding or 'utf-8'
+        )
+        if result.status_code == 200:
+            self._store(key, result)
+        return result
+
+    async def aget(self, url: str, params: Optional[Dict[str, Any]] = None,
+                   headers: Optional[Dict[str, str]] = None, timeout: Optional[float] = None) -> SECResponse:
+        """get() from a coroutine without blocking the event loop"""
+        return await asyncio.to_thread(self.get, url, params, headers, timeout)
+
+    def download(self, url: str, path: str, chunk_size: int = 1 << 20):
+        """Stream a (large) SEC file to disk, counting as one request against the limit"""
+        self.rate_limiter.acquire()
+        with self.session.get(url, stream=True, timeout=max(self.timeout, 60)) as response:
+            response.raise_for_status()
+            temp_path = f"{path}.part"
+            with open(temp_path, 'wb') as f:
+                for chunk in response.iter_content(chunk_size=chunk_size):
+                    f.write(chunk)
+        os.replace(temp_path, path)
+
+    def close(self):
+        self.session.close()
+
+_shared_client: Optional[SECClient] = None
+_shared_client_lock = threading.Lock()
+
+def get_sec_client() -> SECClient:
+    """Get the process-wide SEC client, creating it on first use"""
+    global _shared_client
+    with _shared_client_lock:
+        if _shared_client is None:
+            _shared_client = SECClient()
+            logger.info(f"SEC client initialized: {_shared_client.rate_limiter.rate} req/s, "
+                        f"User-Agent '{_shared_client.user_agent}'")
+        return _shared_client
@@ -9,33 +9,60 @@ It acts as a fallback when the main search doesn't find SEC data consistently.
 """
 
 import re
-import requests
 import json
-from typing import Dict, List, Optional, Tuple
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Dict, List, Optional, Tuple
 import logging
 
+from edgar_index import get_edgar_index
+
+if TYPE_CHECKING:
+    from sec_client import SECClient
+
 logger = logging.getLogger(__name__)
 
 class SECFilingEnhancer:
     """Deterministic SEC filing lookup for consistent results"""
     
-    def __init__(self):
+    def __init__(self, sec_client: Optional["SECClient"] = None):
         self.sec_base_url = "https://www.sec.gov"
         self.edgar_search_url = "https://www.sec.gov/cgi-bin/browse-edgar"
+        self.submissions_url = "https://data.sec.gov/submissions/CIK{cik}.json"
         self.headers = {
-            'User-Agent': 'Company Research Tool (compliance@example.com)',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate',
-            'Connection': 'keep-alive',
         }
+        
+        # Shared pooled, rate-limited client (User-Agent, gzip and keep-alive are set there),
+        # created on the first SEC request so searches that never fall back skip its setup
+        self._sec_client = sec_client
+    
+    @property
+    def sec_client(self) -> "SECClient":
+        if self._sec_client is None:
+            from sec_client import get_sec_client
+            self._sec_client = get_sec_client()
+        return self._sec_client
     
     def search_company_cik(self, company_name: str) -> Optional[str]:
         """
         Search for company CIK using SEC's company search
         Returns CIK if found, None otherwise
+        
+        When a local EDGAR index is available (EDGAR_INDEX_PATH) the lookup is
+        answered offline from the index and no SEC requests are made.
         """
         try:
+            edgar_index = get_edgar_index()
+            if edgar_index is not None:
+                match = edgar_index.resolve(company_name)
+                if match:
+                    logger.info(f"Found CIK {match.cik} for {company_name} in local EDGAR index "
+                                f"({match.match_type} match: {match.name})")
+                    return match.cik
+                logger.info(f"No local EDGAR index match for {company_name}")
+                return None
+            
             # Clean company name for search
             clean_name = self._clean_company_name(company_name)
             
@@ -83,7 +110,7 @@ class SECFilingEnhancer:
                 'count': '10'
             }
             
-            response = requests.get(search_url, params=params, headers=self.headers, timeout=10)
+            response = self.sec_client.get(search_url, params=params, headers=self.headers, timeout=10)
             response.raise_for_status()
             
             # Parse XML response to find CIK
@@ -115,11 +142,15 @@ class SECFilingEnhancer:
             filing_types = ['10-K', '10-Q', '8-K', 'DEF 14A']
         
         try:
-            filings = []
+            # One request for the full filing history, filtered locally
+            filings = self._get_filings_from_submissions(cik, filing_types)
             
-            for filing_type in filing_types:
-                filing_data = self._get_filings_by_type(cik, filing_type)
-                filings.extend(filing_data)
+            if filings is None:
+                # Submissions API unavailable - query each filing type concurrently instead
+                with ThreadPoolExecutor(max_workers=len(filing_types)) as executor:
+                    per_type = executor.map(lambda filing_type: self._get_filings_by_type(cik, filing_type),
+                                            filing_types)
+                    filings = [filing for filing_data in per_type for filing in filing_data]
             
             # Sort by date (most recent first)
             filings.sort(key=lambda x: x.get('date', ''), reverse=True)
@@ -130,6 +161,60 @@ class SECFilingEnhancer:
             logger.error(f"Error getting filings for CIK {cik}: {e}")
             return []
     
+    def _get_filings_from_submissions(self, cik: str, filing_types: List[str],
+                                      per_type_limit: int = 5) -> Optional[List[Dict]]:
+        """
+        Get recent filings of the requested types from the EDGAR submissions JSON
+        
+        Matches browse-edgar's type filter (prefix match, so 10-K includes 10-K/A)
+        and its per-type count. Returns None if the submissions request fails.
+        """
+        try:
+            padded_cik = str(cik).zfill(10)
+            response = self.sec_client.get(self.submissions_url.format(cik=padded_cik),
+                                           headers={'Accept': 'application/json'}, timeout=10)
+            response.raise_for_status()
+            recent = response.json().get('filings', {}).get('recent', {})
+        except Exception as e:
+            logger.warning(f"Submissions lookup failed for CIK {cik}, falling back to per-type search: {e}")
+            return None
+        
+        forms = recent.get('form', [])
+        accession_numbers = recent.get('accessionNumber', [])
+        filing_dates = recent.get('filingDate', [])
+        primary_documents = recent.get('primaryDocument', [])
+        file_numbers = recent.get('fileNumber', [])
+        archive_path = f"{self.sec_base_url}/Archives/edgar/data/{int(padded_cik)}"
+        
+        filings = []
+        counts = {filing_type: 0 for filing_type in filing_types}
+        # Submissions are listed most recent first
+        for i, form in enumerate(forms):
+            filing_type = next((t for t in filing_types if form.startswith(t) and counts[t] < per_type_limit), None)
+            if filing_type is None:
+                continue
+            counts[filing_type] += 1
+            
+            accession = accession_numbers[i]
+            folder = f"{archive_path}/{accession.replace('-', '')}"
+            filing = {
+                'type': form,
+                'date': filing_dates[i] if i < len(filing_dates) else '',
+                'url': f"{folder}/{accession}-index.htm",
+                'cik': cik
+            }
+            if i < len(primary_documents) and primary_documents[i]:
+                filing['document_url'] = f"{folder}/{primary_documents[i]}"
+            if i < len(file_numbers) and file_numbers[i]:
+                filing['file_number'] = file_numbers[i]
+            filings.append(filing)
+            
+            if all(count >= per_type_limit for count in counts.values()):
+                break
+        
+        logger.info(f"Found {len(filings)} filings for CIK {cik} in one submissions request")
+        return filings
+    
     def _get_filings_by_type(self, cik: str, filing_type: str) -> List[Dict]:
         """Get filings of specific type for a CIK"""
         try:
@@ -143,7 +228,7 @@ class SECFilingEnhancer:
                 'output': 'xml'
             }
             
-            response = requests.get(search_url, params=params, headers=self.headers, timeout=10)
+            response = self.sec_client.get(search_url, params=params, headers=self.headers, timeout=10)
             response.raise_for_status()
             
             content = response.text
@@ -239,6 +324,10 @@ class SECFilingEnhancer:
             # Look for 10-K filings first
             for filing in filings:
                 if filing.get('type', '').startswith('10-K'):
+                    # Submissions JSON carries the Commission File Number directly
+                    if re.fullmatch(r'\d{3}-\d{5}', filing.get('file_number', '')):
+                        return filing['file_number']
+                    
                     # Try to extract from filing URL or content
                     registration_match = re.search(r'(\d{3}-\d{5})', filing.get('url', ''))
                     if registration_match: